@@ -0,0 +1,141 @@
+"""Benchmark chunk persistence: per-row ORM inserts vs bulk COPY + merge.
+
+Writes synthetic chunks (random 768-d vectors) for a throwaway file into the
+database configured by DATABASE_URL, reports rows/sec for each path, then
+removes everything it created. Use a scratch database.
+"""
+
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete
+
+from src.db import close_db, get_session
+from src.db.models import Chunk, DriveAccount, File
+from src.services.indexing import bulk_upsert_chunks
+from src.utils.hash import md5_hash
+from src.utils.logging import setup_logging
+
+DIMENSIONS = 768
+
+
+def make_rows(file_id: uuid.UUID, count: int, chunk_chars: int) -> list[dict]:
+    """Generate synthetic chunk rows with random embeddings."""
+    rows = []
+    for i in range(count):
+        content = f"chunk {i} " + "lorem ipsum " * (chunk_chars // 12)
+        rows.append({
+            "file_id": file_id,
+            "chunk_index": i,
+            "content": content,
+            "start_offset": i * chunk_chars,
+            "end_offset": (i + 1) * chunk_chars,
+            "heading": f"Section {i // 10}",
+            "content_hash": md5_hash(content),
+            "embedding": [random.uniform(-1, 1) for _ in range(DIMENSIONS)],
+        })
+    return rows
+
+
+async def create_scratch_file() -> tuple[uuid.UUID, uuid.UUID]:
+    """Create a throwaway account + file to attach chunks to."""
+    async with get_session() as session:
+        account = DriveAccount(
+            user_email=f"benchmark-{uuid.uuid4().hex[:8]}@uds.local",
+            access_token="-",
+            refresh_token="-",
+            token_expiry=datetime.now(timezone.utc),
+            scopes=[],
+        )
+        session.add(account)
+        await session.flush()
+
+        file_record = File(
+            account_id=account.id,
+            file_id=f"benchmark-{uuid.uuid4().hex}",
+            name="benchmark",
+            path="/benchmark",
+            mime_type="text/plain",
+            modified_time=datetime.now(timezone.utc),
+        )
+        session.add(file_record)
+        await session.flush()
+        return account.id, file_record.id
+
+
+async def clear_chunks(file_id: uuid.UUID) -> None:
+    """Remove chunks written by a previous run."""
+    async with get_session() as session:
+        await session.execute(delete(Chunk).where(Chunk.file_id == file_id))
+
+
+async def run_orm(rows: list[dict]) -> float:
+    """Current path: session.add() per row, then commit."""
+    start = time.perf_counter()
+    async with get_session() as session:
+        for row in rows:
+            session.add(Chunk(**row))
+    return time.perf_counter() - start
+
+
+async def run_bulk(rows: list[dict]) -> float:
+    """Bulk path: binary COPY into staging table + INSERT ... ON CONFLICT."""
+    start = time.perf_counter()
+    async with get_session() as session:
+        await bulk_upsert_chunks(session, rows)
+    return time.perf_counter() - start
+
+
+async def benchmark(count: int, runs: int, chunk_chars: int) -> None:
+    """Run both paths `runs` times and print rows/sec."""
+    account_id, file_id = await create_scratch_file()
+    rows = make_rows(file_id, count, chunk_chars)
+
+    results: dict[str, list[float]] = {"orm": [], "bulk": []}
+    try:
+        for _ in range(runs):
+            for name, runner in (("orm", run_orm), ("bulk", run_bulk)):
+                await clear_chunks(file_id)
+                results[name].append(await runner(rows))
+        await clear_chunks(file_id)
+    finally:
+        async with get_session() as session:
+            await session.execute(delete(DriveAccount).where(DriveAccount.id == account_id))
+        await close_db()
+
+    print(f"\n📊 Chunk ingestion: {count} rows x {runs} runs ({DIMENSIONS}d, ~{chunk_chars} chars)\n")
+    print(f"  {'path':<6} {'best (s)':>10} {'median (s)':>11} {'rows/sec':>10}")
+    for name, timings in results.items():
+        timings.sort()
+        best = timings[0]
+        median = timings[len(timings) // 2]
+        print(f"  {name:<6} {best:>10.3f} {median:>11.3f} {count / median:>10,.0f}")
+
+    speedup = sorted(results["orm"])[runs // 2] / sorted(results["bulk"])[runs // 2]
+    print(f"\n  bulk vs orm: {speedup:.1f}x")
+
+
+def main():
+    """CLI entry point."""
+    setup_logging()
+
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark chunk ingestion paths")
+    parser.add_argument("--rows", type=int, default=5000, help="Chunks per run")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per path")
+    parser.add_argument("--chunk-chars", type=int, default=1000, help="Approx. chunk size")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.rows, args.runs, args.chunk_chars))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+"""Search benchmark: latency, throughput and recall for the UDS search stack.
+
+Seeds a synthetic corpus into the database configured by DATABASE_URL,
+replays a query set through SearchService and reports, per search mode:
+
+- p50/p95/p99 latency (sequential, one query at a time)
+- QPS with --concurrency queries in flight
+- recall@k against brute-force ground truth (same SQL with index scans
+  disabled, i.e. exact ranking)
+- vector search through every embedding_storage index that exists
+  (float, plus halfvec/binary/matryoshka from the optional migrations) and each
+  index's size, i.e. memory saved vs recall lost
+
+Embeddings come from the deterministic hashing backend, so no embedding API
+is called and the corpus can be regenerated identically. Query embeddings are
+computed up front: reported latencies are SQL + fusion only.
+
+Use a scratch database — the benchmark corpus is unfiltered search space.
+
+    python scripts/benchmark_search.py seed --files 2000 --chunks-per-file 50
+    python scripts/benchmark_search.py run --queries 200 --concurrency 8 --k 10
+    python scripts/benchmark_search.py cleanup
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Corpus and queries must be embedded by the same (offline) backend
+os.environ.setdefault("EMBEDDING_BACKEND", "hashing")
+
+import asyncpg
+from pgvector.asyncpg import register_vector
+from sqlalchemy import delete, select
+
+from src.config import get_settings
+from src.db import close_db, get_session
+from src.db.models import DriveAccount, File
+from src.services.embeddings import HashingEmbeddingService
+from src.services.indexing import bulk_upsert_chunks
+from src.services.search import SearchResult, SearchService, SearchTuning, close_asyncpg_pool
+from src.utils.hash import md5_hash
+from src.utils.logging import setup_logging
+
+BENCHMARK_EMAIL = "benchmark-search@uds.local"
+BENCHMARK_PATH = "/benchmark"
+MIME_TYPES = ["application/pdf", "application/vnd.google-apps.document", "text/plain"]
+
+# Rows per COPY + merge transaction while seeding
+SEED_BATCH_ROWS = 5000
+
+# HNSW index behind each embedding_storage mode
+STORAGE_INDEXES = {
+    "float": "idx_chunks_embedding",
+    "halfvec": "idx_chunks_embedding_half",
+    "binary": "idx_chunks_embedding_bq",
+    "matryoshka128": "idx_chunks_embedding_mrl128",
+    "matryoshka256": "idx_chunks_embedding_mrl256",
+}
+
+SearchFn = Callable[[str, list[float], int], Awaitable[list[SearchResult]]]
+
+
+# ----------------------------------------------------------------------
+# Synthetic corpus
+# ----------------------------------------------------------------------
+def make_vocabulary(size: int, rng: random.Random) -> list[str]:
+    """Pronounceable pseudo-words (so BM25 tokenization behaves normally)."""
+    consonants, vowels = "bcdfghjklmnprstvz", "aeiou"
+    words = set()
+    while len(words) < size:
+        length = rng.randint(2, 4)
+        words.add("".join(rng.choice(consonants) + rng.choice(vowels) for _ in range(length)))
+    return sorted(words)
+
+
+def make_chunk_text(vocabulary: list[str], weights: list[float], words: int, rng: random.Random) -> str:
+    """Zipf-distributed word soup, roughly like natural text term frequencies."""
+    return " ".join(rng.choices(vocabulary, weights=weights, k=words))
+
+
+async def seed(files: int, chunks_per_file: int, chunk_words: int, vocab_size: int, seed_value: int) -> None:
+    """Create the benchmark account, files and embedded chunks."""
+    rng = random.Random(seed_value)
+    vocabulary = make_vocabulary(vocab_size, rng)
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    embedder = HashingEmbeddingService()
+    now = datetime.now(timezone.utc)
+
+    async with get_session() as session:
+        result = await session.execute(
+            select(DriveAccount).where(DriveAccount.user_email == BENCHMARK_EMAIL)
+        )
+        if result.scalar_one_or_none():
+            print("Benchmark corpus already exists — run `cleanup` first.")
+            return
+
+        account = DriveAccount(
+            user_email=BENCHMARK_EMAIL,
+            access_token="-",
+            refresh_token="-",
+            token_expiry=now,
+            scopes=[],
+        )
+        session.add(account)
+        await session.flush()
+        account_id = account.id
+
+    total = files * chunks_per_file
+    files_per_batch = max(1, SEED_BATCH_ROWS // chunks_per_file)
+    print(f"\n🌱 Seeding {files:,} files x {chunks_per_file} chunks = {total:,} chunks\n")
+    start = time.perf_counter()
+    written = 0
+
+    for first in range(0, files, files_per_batch):
+        async with get_session() as session:
+            file_records = [
+                File(
+                    account_id=account_id,
+                    file_id=f"benchmark-{i}",
+                    name=f"Document {i}",
+                    path=f"{BENCHMARK_PATH}/folder-{i % 50}/doc-{i}",
+                    mime_type=MIME_TYPES[i % len(MIME_TYPES)],
+                    modified_time=now - timedelta(days=i % 365),
+                )
+                for i in range(first, min(first + files_per_batch, files))
+            ]
+            session.add_all(file_records)
+            await session.flush()
+
+            rows: list[dict] = []
+            for file_record in file_records:
+                offset = 0
+                for chunk_index in range(chunks_per_file):
+                    content = make_chunk_text(vocabulary, weights, chunk_words, rng)
+                    rows.append({
+                        "file_id": file_record.id,
+                        "chunk_index": chunk_index,
+                        "content": content,
+                        "start_offset": offset,
+                        "end_offset": offset + len(content),
+                        "heading": f"Section {chunk_index // 10}",
+                        "content_hash": md5_hash(content),
+                        "embedding": embedder.embed(content),
+                    })
+                    offset += len(content)
+
+            written += await bulk_upsert_chunks(session, rows)
+
+        rate = written / (time.perf_counter() - start)
+        print(f"  {written:>12,} / {total:,} chunks  ({rate:,.0f} rows/s)", end="\r")
+
+    print(f"\n\n  Done in {time.perf_counter() - start:,.1f}s. Run ANALYZE chunks, files; before `run`.")
+
+
+async def cleanup() -> None:
+    """Delete the benchmark account (files and chunks cascade)."""
+    async with get_session() as session:
+        result = await session.execute(
+            delete(DriveAccount).where(DriveAccount.user_email == BENCHMARK_EMAIL)
+        )
+    print(f"Removed {result.rowcount or 0} benchmark account(s).")
+
+
+# ----------------------------------------------------------------------
+# Queries and ground truth
+# ----------------------------------------------------------------------
+async def sample_queries(conn: asyncpg.Connection, count: int, seed_value: int) -> list[str]:
+    """Build queries from 2–5 word spans of random benchmark chunks."""
+    rows = await conn.fetch(
+        """
+        SELECT content FROM chunks
+        WHERE file_path LIKE $1 || '/%'
+        ORDER BY random() LIMIT $2
+        """,
+        BENCHMARK_PATH,
+        count,
+    )
+    rng = random.Random(seed_value)
+    queries = []
+    for row in rows:
+        words = row["content"].split()
+        length = rng.randint(2, 5)
+        start = rng.randrange(max(1, len(words) - length))
+        queries.append(" ".join(words[start:start + length]))
+    return queries
+
+
+async def exact_ids(conn: asyncpg.Connection, sql: str, *args) -> list[str]:
+    """Run a ranking query with index scans disabled (exact, brute-force order)."""
+    async with conn.transaction():
+        await conn.execute("SET LOCAL enable_indexscan = off")
+        await conn.execute("SET LOCAL enable_bitmapscan = off")
+        rows = await conn.fetch(sql, *args)
+    return [str(row[0]) for row in rows]
+
+
+async def ground_truth(
+    conn: asyncpg.Connection, queries: list[str], embeddings: list[list[float]], k: int
+) -> dict[str, list[list[str]] | None]:
+    """Exact top-k chunk ids per query for each mode (None if it cannot run unindexed)."""
+    rrf_k = get_settings().rrf_k
+    statements = {
+        "vector": lambda q, e: (
+            "SELECT id FROM chunks WHERE embedding IS NOT NULL "
+            "ORDER BY embedding <=> $1::vector(768) LIMIT $2",
+            e, k,
+        ),
+        "bm25": lambda q, e: ("SELECT chunk_id FROM bm25_search($1, $2)", q, k),
+        "hybrid": lambda q, e: (
+            "SELECT chunk_id FROM hybrid_search($1, $2::vector(768), $3, $4)",
+            q, e, k, rrf_k,
+        ),
+    }
+
+    truth: dict[str, list[list[str]] | None] = {}
+    for mode, statement in statements.items():
+        try:
+            truth[mode] = [
+                await exact_ids(conn, *statement(query, embedding))
+                for query, embedding in zip(queries, embeddings)
+            ]
+        except asyncpg.PostgresError as e:
+            print(f"  ⚠️  No exact ground truth for {mode}: {e}")
+            truth[mode] = None
+    return truth
+
+
+def recall_at_k(results: list[list[str]], truth: list[list[str]], k: int) -> float:
+    """Mean |returned ∩ exact| / |exact| over queries with a non-empty ground truth."""
+    scores = [
+        len(set(found[:k]) & set(expected)) / len(expected)
+        for found, expected in zip(results, truth)
+        if expected
+    ]
+    return statistics.mean(scores) if scores else float("nan")
+
+
+# ----------------------------------------------------------------------
+# Measurement
+# ----------------------------------------------------------------------
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def measure(
+    search: SearchFn, queries: list[str], embeddings: list[list[float]], k: int, concurrency: int
+) -> tuple[list[float], float, list[list[str]]]:
+    """Sequential latencies, concurrent QPS and returned ids for one mode."""
+    latencies = []
+    returned = []
+    for query, embedding in zip(queries, embeddings):
+        start = time.perf_counter()
+        results = await search(query, embedding, k)
+        latencies.append(time.perf_counter() - start)
+        returned.append([r.chunk_id for r in results])
+
+    work = list(zip(queries, embeddings))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(query: str, embedding: list[float]) -> None:
+        async with semaphore:
+            await search(query, embedding, k)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(q, e) for q, e in work))
+    qps = len(work) / (time.perf_counter() - start)
+
+    return sorted(latencies), qps, returned
+
+
+async def run(query_count: int, k: int, concurrency: int, seed_value: int, skip_recall: bool) -> None:
+    """Replay the query set through every search mode and print the report."""
+    settings = get_settings()
+    dsn = settings.database_url.replace("+asyncpg", "")
+    conn = await asyncpg.connect(dsn, statement_cache_size=0, server_settings={"jit": "off"})
+    await register_vector(conn)
+
+    try:
+        queries = await sample_queries(conn, query_count, seed_value)
+        if not queries:
+            print("No benchmark corpus found — run `seed` first.")
+            return
+
+        embedder = HashingEmbeddingService()
+        embeddings = embedder.embed_batch(queries, is_query=True)
+
+        truth = None if skip_recall else await ground_truth(conn, queries, embeddings, k)
+        chunk_count = await conn.fetchval("SELECT count(*) FROM chunks")
+        index_sizes = {
+            row["indexrelname"]: row["bytes"]
+            for row in await conn.fetch(
+                """
+                SELECT indexrelname, pg_relation_size(indexrelid) AS bytes
+                FROM pg_stat_user_indexes
+                WHERE indexrelname = ANY($1)
+                """,
+                list(STORAGE_INDEXES.values()),
+            )
+        }
+    finally:
+        await conn.close()
+
+    service = SearchService()
+    modes: dict[str, tuple[str, SearchFn]] = {
+        "hybrid (sql)": ("hybrid", lambda q, e, n: service.hybrid_search(
+            q, top_k=n, query_embedding=e, engine="sql")),
+        "hybrid (parallel)": ("hybrid", lambda q, e, n: service.hybrid_search(
+            q, top_k=n, query_embedding=e, engine="parallel")),
+        "bm25": ("bm25", lambda q, e, n: service.bm25_search(q, top_k=n)),
+    }
+    storages = [name for name, index in STORAGE_INDEXES.items() if index in index_sizes]
+    for storage in storages:
+        tuning = SearchTuning(embedding_storage=storage)
+        modes[f"vector ({storage})"] = ("vector", lambda q, e, n, t=tuning: service.vector_search(
+            q, top_k=n, query_embedding=e, tuning=t))
+
+    print(
+        f"\n📊 Search benchmark: {len(queries)} queries, k={k}, "
+        f"concurrency={concurrency}, {chunk_count:,} chunks\n"
+    )
+    print(
+        f"  {'mode':<22} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} "
+        f"{'QPS':>8} {f'recall@{k}':>10}"
+    )
+
+    try:
+        for name, (truth_key, search) in modes.items():
+            # Warm up connections and caches
+            for query, embedding in list(zip(queries, embeddings))[:5]:
+                await search(query, embedding, k)
+
+            latencies, qps, returned = await measure(search, queries, embeddings, k, concurrency)
+            expected = truth.get(truth_key) if truth else None
+            recall = recall_at_k(returned, expected, k) if expected else float("nan")
+            print(
+                f"  {name:<22} {percentile(latencies, 50) * 1000:>9.2f} "
+                f"{percentile(latencies, 95) * 1000:>9.2f} {percentile(latencies, 99) * 1000:>9.2f} "
+                f"{qps:>8.1f} {recall:>10.3f}"
+            )
+    finally:
+        await close_asyncpg_pool()
+
+    float_size = index_sizes.get(STORAGE_INDEXES["float"])
+    print("\n💾 Vector index size by embedding_storage\n")
+    print(f"  {'storage':<14} {'index':<28} {'size (MB)':>10} {'vs float':>9}")
+    for storage in storages:
+        index = STORAGE_INDEXES[storage]
+        size = index_sizes[index]
+        ratio = f"{size / float_size:>8.0%}" if float_size else f"{'n/a':>8}"
+        print(f"  {storage:<14} {index:<28} {size / 1024 ** 2:>10.1f} {ratio:>9}")
+
+
+def main():
+    """CLI entry point."""
+    setup_logging()
+
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark UDS search latency and recall")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = sub.add_parser("seed", help="Create the synthetic benchmark corpus")
+    seed_parser.add_argument("--files", type=int, default=1000, help="Number of files")
+    seed_parser.add_argument("--chunks-per-file", type=int, default=20, help="Chunks per file")
+    seed_parser.add_argument("--chunk-words", type=int, default=150, help="Words per chunk")
+    seed_parser.add_argument("--vocab", type=int, default=20000, help="Vocabulary size")
+    seed_parser.add_argument("--seed", type=int, default=42, help="Random seed")
+
+    run_parser = sub.add_parser("run", help="Replay queries and report latency/QPS/recall")
+    run_parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    run_parser.add_argument("--k", type=int, default=10, help="Results per query")
+    run_parser.add_argument("--concurrency", type=int, default=8, help="Queries in flight for QPS")
+    run_parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    run_parser.add_argument("--skip-recall", action="store_true", help="Skip brute-force ground truth")
+
+    sub.add_parser("cleanup", help="Delete the benchmark corpus")
+
+    args = parser.parse_args()
+
+    if args.command == "seed":
+        coro = seed(args.files, args.chunks_per_file, args.chunk_words, args.vocab, args.seed)
+    elif args.command == "run":
+        coro = run(args.queries, args.k, args.concurrency, args.seed, args.skip_recall)
+    else:
+        coro = cleanup()
+
+    async def main_async() -> None:
+        try:
+            await coro
+        finally:
+            await close_db()
+
+    asyncio.run(main_async())
+
+
+if __name__ == "__main__":
+    main()
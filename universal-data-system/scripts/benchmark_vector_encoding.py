@@ -0,0 +1,136 @@
+"""Benchmark query-vector encoding: inline text literal vs bound binary parameter.
+
+Compares the two ways SearchService can send a 768-d query embedding:
+
+- literal: "[0.12,...]" built with str() per element and interpolated into
+  the SQL text (the previous approach)
+- binary: pgvector codec registered on the connection, embedding bound as $1
+
+Reports client-side encoding cost and, unless --no-db, the round-trip
+latency of vector_search() through both paths against DATABASE_URL.
+Read-only; safe against any database that has the migrations applied.
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncpg
+from pgvector import Vector
+from pgvector.asyncpg import register_vector
+
+from src.config import get_settings
+
+DIMENSIONS = 768
+
+
+def to_vector_literal(embedding: list[float]) -> str:
+    """Previous SearchService encoding: pgvector text literal."""
+    return "[" + ",".join(str(x) for x in embedding) + "]"
+
+
+def random_embedding() -> list[float]:
+    """Random vector with Gemini-like float precision."""
+    return [random.uniform(-0.1, 0.1) for _ in range(DIMENSIONS)]
+
+
+def summarize(timings: list[float]) -> str:
+    """Format p50/p95 in microseconds."""
+    timings = sorted(timings)
+    p50 = statistics.median(timings) * 1e6
+    p95 = timings[int(len(timings) * 0.95) - 1] * 1e6
+    return f"{p50:>10.1f} {p95:>10.1f}"
+
+
+def bench_encoding(iterations: int) -> None:
+    """Client-side cost of producing the bytes sent for one query vector."""
+    embeddings = [random_embedding() for _ in range(iterations)]
+
+    literal: list[float] = []
+    literal_size = 0
+    for embedding in embeddings:
+        start = time.perf_counter()
+        encoded = to_vector_literal(embedding)
+        literal.append(time.perf_counter() - start)
+        literal_size = len(encoded)
+
+    binary: list[float] = []
+    binary_size = 0
+    for embedding in embeddings:
+        start = time.perf_counter()
+        encoded_bytes = Vector(embedding).to_binary()
+        binary.append(time.perf_counter() - start)
+        binary_size = len(encoded_bytes)
+
+    print(f"\n📦 Client-side encoding ({iterations} vectors, {DIMENSIONS}d)\n")
+    print(f"  {'path':<8} {'p50 (µs)':>10} {'p95 (µs)':>10} {'bytes':>8}")
+    print(f"  {'literal':<8} {summarize(literal)} {literal_size:>8,}")
+    print(f"  {'binary':<8} {summarize(binary)} {binary_size:>8,}")
+
+
+async def bench_database(iterations: int, top_k: int) -> None:
+    """Round-trip latency of vector_search() with each encoding."""
+    dsn = get_settings().database_url.replace("+asyncpg", "")
+    # Same connection settings as the search pool
+    plain = await asyncpg.connect(dsn, statement_cache_size=0, server_settings={"jit": "off"})
+    binary = await asyncpg.connect(dsn, statement_cache_size=0, server_settings={"jit": "off"})
+    await register_vector(binary)
+
+    async def run_literal(embedding: list[float]) -> None:
+        await plain.fetch(
+            f"SELECT chunk_id FROM vector_search('{to_vector_literal(embedding)}'::vector(768), $1)",
+            top_k,
+        )
+
+    async def run_binary(embedding: list[float]) -> None:
+        await binary.fetch(
+            "SELECT chunk_id FROM vector_search($1::vector(768), $2)",
+            embedding,
+            top_k,
+        )
+
+    results: dict[str, list[float]] = {"literal": [], "binary": []}
+    try:
+        # Warm up caches/index pages so neither path pays for the first read
+        for _ in range(5):
+            await run_literal(random_embedding())
+            await run_binary(random_embedding())
+
+        for _ in range(iterations):
+            embedding = random_embedding()
+            for name, runner in (("literal", run_literal), ("binary", run_binary)):
+                start = time.perf_counter()
+                await runner(embedding)
+                results[name].append(time.perf_counter() - start)
+    finally:
+        await plain.close()
+        await binary.close()
+
+    print(f"\n🔎 vector_search() round trip ({iterations} queries, top_k={top_k})\n")
+    print(f"  {'path':<8} {'p50 (µs)':>10} {'p95 (µs)':>10}")
+    for name, timings in results.items():
+        print(f"  {name:<8} {summarize(timings)}")
+
+
+def main():
+    """CLI entry point."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark query vector encoding")
+    parser.add_argument("--iterations", type=int, default=1000, help="Vectors/queries per path")
+    parser.add_argument("--top-k", type=int, default=20, help="Results per query")
+    parser.add_argument("--no-db", action="store_true", help="Only measure client-side encoding")
+    args = parser.parse_args()
+
+    bench_encoding(args.iterations)
+    if not args.no_db:
+        asyncio.run(bench_database(args.iterations, args.top_k))
+
+
+if __name__ == "__main__":
+    main()
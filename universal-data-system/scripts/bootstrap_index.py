@@ -1,6 +1,7 @@
 """Bootstrap script for initial Google Drive indexing."""
 
 import asyncio
+import json
 import sys
 from pathlib import Path
 
@@ -10,14 +11,21 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.config import get_settings
 from src.db import get_session
 from src.db.models import DriveAccount
-from src.services.drive import DriveAuthService, DriveSyncService, DriveWatchService
+from src.services.drive import (
+    DriveAuthService,
+    DriveSyncService,
+    DriveWatchService,
+    FolderResolver,
+)
+from src.services.pipeline import IngestPipeline
+from src.services.search_cache import bump_index_generation
 from src.workers.tasks import get_arq_pool
 from src.utils.logging import setup_logging, get_logger
 
 logger = get_logger(__name__)
 
 
-async def bootstrap_account(account_id: str) -> None:
+async def bootstrap_account(account_id: str, enqueue: bool = False) -> None:
     """Bootstrap indexing for a specific account."""
     async with get_session() as session:
         auth_service = DriveAuthService(session)
@@ -31,19 +39,8 @@ async def bootstrap_account(account_id: str) -> None:
 
         logger.info("Starting bootstrap", email=account.user_email)
 
-        # 1. List all indexable files
-        files = await sync_service.list_all_files(account)
-        logger.info("Found files to index", count=len(files))
-
-        # 2. Enqueue reindex jobs for all files
-        pool = await get_arq_pool()
-        for file_info in files:
-            await pool.enqueue_job("reindex_file", account_id, file_info["file_id"])
-            logger.debug("Enqueued", file_id=file_info["file_id"], name=file_info["name"])
-
-        logger.info("Enqueued all files for indexing", count=len(files))
-
-        # 3. Create watch channel for future updates
+        # 1. Create watch channel first: its start page token makes changes
+        # made while the (long) initial index runs show up in the next sync
         channel = await watch_service.create_channel(account)
         logger.info(
             "Created watch channel",
@@ -51,28 +48,78 @@ async def bootstrap_account(account_id: str) -> None:
             expiration=channel.expiration.isoformat(),
         )
 
-        print(f"\n✅ Bootstrap complete!")
-        print(f"   - Account: {account.user_email}")
-        print(f"   - Files queued: {len(files)}")
-        print(f"   - Watch channel: {channel.channel_id}")
-        print(f"   - Expires: {channel.expiration}")
+        # 2. List all indexable files
+        files = await sync_service.list_all_files(account)
+        logger.info("Found files to index", count=len(files))
+        email = account.user_email
+
+    file_ids = [file_info["file_id"] for file_info in files]
+
+    # 3. Index: in-process staged pipeline, or one arq job per file
+    if enqueue:
+        pool = await get_arq_pool()
+        for file_id in file_ids:
+            await pool.enqueue_job("reindex_file", account_id, file_id)
+        logger.info("Enqueued all files for indexing", count=len(file_ids))
+    else:
+        stats = await IngestPipeline(account_id).run(file_ids)
+
+    print(f"\n✅ Bootstrap complete!")
+    print(f"   - Account: {email}")
+    if enqueue:
+        print(f"   - Files queued: {len(file_ids)}")
+    else:
+        print(f"   - Files indexed: {json.dumps(stats['finished'])}")
+        print(f"   - Failed: {json.dumps(stats['failed'])}")
+        print(f"   - Elapsed: {stats['elapsed_seconds']}s ({stats['files_per_second']} files/s)")
+    print(f"   - Watch channel: {channel.channel_id}")
+    print(f"   - Expires: {channel.expiration}")
+    if enqueue:
         print(f"\nRun `arq src.workers.settings.WorkerSettings` to process the queue.")
 
 
-async def bootstrap_all() -> None:
-    """Bootstrap all configured accounts."""
+async def repair_paths(account_id: str) -> None:
+    """Rewrite stored file paths from the folder tree, without reindexing."""
+    async with get_session() as session:
+        account = await DriveAuthService(session).get_account(account_id)
+        if not account:
+            logger.error("Account not found", account_id=account_id)
+            return
+
+        files = await DriveSyncService(session).list_all_files(account)
+        updated = await FolderResolver(account.id).repair_file_paths(
+            session, {file_info["file_id"]: file_info["path"] for file_info in files}
+        )
+        await session.commit()
+        email = account.user_email
+
+    if updated:
+        await bump_index_generation()
+
+    print(f"\n✅ Paths repaired!")
+    print(f"   - Account: {email}")
+    print(f"   - Files listed: {len(files)}")
+    print(f"   - Paths updated: {updated}")
+
+
+async def bootstrap_all(enqueue: bool = False, repair: bool = False) -> None:
+    """Bootstrap (or repair the paths of) all configured accounts."""
     async with get_session() as session:
         from sqlalchemy import select
 
-        result = await session.execute(select(DriveAccount))
-        accounts = result.scalars().all()
+        result = await session.execute(select(DriveAccount.id))
+        account_ids = [str(account_id) for account_id in result.scalars().all()]
 
-        if not accounts:
-            print("No accounts found. Run setup_oauth.py first.")
-            return
+    if not account_ids:
+        print("No accounts found. Run setup_oauth.py first.")
+        return
 
-        for account in accounts:
-            await bootstrap_account(str(account.id))
+    # Outside the session: don't hold a connection open for the whole run
+    for account_id in account_ids:
+        if repair:
+            await repair_paths(account_id)
+        else:
+            await bootstrap_account(account_id, enqueue)
 
 
 def main():
@@ -83,12 +130,25 @@ def main():
     parser = argparse.ArgumentParser(description="Bootstrap Google Drive indexing")
     parser.add_argument("--account-id", help="Specific account ID to bootstrap")
     parser.add_argument("--all", action="store_true", help="Bootstrap all accounts")
+    parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Enqueue one reindex_file job per file instead of indexing in-process",
+    )
+    parser.add_argument(
+        "--repair-paths",
+        action="store_true",
+        help="Only rewrite stored file paths from the folder tree (no reindex); fixes "
+        "name-only paths written by older bootstraps",
+    )
     args = parser.parse_args()
 
-    if args.account_id:
-        asyncio.run(bootstrap_account(args.account_id))
+    if args.account_id and args.repair_paths:
+        asyncio.run(repair_paths(args.account_id))
+    elif args.account_id:
+        asyncio.run(bootstrap_account(args.account_id, args.enqueue))
     elif args.all:
-        asyncio.run(bootstrap_all())
+        asyncio.run(bootstrap_all(args.enqueue, args.repair_paths))
     else:
         parser.print_help()
         print("\nUse --all to bootstrap all accounts, or --account-id for a specific one.")
@@ -15,10 +15,16 @@ from src.utils.logging import setup_logging, get_logger
 logger = get_logger(__name__)
 
 MIGRATIONS_DIR = Path(__file__).parent.parent / "src" / "db" / "migrations"
+OPTIONAL_DIR = MIGRATIONS_DIR / "optional"
 
 
-async def apply_migrations() -> None:
-    """Apply all SQL migrations in order."""
+def optional_migrations() -> list[str]:
+    """Names of the opt-in migrations (applied only when requested)."""
+    return sorted(path.stem for path in OPTIONAL_DIR.glob("*.sql"))
+
+
+async def apply_migrations(optional: list[str] | None = None) -> None:
+    """Apply all SQL migrations in order, then the requested optional ones."""
     settings = get_settings()
 
     # Parse database URL for asyncpg (without +asyncpg)
@@ -27,8 +33,9 @@ async def apply_migrations() -> None:
     conn = await asyncpg.connect(db_url)
 
     try:
-        # Get list of migration files
+        # Get list of migration files (optional/ is not globbed)
         migrations = sorted(MIGRATIONS_DIR.glob("*.sql"))
+        migrations += [OPTIONAL_DIR / f"{name}.sql" for name in optional or []]
 
         for migration_file in migrations:
             logger.info("Applying migration", file=migration_file.name)
@@ -54,8 +61,20 @@ async def apply_migrations() -> None:
 
 def main():
     """CLI entry point."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Apply database migrations")
+    parser.add_argument(
+        "--optional",
+        action="append",
+        choices=optional_migrations(),
+        default=[],
+        metavar="NAME",
+        help=f"Also apply an optional migration ({', '.join(optional_migrations())}); repeatable",
+    )
+    args = parser.parse_args()
+
     setup_logging()
-    asyncio.run(apply_migrations())
+    asyncio.run(apply_migrations(args.optional))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,44 @@
+"""Seed the document embedding cache from already-indexed chunks."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.db import get_session
+from src.services.embedding_cache import get_document_embedding_store
+from src.utils.logging import setup_logging, get_logger
+
+logger = get_logger(__name__)
+
+
+async def warm_cache() -> None:
+    """Copy stored chunk vectors into embedding_cache under the configured model."""
+    store = get_document_embedding_store()
+
+    async with get_session() as session:
+        added = await store.warm_from_chunks(session)
+        await session.commit()
+
+    print(f"\n✅ Embedding cache warmed!")
+    print(f"   - Model: {store.model} ({store.dimensions}d)")
+    print(f"   - Entries added: {added}")
+
+
+def main():
+    """CLI entry point."""
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Seed the embedding cache from indexed chunks. Run it only when "
+        "the existing chunks were embedded by the configured EMBEDDING_BACKEND."
+    )
+    parser.parse_args()
+
+    setup_logging()
+    asyncio.run(warm_cache())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
 """API module."""
 
 from src.api.deps import DatabaseDep, EmbeddingServiceDep, SearchServiceDep
-from src.api.routes import context_router, health_router, search_router, sync_router, webhook_router, ontology_router
+from src.api.routes import (
+    context_router,
+    health_router,
+    metrics_router,
+    ontology_router,
+    search_router,
+    sync_router,
+    webhook_router,
+)
 
 __all__ = [
     "DatabaseDep",
@@ -9,6 +17,7 @@ __all__ = [
     "SearchServiceDep",
     "context_router",
     "health_router",
+    "metrics_router",
     "search_router",
     "sync_router",
     "webhook_router",
@@ -6,7 +6,7 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db import get_db as _get_db
-from src.services.embeddings import GeminiEmbeddingService, get_embedding_service
+from src.services.embeddings import EmbeddingService, get_embedding_service
 from src.services.search import SearchService
 
 # Type aliases for FastAPI dependencies
@@ -19,4 +19,4 @@ def get_search_service() -> SearchService:
 
 
 SearchServiceDep = Annotated[SearchService, Depends(get_search_service)]
-EmbeddingServiceDep = Annotated[GeminiEmbeddingService, Depends(get_embedding_service)]
+EmbeddingServiceDep = Annotated[EmbeddingService, Depends(get_embedding_service)]
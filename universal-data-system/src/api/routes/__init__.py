@@ -2,6 +2,7 @@
 
 from src.api.routes.context import router as context_router
 from src.api.routes.health import router as health_router
+from src.api.routes.metrics import router as metrics_router
 from src.api.routes.search import router as search_router
 from src.api.routes.sync import router as sync_router
 from src.api.routes.webhook import router as webhook_router
@@ -10,6 +11,7 @@ from src.api.routes.ontology import router as ontology_router
 __all__ = [
     "context_router",
     "health_router",
+    "metrics_router",
     "search_router",
     "sync_router",
     "webhook_router",
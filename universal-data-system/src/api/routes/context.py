@@ -1,11 +1,14 @@
 """Context retrieval endpoint for RAG applications."""
 
-from typing import Optional
+from collections.abc import AsyncIterator
+from typing import Any, Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from src.services.search import get_chunk_context
+from src.api.streaming import StreamEvent, event_stream
+from src.services.search import get_chunk_context, stream_chunk_context
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -40,6 +43,20 @@ class ContextResponse(BaseModel):
     total: int
 
 
+def _to_chunk_context(c: dict[str, Any]) -> ChunkContext:
+    """API model for one context row."""
+    return ChunkContext(
+        chunk_id=str(c["id"]),
+        file_id=str(c["file_id"]),
+        file_name=c["file_name"],
+        file_path=c["file_path"],
+        mime_type=c["mime_type"],
+        chunk_index=c["chunk_index"],
+        content=c["content"],
+        heading=c.get("heading"),
+    )
+
+
 @router.post("", response_model=ContextResponse)
 async def get_context(
     request: ContextRequest,
@@ -52,20 +69,33 @@ async def get_context(
     """
     chunks_data = await get_chunk_context(request.chunk_ids)
 
-    chunks = [
-        ChunkContext(
-            chunk_id=str(c["id"]),
-            file_id=str(c["file_id"]),
-            file_name=c["file_name"],
-            file_path=c["file_path"],
-            mime_type=c["mime_type"],
-            chunk_index=c["chunk_index"],
-            content=c["content"],
-            heading=c.get("heading"),
-        )
-        for c in chunks_data
-    ]
+    chunks = [_to_chunk_context(c) for c in chunks_data]
 
     logger.info("Context retrieved", chunk_count=len(chunks))
 
     return ContextResponse(chunks=chunks, total=len(chunks))
+
+
+@router.post("/stream", response_class=StreamingResponse)
+async def stream_context(
+    request: ContextRequest,
+    http_request: Request,
+) -> StreamingResponse:
+    """
+    Stream context chunks as they are read.
+
+    Emits one "chunk" event per row (ordered by file and chunk index), then
+    a "done" event with the total. NDJSON by default; SSE with
+    `Accept: text/event-stream`.
+    """
+
+    async def events() -> AsyncIterator[StreamEvent]:
+        total = 0
+        async for c in stream_chunk_context(request.chunk_ids):
+            total += 1
+            yield "chunk", _to_chunk_context(c)
+
+        logger.info("Context streamed", chunk_count=total)
+        yield "done", {"total": total}
+
+    return event_stream(http_request, events())
@@ -2,6 +2,11 @@
 
 from fastapi import APIRouter
 
+from src.services.embedding_cache import get_document_embedding_store, get_query_embedding_cache
+from src.services.embeddings import embedding_backend_info
+from src.services.rerank import get_reranker
+from src.services.search_cache import get_search_result_cache
+
 router = APIRouter(tags=["health"])
 
 
@@ -11,6 +16,28 @@ async def health_check() -> dict:
     return {"status": "ok"}
 
 
+@router.get("/health/embedding-cache")
+async def embedding_cache_stats() -> dict:
+    """Query and document embedding cache hit/miss counters."""
+    return {
+        "backend": embedding_backend_info(),
+        "query": get_query_embedding_cache().stats(),
+        "documents": get_document_embedding_store().stats(),
+    }
+
+
+@router.get("/health/search-cache")
+async def search_cache_stats() -> dict:
+    """Search result cache hit/miss counters."""
+    return get_search_result_cache().stats()
+
+
+@router.get("/health/rerank")
+async def rerank_stats() -> dict:
+    """Cross-encoder re-rank counters and score cache stats."""
+    return get_reranker().stats()
+
+
 @router.get("/")
 async def root() -> dict:
     """Root endpoint."""
@@ -0,0 +1,36 @@
+"""Prometheus-style metrics endpoint."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.db.session import engine_pool_stats
+from src.services.search import search_pool_stats
+from src.utils.metrics import render_gauge, render_histograms
+
+router = APIRouter(tags=["metrics"])
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _pool_gauges() -> list[str]:
+    """Connection pool occupancy for the asyncpg search pool and the SQLAlchemy engine."""
+    samples: dict[tuple[str, ...], float] = {}
+    for pool, stats in (("search", search_pool_stats()), ("sqlalchemy", engine_pool_stats())):
+        for state, value in (stats or {}).items():
+            samples[(pool, state)] = value
+
+    return render_gauge(
+        "uds_db_pool_connections",
+        "Database pool connections by pool and state (size, in_use/checked_out, idle, ...; "
+        "waiting counts searches queued for a search pool connection)",
+        samples,
+        ("pool", "state"),
+    )
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Search stage histograms and pool saturation gauges."""
+    lines = render_histograms() + _pool_gauges()
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=CONTENT_TYPE)
@@ -1,15 +1,22 @@
 """Search API endpoints."""
 
+import asyncio
+from collections.abc import AsyncIterator
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional, get_args
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from src.api.deps import get_search_service
-from src.services.search import SearchService
+from src.api.streaming import StreamEvent, event_stream
+from src.services.search import SearchResult, SearchResults, SearchService, SearchTuning
+from src.services.search_cache import get_search_result_cache
+from src.services.snippets import make_snippet
 from src.services.tavily import TavilyService
 from src.utils.logging import get_logger
+from src.utils.metrics import SEARCH_SECONDS, stage, timed
 
 logger = get_logger(__name__)
 
@@ -18,6 +25,23 @@ tavily_service = TavilyService()
 router = APIRouter(prefix="/search", tags=["search"])
 
 
+ResultField = Literal[
+    "file_id",
+    "drive_file_id",
+    "file_name",
+    "file_path",
+    "content",
+    "heading",
+    "bm25_score",
+    "vector_score",
+    "rrf_score",
+    "rerank_score",
+]
+
+# Only shape the response; the cached SearchResult lists are the same
+PRESENTATION_FIELDS = {"snippet", "snippet_chars", "highlight", "fields"}
+
+
 class SearchRequest(BaseModel):
     """Search request body."""
 
@@ -29,21 +53,67 @@ class SearchRequest(BaseModel):
     modified_before: Optional[datetime] = Field(default=None, description="Modified before date")
     search_type: str = Field(default="hybrid", description="Search type: hybrid, bm25, vector")
     auto_fallback: bool = Field(default=False, description="Use Tavily web search if local confidence is low")
+    hybrid_engine: Optional[Literal["sql", "parallel"]] = Field(
+        default=None,
+        description="Hybrid engine override: sql (single statement) or parallel (concurrent legs)",
+    )
+    ef_search: Optional[int] = Field(
+        default=None, ge=1, le=1000, description="HNSW ef_search (recall vs latency)"
+    )
+    iterative_scan: Optional[Literal["off", "strict_order", "relaxed_order"]] = Field(
+        default=None, description="HNSW iterative scan mode for filtered queries"
+    )
+    overfetch: Optional[int] = Field(
+        default=None, ge=1, le=50, description="Candidate multiplier when post-filtering"
+    )
+    filter_strategy: Literal["auto", "pre", "post"] = Field(
+        default="auto",
+        description="Apply filters before ranking (pre), after the index scan (post), "
+        "or choose by estimated selectivity (auto)",
+    )
+
+    rerank: Optional[bool] = Field(
+        default=None,
+        description="Hybrid only: re-rank the top fused results with the cross-encoder "
+        "(default: RERANK_ENABLED)",
+    )
+    snippet: bool = Field(
+        default=False, description="Return the best-matching window of each chunk as content"
+    )
+    snippet_chars: int = Field(default=240, ge=40, le=2000, description="Snippet window length")
+    highlight: bool = Field(default=True, description="Wrap query terms in snippets with **")
+    fields: Optional[list[ResultField]] = Field(
+        default=None, description="Return only these result fields (chunk_id is always included)"
+    )
+
+    def tuning(self) -> SearchTuning:
+        """Vector search knobs for SearchService."""
+        return SearchTuning(
+            ef_search=self.ef_search,
+            iterative_scan=self.iterative_scan,
+            overfetch=self.overfetch,
+            filter_strategy=self.filter_strategy,
+        )
+
+    def cache_key(self) -> str:
+        """Search result cache key (presentation options excluded)."""
+        return self.model_dump_json(exclude=PRESENTATION_FIELDS)
 
 
 class SearchResultItem(BaseModel):
-    """Search result item."""
+    """Search result item (fields outside a `fields` projection are omitted)."""
 
     chunk_id: str
-    file_id: str
-    drive_file_id: str
-    file_name: str
-    file_path: str
-    content: str
-    heading: Optional[str]
-    bm25_score: float
-    vector_score: float
-    rrf_score: float
+    file_id: Optional[str] = None
+    drive_file_id: Optional[str] = None
+    file_name: Optional[str] = None
+    file_path: Optional[str] = None
+    content: Optional[str] = None
+    heading: Optional[str] = None
+    bm25_score: Optional[float] = None
+    vector_score: Optional[float] = None
+    rrf_score: Optional[float] = None
+    rerank_score: Optional[float] = None
 
 
 class SearchResponse(BaseModel):
@@ -53,69 +123,279 @@ class SearchResponse(BaseModel):
     results: list[SearchResultItem]
     total: int
     search_type: str
+    cached: bool = False
 
 
-@router.post("", response_model=SearchResponse)
-async def search(
-    request: SearchRequest,
-    service: SearchService = Depends(get_search_service),
-) -> SearchResponse:
-    """
-    Execute hybrid BM25 + vector search with RRF fusion.
+class BatchSearchRequest(BaseModel):
+    """Batch search request body."""
 
-    Supports filtering by path prefix, MIME types, and modification dates.
-    """
+    searches: list[SearchRequest] = Field(
+        ..., min_length=1, max_length=50, description="Searches to run, answered in order"
+    )
+
+
+class BatchSearchResponse(BaseModel):
+    """Batch search response (one SearchResponse per request, same order)."""
+
+    results: list[SearchResponse]
+    total: int
+
+
+async def _execute_search(
+    service: SearchService,
+    request: SearchRequest,
+    query_embedding: list[float] | None = None,
+) -> list[SearchResult]:
+    """Dispatch a request to the search method for its search_type."""
     if request.search_type == "bm25":
-        results = await service.bm25_search(
+        return await service.bm25_search(
             query=request.query,
             top_k=request.top_k,
             path_prefix=request.path_prefix,
+            tuning=request.tuning(),
         )
-    elif request.search_type == "vector":
-        results = await service.vector_search(
-            query=request.query,
-            top_k=request.top_k,
-            path_prefix=request.path_prefix,
-        )
-    else:
-        results = await service.hybrid_search(
+    if request.search_type == "vector":
+        return await service.vector_search(
             query=request.query,
             top_k=request.top_k,
             path_prefix=request.path_prefix,
+            query_embedding=query_embedding,
             mime_types=request.mime_types,
             modified_after=request.modified_after,
             modified_before=request.modified_before,
-            auto_fallback=request.auto_fallback,
+            tuning=request.tuning(),
         )
+    return await service.hybrid_search(
+        query=request.query,
+        top_k=request.top_k,
+        path_prefix=request.path_prefix,
+        mime_types=request.mime_types,
+        modified_after=request.modified_after,
+        modified_before=request.modified_before,
+        auto_fallback=request.auto_fallback,
+        query_embedding=query_embedding,
+        engine=request.hybrid_engine,
+        tuning=request.tuning(),
+        rerank=request.rerank,
+    )
+
+
+def _search_type_label(request: SearchRequest) -> str:
+    """Metric label for the search type actually run (search_type is free text)."""
+    return request.search_type if request.search_type in ("bm25", "vector") else "hybrid"
+
+
+def _wants_rerank(service: SearchService, request: SearchRequest) -> bool:
+    """Whether the request's hybrid results go through the cross-encoder."""
+    if request.search_type in ("bm25", "vector"):
+        return False
+    return service.settings.rerank_enabled if request.rerank is None else request.rerank
+
+
+def _cacheable(results: list[SearchResult]) -> bool:
+    """False for a requested re-rank that fell back to RRF order (skipped, over budget or failed)."""
+    return not isinstance(results, SearchResults) or results.ranking != "rrf_fallback"
+
+
+_ALL_FIELDS: tuple[str, ...] = get_args(ResultField)
+
+
+def _to_item(request: SearchRequest, result: SearchResult) -> SearchResultItem:
+    """API model for one search result, with the request's snippet and projection."""
+    values = {}
+    for field in request.fields or _ALL_FIELDS:
+        value = getattr(result, field)
+        if field == "content" and request.snippet:
+            value = make_snippet(value, request.query, request.snippet_chars, request.highlight)
+        values[field] = value
+    # Cached SearchResults are shared; only the response model gets the snippet
+    return SearchResultItem(chunk_id=result.chunk_id, **values)
+
+
+def _to_response(
+    request: SearchRequest, results: list[SearchResult], cached: bool
+) -> SearchResponse:
+    """Build the API response for one search."""
+    with stage("serialize"):
+        return SearchResponse(
+            query=request.query,
+            results=[_to_item(request, r) for r in results],
+            total=len(results),
+            search_type=request.search_type,
+            cached=cached,
+        )
+
+
+@router.post("", response_model=SearchResponse, response_model_exclude_unset=True)
+async def search(
+    request: SearchRequest,
+    service: SearchService = Depends(get_search_service),
+) -> SearchResponse:
+    """
+    Execute hybrid BM25 + vector search with RRF fusion.
+
+    Supports filtering by path prefix, MIME types, and modification dates.
+    Identical requests are served from the search result cache until the
+    index changes.
+    """
+    with timed(SEARCH_SECONDS, "search", _search_type_label(request)):
+        return await _search(request, service)
+
+
+async def _search(request: SearchRequest, service: SearchService) -> SearchResponse:
+    """POST /search body (timed by the route)."""
+    cache = get_search_result_cache()
+    cache_key = request.cache_key()
+    generation, results = await cache.get(cache_key)
+    cached = results is not None
+
+    if results is None:
+        results = await _execute_search(service, request)
+        if _cacheable(results):
+            cache.set(generation, cache_key, results)
 
     logger.info(
         "Search executed",
         query=request.query[:50],
         results=len(results),
         type=request.search_type,
+        cached=cached,
     )
 
-    return SearchResponse(
-        query=request.query,
+    return _to_response(request, results, cached)
+
+
+@router.post(
+    "/batch", response_model=BatchSearchResponse, response_model_exclude_unset=True
+)
+async def search_batch(
+    request: BatchSearchRequest,
+    service: SearchService = Depends(get_search_service),
+) -> BatchSearchResponse:
+    """
+    Execute many searches in one round trip.
+
+    Cached searches are answered from the search result cache; the rest
+    get their query embeddings from a single batch embedding call and run
+    concurrently across the search connection pool. Results come back in
+    request order.
+    """
+    with timed(SEARCH_SECONDS, "batch", "mixed"):
+        return await _search_batch(request, service)
+
+
+async def _search_batch(request: BatchSearchRequest, service: SearchService) -> BatchSearchResponse:
+    """POST /search/batch body (timed by the route)."""
+    searches = request.searches
+    cache = get_search_result_cache()
+    cache_keys = [search.cache_key() for search in searches]
+    generation, results = await cache.get_many(cache_keys)
+    cached = [r is not None for r in results]
+
+    pending = [i for i, r in enumerate(results) if r is None]
+    needs_embedding = [i for i in pending if searches[i].search_type != "bm25"]
+    with stage("embed"):
+        embeddings = await service.embedding_service.embed_queries_async(
+            [searches[i].query for i in needs_embedding]
+        )
+    embedding_by_index = dict(zip(needs_embedding, embeddings))
+
+    fresh = await asyncio.gather(
+        *(_execute_search(service, searches[i], embedding_by_index.get(i)) for i in pending)
+    )
+    for i, search_results in zip(pending, fresh):
+        results[i] = search_results
+        if _cacheable(search_results):
+            cache.set(generation, cache_keys[i], search_results)
+
+    logger.info(
+        "Batch search executed",
+        searches=len(searches),
+        cached=sum(cached),
+        embedded=len(needs_embedding),
+    )
+
+    return BatchSearchResponse(
         results=[
-            SearchResultItem(
-                chunk_id=r.chunk_id,
-                file_id=r.file_id,
-                drive_file_id=r.drive_file_id,
-                file_name=r.file_name,
-                file_path=r.file_path,
-                content=r.content,
-                heading=r.heading,
-                bm25_score=r.bm25_score,
-                vector_score=r.vector_score,
-                rrf_score=r.rrf_score,
-            )
-            for r in results
+            _to_response(search, search_results, hit)
+            for search, search_results, hit in zip(searches, results, cached)
         ],
-        total=len(results),
-        search_type=request.search_type,
+        total=len(searches),
     )
 
+
+@router.post("/stream", response_class=StreamingResponse)
+async def search_stream(
+    request: SearchRequest,
+    http_request: Request,
+    service: SearchService = Depends(get_search_service),
+) -> StreamingResponse:
+    """
+    Execute a search and stream results as they arrive.
+
+    Emits one "result" event per hit in rank order, then a "done" event
+    with the total. NDJSON by default; SSE with `Accept: text/event-stream`.
+    Cached searches are replayed from the search result cache; streamed
+    results are not added to it (that would buffer the whole list).
+    """
+    cache = get_search_result_cache()
+    _, cached_results = await cache.get(request.cache_key())
+
+    async def events() -> AsyncIterator[StreamEvent]:
+        # Includes time the client takes to consume the stream
+        with timed(SEARCH_SECONDS, "stream", _search_type_label(request)):
+            async for event in _stream_events():
+                yield event
+
+    async def _stream_events() -> AsyncIterator[StreamEvent]:
+        if cached_results is not None:
+            results = _iterate(cached_results)
+        elif _wants_rerank(service, request) or (
+            request.auto_fallback and request.search_type not in ("bm25", "vector")
+        ):
+            # Fallback and re-ranking need the whole fused list first
+            results = _iterate(await _execute_search(service, request))
+        else:
+            results = service.stream_search(
+                query=request.query,
+                search_type=request.search_type,
+                top_k=request.top_k,
+                path_prefix=request.path_prefix,
+                mime_types=request.mime_types,
+                modified_after=request.modified_after,
+                modified_before=request.modified_before,
+                engine=request.hybrid_engine,
+                tuning=request.tuning(),
+            )
+
+        total = 0
+        async for result in results:
+            total += 1
+            yield "result", _to_item(request, result)
+
+        logger.info(
+            "Search streamed",
+            query=request.query[:50],
+            results=total,
+            type=request.search_type,
+            cached=cached_results is not None,
+        )
+        yield "done", {
+            "query": request.query,
+            "total": total,
+            "search_type": request.search_type,
+            "cached": cached_results is not None,
+        }
+
+    return event_stream(http_request, events())
+
+
+async def _iterate(results: list[SearchResult]) -> AsyncIterator[SearchResult]:
+    """Async iterator over an already materialized result list."""
+    for result in results:
+        yield result
+
+
 class WebSearchRequest(BaseModel):
     """Web search request body."""
 
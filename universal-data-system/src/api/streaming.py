@@ -0,0 +1,66 @@
+"""NDJSON / Server-Sent Events responses for the streaming endpoints.
+
+Every event is a (name, payload) pair. NDJSON clients get one
+{"event": name, "data": payload} object per line; clients sending
+`Accept: text/event-stream` get SSE frames (`event: name` / `data: payload`).
+Streams end with a "done" event, or an "error" event if producing the
+next payload failed after the response had started.
+"""
+
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+StreamEvent = tuple[str, BaseModel | dict[str, Any]]
+
+
+def _encode(event: str, payload: BaseModel | dict[str, Any], sse: bool) -> str:
+    """Serialize one event in the negotiated format."""
+    if isinstance(payload, BaseModel):
+        data = payload.model_dump_json(exclude_unset=True)
+    else:
+        data = json.dumps(payload)
+    if sse:
+        return f"event: {event}\ndata: {data}\n\n"
+    return f'{{"event": "{event}", "data": {data}}}\n'
+
+
+def event_stream(request: Request, events: AsyncIterator[StreamEvent]) -> StreamingResponse:
+    """
+    Stream events as NDJSON, or SSE when the client asks for text/event-stream.
+
+    Args:
+        request: Incoming request (its Accept header picks the format)
+        events: Async iterator of (event name, payload)
+
+    Returns:
+        StreamingResponse that writes each event as soon as it is produced
+    """
+    sse = SSE_MEDIA_TYPE in request.headers.get("accept", "")
+
+    async def body() -> AsyncIterator[str]:
+        try:
+            async for event, payload in events:
+                yield _encode(event, payload, sse)
+        except Exception as e:
+            # Status and headers are already sent; report in-band
+            logger.error("Stream failed", path=request.url.path, error=str(e))
+            yield _encode("error", {"detail": str(e)}, sse)
+
+    return StreamingResponse(
+        body(),
+        media_type=SSE_MEDIA_TYPE if sse else NDJSON_MEDIA_TYPE,
+        # Keep reverse proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
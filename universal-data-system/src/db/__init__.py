@@ -1,6 +1,15 @@
 """Database module."""
 
-from src.db.models import Base, Chunk, DriveAccount, DriveChannel, DriveState, File
+from src.db.models import (
+    Base,
+    Chunk,
+    DriveAccount,
+    DriveChannel,
+    DriveFolder,
+    DriveState,
+    EmbeddingCacheEntry,
+    File,
+)
 from src.db.session import close_db, get_db, get_engine, get_session, get_session_factory
 
 __all__ = [
@@ -8,7 +17,9 @@ __all__ = [
     "Chunk",
     "DriveAccount",
     "DriveChannel",
+    "DriveFolder",
     "DriveState",
+    "EmbeddingCacheEntry",
     "File",
     "close_db",
     "get_db",
@@ -0,0 +1,30 @@
+-- Content-addressed document embedding store
+-- Chunks with identical content (same md5 content_hash) embedded with the
+-- same model/dimensions always produce the same vector, so reindexing only
+-- calls the embedding API for content it has never seen.
+
+-- ============================================
+-- Embedding Cache
+-- ============================================
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    content_hash TEXT NOT NULL,  -- md5 of chunk content (chunks.content_hash)
+    model TEXT NOT NULL,
+    dimensions INT NOT NULL,
+    embedding vector(768) NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (content_hash, model, dimensions)
+);
+
+-- Index for age-based pruning
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_created ON embedding_cache(created_at);
+
+-- Already-indexed chunks can seed the cache with
+-- scripts/warm_embedding_cache.py (labelled with the configured model)
+
+-- ============================================
+-- Log successful migration
+-- ============================================
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 004_embedding_cache.sql completed successfully';
+END $$;
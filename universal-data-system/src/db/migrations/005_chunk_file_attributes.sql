@@ -0,0 +1,283 @@
+-- Denormalized file attributes on chunks
+-- Every search used to join chunks to files just to filter on trashed/path/
+-- mime_type and to return the file name/path. Chunk rows now carry those
+-- attributes, so the search path is a single-table scan over chunks
+-- (HNSW/BM25 index scan + filter on the same row).
+--
+-- modified_time is deliberately NOT copied: every content edit changes it,
+-- and pushing it down would rewrite every chunk row of the file (defeating
+-- incremental reindex, and adding index entries whenever the update is not
+-- HOT). Date filters use a semi-join against files (idx_files_modified).
+--
+-- Kept in sync by:
+--   • the indexing writer (merge joins files when writing chunk rows)
+--   • trg_chunks_fill_file_attributes — fills rows inserted by other paths
+--   • trg_files_sync_chunk_attributes — propagates file renames/moves/trash
+
+-- ============================================
+-- Columns
+-- ============================================
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS drive_file_id TEXT;
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS file_name TEXT;
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS file_path TEXT;
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS file_mime_type TEXT;
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS file_trashed BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- Leave room on each page so the (rare) rename/move/trash updates stay HOT
+-- and do not touch the HNSW/BM25 indexes
+ALTER TABLE chunks SET (fillfactor = 90);
+
+-- ============================================
+-- Backfill (only rows out of sync — cheap on re-runs)
+-- ============================================
+UPDATE chunks c
+SET
+    drive_file_id = f.file_id,
+    file_name = f.name,
+    file_path = f.path,
+    file_mime_type = f.mime_type,
+    file_trashed = f.trashed
+FROM files f
+WHERE f.id = c.file_id
+    AND (c.drive_file_id, c.file_name, c.file_path, c.file_mime_type, c.file_trashed)
+        IS DISTINCT FROM (f.file_id, f.name, f.path, f.mime_type, f.trashed);
+
+-- ============================================
+-- Triggers
+-- ============================================
+-- Chunks inserted without attributes (ORM inserts, ad-hoc SQL) copy them from files
+CREATE OR REPLACE FUNCTION chunks_fill_file_attributes()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.file_path IS NULL THEN
+        SELECT f.file_id, f.name, f.path, f.mime_type, f.trashed
+        INTO NEW.drive_file_id, NEW.file_name, NEW.file_path,
+             NEW.file_mime_type, NEW.file_trashed
+        FROM files f
+        WHERE f.id = NEW.file_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER trg_chunks_fill_file_attributes
+    BEFORE INSERT ON chunks
+    FOR EACH ROW EXECUTE FUNCTION chunks_fill_file_attributes();
+
+-- Renames, moves, MIME changes and trashing are pushed down to the
+-- file's chunks; content edits (modified_time) do not fire this
+CREATE OR REPLACE FUNCTION files_sync_chunk_attributes()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE chunks
+    SET
+        drive_file_id = NEW.file_id,
+        file_name = NEW.name,
+        file_path = NEW.path,
+        file_mime_type = NEW.mime_type,
+        file_trashed = NEW.trashed
+    WHERE file_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER trg_files_sync_chunk_attributes
+    AFTER UPDATE OF file_id, name, path, mime_type, trashed ON files
+    FOR EACH ROW
+    WHEN (
+        (OLD.file_id, OLD.name, OLD.path, OLD.mime_type, OLD.trashed)
+        IS DISTINCT FROM
+        (NEW.file_id, NEW.name, NEW.path, NEW.mime_type, NEW.trashed)
+    )
+    EXECUTE FUNCTION files_sync_chunk_attributes();
+
+-- ============================================
+-- Indexes (pre-filtered search paths)
+-- ============================================
+CREATE INDEX IF NOT EXISTS idx_chunks_file_path ON chunks (file_path text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_chunks_file_mime ON chunks (file_mime_type);
+
+-- ============================================
+-- Search functions: single-table versions (same signatures as 002)
+-- ============================================
+CREATE OR REPLACE FUNCTION hybrid_search(
+    query_text TEXT,
+    query_embedding vector(768),  -- Gemini 768d with MRL
+    top_n INT DEFAULT 20,
+    rrf_k INT DEFAULT 60,
+    path_prefix TEXT DEFAULT NULL,
+    mime_types TEXT[] DEFAULT NULL,
+    modified_after TIMESTAMPTZ DEFAULT NULL,
+    modified_before TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS TABLE (
+    chunk_id UUID,
+    file_id UUID,
+    drive_file_id TEXT,
+    file_name TEXT,
+    file_path TEXT,
+    content TEXT,
+    heading TEXT,
+    bm25_score FLOAT,
+    vector_score FLOAT,
+    rrf_score FLOAT
+) AS $$
+WITH
+-- Filtered calls rank an exact, pre-filtered candidate set (as 002 did):
+-- an HNSW scan that is filtered afterwards stops after ef_search rows, so
+-- selective filters would under-return. Unfiltered calls skip this CTE
+-- (one-time filter) and use the BM25/HNSW index scans below.
+filtered_chunks AS MATERIALIZED (
+    SELECT
+        c.id, c.file_id, c.drive_file_id, c.file_name, c.file_path,
+        c.content, c.heading, c.embedding
+    FROM chunks c
+    WHERE (path_prefix IS NOT NULL OR mime_types IS NOT NULL
+           OR modified_after IS NOT NULL OR modified_before IS NOT NULL)
+        AND c.file_trashed = FALSE
+        AND (path_prefix IS NULL OR c.file_path LIKE path_prefix || '%')
+        AND (mime_types IS NULL OR c.file_mime_type = ANY(mime_types))
+        AND ((modified_after IS NULL AND modified_before IS NULL) OR EXISTS (
+            SELECT 1 FROM files f
+            WHERE f.id = c.file_id
+                AND (modified_after IS NULL OR f.modified_time >= modified_after)
+                AND (modified_before IS NULL OR f.modified_time <= modified_before)
+        ))
+),
+-- Candidates: every live chunk for unfiltered calls, else filtered_chunks
+-- (exactly one branch returns rows)
+candidate_chunks AS (
+    SELECT
+        c.id, c.file_id, c.drive_file_id, c.file_name, c.file_path,
+        c.content, c.heading, c.embedding
+    FROM chunks c
+    WHERE path_prefix IS NULL AND mime_types IS NULL
+        AND modified_after IS NULL AND modified_before IS NULL
+        AND c.file_trashed = FALSE
+    UNION ALL
+    SELECT * FROM filtered_chunks
+),
+-- BM25 search using pg_textsearch <@> operator
+-- Note: <@> returns NEGATIVE scores (lower = better match)
+bm25_results AS (
+    SELECT
+        c.id AS chunk_id,
+        c.file_id,
+        c.drive_file_id,
+        c.file_name,
+        c.file_path,
+        c.content,
+        c.heading,
+        -(c.content <@> to_bm25query(query_text, 'idx_chunks_bm25')) AS bm25_score,
+        ROW_NUMBER() OVER (ORDER BY c.content <@> to_bm25query(query_text, 'idx_chunks_bm25')) AS bm25_rank
+    FROM candidate_chunks c
+    WHERE c.content <@> to_bm25query(query_text, 'idx_chunks_bm25') < 0
+    ORDER BY c.content <@> to_bm25query(query_text, 'idx_chunks_bm25')
+    LIMIT top_n * 2
+),
+-- Vector similarity search using pgvector
+vector_results AS (
+    SELECT
+        c.id AS chunk_id,
+        c.file_id,
+        c.drive_file_id,
+        c.file_name,
+        c.file_path,
+        c.content,
+        c.heading,
+        1 - (c.embedding <=> query_embedding) AS vector_score,  -- Cosine similarity
+        ROW_NUMBER() OVER (ORDER BY c.embedding <=> query_embedding) AS vector_rank
+    FROM candidate_chunks c
+    WHERE c.embedding IS NOT NULL
+    ORDER BY c.embedding <=> query_embedding
+    LIMIT top_n * 2
+),
+-- Combine with RRF fusion
+combined AS (
+    SELECT
+        COALESCE(b.chunk_id, v.chunk_id) AS chunk_id,
+        COALESCE(b.file_id, v.file_id) AS file_id,
+        COALESCE(b.drive_file_id, v.drive_file_id) AS drive_file_id,
+        COALESCE(b.file_name, v.file_name) AS file_name,
+        COALESCE(b.file_path, v.file_path) AS file_path,
+        COALESCE(b.content, v.content) AS content,
+        COALESCE(b.heading, v.heading) AS heading,
+        COALESCE(b.bm25_score, 0) AS bm25_score,
+        COALESCE(v.vector_score, 0) AS vector_score,
+        -- RRF formula: 1/(k + rank)
+        COALESCE(1.0 / (rrf_k + b.bm25_rank), 0) +
+        COALESCE(1.0 / (rrf_k + v.vector_rank), 0) AS rrf_score
+    FROM bm25_results b
+    FULL OUTER JOIN vector_results v ON b.chunk_id = v.chunk_id
+)
+SELECT
+    chunk_id,
+    file_id,
+    drive_file_id,
+    file_name,
+    file_path,
+    content,
+    heading,
+    bm25_score,
+    vector_score,
+    rrf_score
+FROM combined
+ORDER BY rrf_score DESC
+LIMIT top_n;
+$$ LANGUAGE SQL STABLE;
+
+CREATE OR REPLACE FUNCTION bm25_search(
+    query_text TEXT,
+    top_n INT DEFAULT 20,
+    path_prefix TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    chunk_id UUID,
+    file_id UUID,
+    content TEXT,
+    score FLOAT
+) AS $$
+SELECT
+    c.id AS chunk_id,
+    c.file_id,
+    c.content,
+    -(c.content <@> to_bm25query(query_text, 'idx_chunks_bm25')) AS score
+FROM chunks c
+WHERE c.file_trashed = FALSE
+    AND c.content <@> to_bm25query(query_text, 'idx_chunks_bm25') < 0
+    AND (path_prefix IS NULL OR c.file_path LIKE path_prefix || '%')
+ORDER BY c.content <@> to_bm25query(query_text, 'idx_chunks_bm25')
+LIMIT top_n;
+$$ LANGUAGE SQL STABLE;
+
+CREATE OR REPLACE FUNCTION vector_search(
+    query_embedding vector(768),  -- Gemini 768d with MRL
+    top_n INT DEFAULT 20,
+    path_prefix TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    chunk_id UUID,
+    file_id UUID,
+    content TEXT,
+    similarity FLOAT
+) AS $$
+SELECT
+    c.id AS chunk_id,
+    c.file_id,
+    c.content,
+    1 - (c.embedding <=> query_embedding) AS similarity
+FROM chunks c
+WHERE c.file_trashed = FALSE
+    AND c.embedding IS NOT NULL
+    AND (path_prefix IS NULL OR c.file_path LIKE path_prefix || '%')
+ORDER BY c.embedding <=> query_embedding
+LIMIT top_n;
+$$ LANGUAGE SQL STABLE;
+
+-- ============================================
+-- Log successful migration
+-- ============================================
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 005_chunk_file_attributes.sql completed successfully';
+END $$;
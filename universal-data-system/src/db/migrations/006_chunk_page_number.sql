@@ -0,0 +1,18 @@
+-- Page numbers on chunks
+-- Paginated sources (PDF) are extracted and chunked page by page; chunks
+-- never span a page boundary, so each one records the 1-based page it
+-- came from. NULL for sources without pages.
+
+-- ============================================
+-- Columns
+-- ============================================
+-- Nullable without a default: metadata-only change, no table rewrite
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS page_number INT;
+
+-- ============================================
+-- Log successful migration
+-- ============================================
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 006_chunk_page_number.sql completed successfully';
+END $$;
@@ -0,0 +1,25 @@
+-- Drive folder tree
+-- File paths are built from each folder's name and parent. Walking parents
+-- with one files.get call per level made every reindexed file cost one API
+-- round trip per ancestor; this table keeps the tree between runs (and
+-- across processes) and is kept current from changes.list folder events.
+
+-- ============================================
+-- Drive Folders
+-- ============================================
+CREATE TABLE IF NOT EXISTS drive_folders (
+    account_id UUID NOT NULL REFERENCES drive_accounts(id) ON DELETE CASCADE,
+    folder_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    parent_id TEXT,  -- NULL at a root (My Drive, folders shared with the account)
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (account_id, folder_id)
+);
+
+-- ============================================
+-- Log successful migration
+-- ============================================
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 007_drive_folders.sql completed successfully';
+END $$;
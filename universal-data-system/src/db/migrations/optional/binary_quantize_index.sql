@@ -0,0 +1,20 @@
+-- Optional: binary-quantized HNSW index (EMBEDDING_STORAGE=binary)
+-- Apply with: python scripts/migrate.py --optional binary_quantize_index
+--
+-- Indexes binary_quantize(embedding)::bit(768) — one bit per dimension, ~32x
+-- smaller vectors than float32, compared by Hamming distance. Ranking by bits
+-- alone loses a lot of recall, so SearchService over-fetches
+-- (QUANTIZED_RERANK_FACTOR) and re-ranks with the exact float distance on
+-- chunks.embedding. Requires pgvector >= 0.7.
+--
+-- The expression must match SearchService's ranking expression exactly
+-- for the planner to use the index.
+
+CREATE INDEX IF NOT EXISTS idx_chunks_embedding_bq ON chunks
+    USING hnsw ((binary_quantize(embedding)::bit(768)) bit_hamming_ops)
+    WITH (m = 16, ef_construction = 128);
+
+DO $$
+BEGIN
+    RAISE NOTICE 'Optional migration binary_quantize_index.sql completed successfully';
+END $$;
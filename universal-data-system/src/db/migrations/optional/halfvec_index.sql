@@ -0,0 +1,19 @@
+-- Optional: half-precision HNSW index (EMBEDDING_STORAGE=halfvec)
+-- Apply with: python scripts/migrate.py --optional halfvec_index
+--
+-- Indexes embedding::halfvec(768) — 2 bytes per dimension instead of 4, so
+-- the graph is roughly half the size of idx_chunks_embedding. chunks.embedding
+-- stays float32: SearchService ranks candidates through this index and
+-- re-ranks them with the exact float distance. Requires pgvector >= 0.7.
+--
+-- The expression must match SearchService's ranking expression exactly
+-- for the planner to use the index.
+
+CREATE INDEX IF NOT EXISTS idx_chunks_embedding_half ON chunks
+    USING hnsw ((embedding::halfvec(768)) halfvec_cosine_ops)
+    WITH (m = 16, ef_construction = 128);
+
+DO $$
+BEGIN
+    RAISE NOTICE 'Optional migration halfvec_index.sql completed successfully';
+END $$;
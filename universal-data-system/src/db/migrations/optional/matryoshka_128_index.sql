@@ -0,0 +1,20 @@
+-- Optional: matryoshka prefix HNSW index (EMBEDDING_STORAGE=matryoshka, MATRYOSHKA_DIMENSIONS=128)
+-- Apply with: python scripts/migrate.py --optional matryoshka_128_index
+--
+-- Gemini embeddings are MRL-trained: the first 128 dimensions are themselves
+-- a usable 128-d embedding. Indexing only that prefix stores 6x smaller
+-- vectors than idx_chunks_embedding and makes each distance computation cheaper.
+-- SearchService generates candidates from this index and re-ranks them with
+-- the full 768-d vector in chunks.embedding. Requires pgvector >= 0.7.
+--
+-- The expression must match SearchService's ranking expression exactly
+-- for the planner to use the index.
+
+CREATE INDEX IF NOT EXISTS idx_chunks_embedding_mrl128 ON chunks
+    USING hnsw ((subvector(embedding, 1, 128)::vector(128)) vector_cosine_ops)
+    WITH (m = 16, ef_construction = 128);
+
+DO $$
+BEGIN
+    RAISE NOTICE 'Optional migration matryoshka_128_index.sql completed successfully';
+END $$;
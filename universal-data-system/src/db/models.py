@@ -104,6 +104,24 @@ class DriveState(Base):
     account: Mapped["DriveAccount"] = relationship(back_populates="state")
 
 
+class DriveFolder(Base):
+    """Drive folder name and parent, for resolving file paths without the API."""
+
+    __tablename__ = "drive_folders"
+
+    account_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("drive_accounts.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    folder_id: Mapped[str] = mapped_column(String, primary_key=True)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    parent_id: Mapped[Optional[str]] = mapped_column(String)  # None at a root (My Drive)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default="NOW()", nullable=False
+    )
+
+
 class File(Base):
     """Indexed file from any source (Drive, Notion, Kiwify)."""
 
@@ -168,11 +186,21 @@ class Chunk(Base):
     end_offset: Mapped[Optional[int]] = mapped_column(Integer)
     heading: Mapped[Optional[str]] = mapped_column(Text)
     content_hash: Mapped[str] = mapped_column(String, nullable=False)
+    page_number: Mapped[Optional[int]] = mapped_column(Integer)  # 1-based, paginated sources
     embedding: Mapped[Optional[list[float]]] = mapped_column(Vector(768))  # Gemini MRL
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default="NOW()", nullable=False
     )
 
+    # Denormalized file attributes (search filters without joining files).
+    # Filled by a trigger on insert and kept in sync by a trigger on files.
+    # modified_time stays on files only: it changes on every edit.
+    drive_file_id: Mapped[Optional[str]] = mapped_column(Text)
+    file_name: Mapped[Optional[str]] = mapped_column(Text)
+    file_path: Mapped[Optional[str]] = mapped_column(Text)
+    file_mime_type: Mapped[Optional[str]] = mapped_column(Text)
+    file_trashed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+
     # Relationships
     file: Mapped["File"] = relationship(back_populates="chunks")
 
@@ -182,6 +210,20 @@ class Chunk(Base):
     )
 
 
+class EmbeddingCacheEntry(Base):
+    """Document embedding keyed by chunk content hash, model and dimensions."""
+
+    __tablename__ = "embedding_cache"
+
+    content_hash: Mapped[str] = mapped_column(String, primary_key=True)
+    model: Mapped[str] = mapped_column(String, primary_key=True)
+    dimensions: Mapped[int] = mapped_column(Integer, primary_key=True)
+    embedding: Mapped[list[float]] = mapped_column(Vector(768), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default="NOW()", nullable=False
+    )
+
+
 class OntologyEntity(Base):
     """Ontology entity (Person, Project, Task, etc.)."""
 
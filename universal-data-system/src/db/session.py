@@ -71,6 +71,19 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+def engine_pool_stats() -> dict[str, int] | None:
+    """SQLAlchemy connection pool occupancy (None until the engine exists)."""
+    if _engine is None:
+        return None
+    pool = _engine.sync_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+    }
+
+
 async def close_db() -> None:
     """Close database connections."""
     global _engine, _session_factory
@@ -5,11 +5,20 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.api import context_router, health_router, search_router, sync_router, webhook_router, ontology_router
+from src.api import (
+    context_router,
+    health_router,
+    metrics_router,
+    ontology_router,
+    search_router,
+    sync_router,
+    webhook_router,
+)
 from src.config import get_settings
 from src.db import close_db
-from src.services.search import close_asyncpg_pool
+from src.services.search import close_asyncpg_pool, warmup_asyncpg_pool
 from src.utils.logging import setup_logging, get_logger
+from src.utils.redis import close_redis
 
 logger = get_logger(__name__)
 
@@ -21,11 +30,19 @@ async def lifespan(app: FastAPI):
     setup_logging()
     logger.info("Starting Universal Data System API")
 
+    if get_settings().search_pool_warmup:
+        try:
+            await warmup_asyncpg_pool()
+        except Exception as e:
+            # Don't block startup: the pool is created lazily on the first search
+            logger.error("Search pool warmup failed", error=str(e))
+
     yield
 
     # Shutdown
     await close_asyncpg_pool()
     await close_db()
+    await close_redis()
     logger.info("Shutting down Universal Data System API")
 
 
@@ -51,6 +68,7 @@ def create_app() -> FastAPI:
 
     # Include routers
     app.include_router(health_router)
+    app.include_router(metrics_router)
     app.include_router(webhook_router)
     app.include_router(search_router)
     app.include_router(context_router)
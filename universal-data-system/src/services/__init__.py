@@ -1,17 +1,36 @@
 """Services module."""
 
 from src.services.chunking import Chunk, ChunkingService
-from src.services.embeddings import GeminiEmbeddingService, get_embedding_service
+from src.services.embedding_cache import (
+    DocumentEmbeddingStore,
+    QueryEmbeddingCache,
+    get_document_embedding_store,
+    get_query_embedding_cache,
+)
+from src.services.embeddings import (
+    EmbeddingService,
+    GeminiEmbeddingService,
+    HashingEmbeddingService,
+    SentenceTransformerEmbeddingService,
+    get_embedding_service,
+)
 from src.services.search import SearchResult, SearchService, close_asyncpg_pool, get_chunk_context
 
 __all__ = [
     "Chunk",
     "ChunkingService",
+    "DocumentEmbeddingStore",
+    "EmbeddingService",
     "GeminiEmbeddingService",
+    "HashingEmbeddingService",
+    "QueryEmbeddingCache",
     "SearchResult",
     "SearchService",
+    "SentenceTransformerEmbeddingService",
     "close_asyncpg_pool",
     "get_chunk_context",
+    "get_document_embedding_store",
     "get_embedding_service",
+    "get_query_embedding_cache",
 ]
 
@@ -3,12 +3,14 @@
 from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import select, delete
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.db.models import File, Chunk
+from src.db.models import File
 from src.services.chunking import ChunkingService
-from src.services.embeddings import get_embedding_service
+from src.services.embedding_cache import get_document_embedding_store
+from src.services.indexing import write_file_chunks
+from src.services.search_cache import bump_index_generation
 from src.services.asaas.client import AsaasClient
 from src.utils.logging import get_logger
 
@@ -19,7 +21,7 @@ class AsaasSyncService:
         self.session = session
         self.client = AsaasClient()
         self.chunking = ChunkingService()
-        self.embeddings = get_embedding_service()
+        self.embedding_store = get_document_embedding_store()
 
     async def sync_all(self) -> dict[str, Any]:
         cust_result = await self.sync_customers()
@@ -189,24 +191,9 @@ class AsaasSyncService:
         await self.session.commit()
         await self.session.refresh(file_record)
 
-        await self.session.execute(delete(Chunk).where(Chunk.file_id == file_record.id))
-
+        # Chunk + embed + persist (only changed rows are written)
         chunks = self.chunking.chunk_text(content)
-        if chunks:
-            contents = [c.content for c in chunks]
-            embeddings = await self.embeddings.embed_batch_async(contents)
-            for chunk, embedding in zip(chunks, embeddings):
-                self.session.add(
-                    Chunk(
-                        file_id=file_record.id,
-                        chunk_index=chunk.index,
-                        content=chunk.content,
-                        start_offset=chunk.start_offset,
-                        end_offset=chunk.end_offset,
-                        heading=chunk.heading,
-                        content_hash=chunk.content_hash,
-                        embedding=embedding,
-                    )
-                )
+        await write_file_chunks(self.session, file_record.id, chunks, self.embedding_store)
 
         await self.session.commit()
+        await bump_index_generation()
@@ -2,7 +2,7 @@
 
 import re
 from dataclasses import dataclass
-from typing import Iterator
+from typing import Iterable, Iterator
 
 from src.config import get_settings
 from src.utils.hash import md5_hash
@@ -21,6 +21,7 @@ class Chunk:
     end_offset: int
     heading: str | None
     content_hash: str
+    page_number: int | None = None  # 1-based, for paginated sources (PDF)
 
 
 class ChunkingService:
@@ -85,6 +86,43 @@ class ChunkingService:
 
         return chunks
 
+    def chunk_pages(self, pages: Iterable[tuple[int, str]]) -> Iterator[Chunk]:
+        """
+        Chunk a paginated document incrementally, one page at a time.
+
+        Only the current page's text is held, so memory stays flat for very
+        large documents. Chunks never span a page boundary (page_number is
+        exact); the current heading carries over to following pages.
+        Offsets are positions in the concatenated page texts.
+
+        Args:
+            pages: (page_number, text) pairs in document order
+
+        Yields:
+            Chunks with page_number set
+        """
+        heading = None
+        page_offset = 0
+        index = 0
+
+        for page_number, text in pages:
+            if text.strip():
+                for section_heading, section_text, section_start in self._split_by_headings(text):
+                    if section_heading:
+                        heading = section_heading
+
+                    for chunk in self._chunk_section(
+                        section_text,
+                        base_offset=page_offset + section_start,
+                        heading=heading,
+                        start_index=index,
+                    ):
+                        chunk.page_number = page_number
+                        index += 1
+                        yield chunk
+
+            page_offset += len(text)
+
     def _split_by_headings(self, text: str) -> list[tuple[str | None, str, int]]:
         """
         Split text by Markdown headings.
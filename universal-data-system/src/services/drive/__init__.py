@@ -2,6 +2,7 @@
 
 from src.services.drive.auth import DriveAuthService, create_oauth_flow, get_or_create_account
 from src.services.drive.export import DriveExportService
+from src.services.drive.folders import FolderResolver
 from src.services.drive.sync import DriveSyncService
 from src.services.drive.watch import DriveWatchService
 
@@ -10,6 +11,7 @@ __all__ = [
     "DriveExportService",
     "DriveSyncService",
     "DriveWatchService",
+    "FolderResolver",
     "create_oauth_flow",
     "get_or_create_account",
 ]
@@ -1,5 +1,6 @@
 """Google Drive OAuth authentication service."""
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
@@ -59,7 +60,7 @@ class DriveAuthService:
         # Check if token needs refresh
         if account.token_expiry <= datetime.now(timezone.utc):
             logger.info("Refreshing expired token", email=account.user_email)
-            creds.refresh(Request())
+            await asyncio.to_thread(creds.refresh, Request())
 
             # Update stored tokens
             account.access_token = creds.token
@@ -96,9 +97,14 @@ class DriveAuthService:
         return account
 
     async def get_drive_service(self, account: DriveAccount) -> Resource:
-        """Get authenticated Drive API service."""
+        """
+        Get authenticated Drive API service.
+
+        Each call builds a new Resource; they are not thread-safe, so callers
+        running requests concurrently need one each.
+        """
         creds = await self.get_credentials(account)
-        return build("drive", "v3", credentials=creds)
+        return await asyncio.to_thread(build, "drive", "v3", credentials=creds)
 
 
 def create_oauth_flow() -> InstalledAppFlow:
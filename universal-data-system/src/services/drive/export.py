@@ -1,12 +1,26 @@
-"""Google Drive file export and download service."""
+"""Google Drive file export and download service.
 
-import io
-from typing import Any
+googleapiclient is synchronous: every request runs in a worker thread
+(asyncio.to_thread) so downloads don't stall the event loop. A Resource is
+not thread-safe, so concurrent callers each pass their own `service`; the
+module-level functions take one directly and need no database session.
+
+Content is streamed to a temporary file in DOWNLOAD_CHUNK_SIZE ranges and
+handed on as a path, so a large file is never held in memory (extractors
+open the path directly).
+"""
+
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, BinaryIO
 
 from googleapiclient.discovery import Resource
 from googleapiclient.http import MediaIoBaseDownload
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import get_settings
 from src.db.models import DriveAccount
 from src.services.drive.auth import DriveAuthService
 from src.utils.logging import get_logger
@@ -23,6 +37,13 @@ EXPORT_MIME_TYPES = {
 # Maximum export size (10MB)
 MAX_EXPORT_SIZE = 10 * 1024 * 1024
 
+# PDFs are extracted page by page, so they get their own (larger) limit
+PDF_MIME_TYPE = "application/pdf"
+
+# Bytes per ranged download request (the client default, 100 MB, is
+# buffered whole in memory by httplib2)
+DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
 
 class DriveExportService:
     """Service for exporting and downloading Google Drive files."""
@@ -32,93 +53,117 @@ class DriveExportService:
         self.session = session
         self.auth_service = DriveAuthService(session)
 
-    async def get_file_content(
-        self, account: DriveAccount, file_id: str, mime_type: str
-    ) -> tuple[bytes, bool]:
-        """
-        Get file content, either via export or download.
-
-        Returns (content, is_oversized).
-        """
-        service = await self.auth_service.get_drive_service(account)
-
-        # Check file size first
-        file_meta = service.files().get(
-            fileId=file_id,
-            fields="size",
-        ).execute()
-
-        size = int(file_meta.get("size", 0))
-        if size > MAX_EXPORT_SIZE:
-            logger.warning(
-                "File too large for export",
-                file_id=file_id,
-                size=size,
-                max_size=MAX_EXPORT_SIZE,
-            )
-            return b"", True
-
-        # Google Workspace files need export
-        if mime_type in EXPORT_MIME_TYPES:
-            return await self._export_file(service, file_id, mime_type), False
-
-        # Regular files need download
-        return await self._download_file(service, file_id), False
-
-    async def _export_file(
-        self, service: Resource, file_id: str, mime_type: str
-    ) -> bytes:
-        """Export a Google Workspace file."""
-        export_mime = EXPORT_MIME_TYPES.get(mime_type, "text/plain")
-
-        try:
-            request = service.files().export_media(
-                fileId=file_id,
-                mimeType=export_mime,
-            )
-
-            buffer = io.BytesIO()
-            downloader = MediaIoBaseDownload(buffer, request)
-
-            done = False
-            while not done:
-                _, done = downloader.next_chunk()
-
-            content = buffer.getvalue()
-            logger.debug("Exported file", file_id=file_id, size=len(content))
-            return content
-
-        except Exception as e:
-            logger.error("Export failed", file_id=file_id, error=str(e))
-            raise
-
-    async def _download_file(self, service: Resource, file_id: str) -> bytes:
-        """Download a regular file."""
-        try:
-            request = service.files().get_media(fileId=file_id)
-
-            buffer = io.BytesIO()
-            downloader = MediaIoBaseDownload(buffer, request)
-
-            done = False
-            while not done:
-                _, done = downloader.next_chunk()
-
-            content = buffer.getvalue()
-            logger.debug("Downloaded file", file_id=file_id, size=len(content))
-            return content
-
-        except Exception as e:
-            logger.error("Download failed", file_id=file_id, error=str(e))
-            raise
+    async def download_to_file(
+        self,
+        account: DriveAccount,
+        file_id: str,
+        mime_type: str,
+        size: int | None,
+        service: Resource | None = None,
+    ) -> tuple[Path | None, bool]:
+        """Stream file content into a temporary file (see download_to_file())."""
+        if service is None:
+            service = await self.auth_service.get_drive_service(account)
+        return await download_to_file(service, file_id, mime_type, size)
 
     async def get_file_metadata(
-        self, account: DriveAccount, file_id: str
+        self, account: DriveAccount, file_id: str, service: Resource | None = None
     ) -> dict[str, Any]:
-        """Get file metadata."""
-        service = await self.auth_service.get_drive_service(account)
-
-        return service.files().get(
+        """Get file metadata (reusing `service` when given)."""
+        if service is None:
+            service = await self.auth_service.get_drive_service(account)
+        return await get_file_metadata(service, file_id)
+
+
+async def download_to_file(
+    service: Resource, file_id: str, mime_type: str, size: int | None
+) -> tuple[Path | None, bool]:
+    """
+    Stream file content (export or download) into a temporary file.
+
+    The size limit is checked against `size` from the metadata the caller
+    already fetched, so no extra request is made. Google Workspace files
+    report no size; their export is checked while it streams.
+
+    Args:
+        service: Drive service of the account owning the file
+        file_id: Drive file ID
+        mime_type: Drive MIME type of the file
+        size: Size in bytes from the file metadata (None if unknown)
+
+    Returns:
+        (path, is_oversized); path is None when oversized. The caller
+        deletes the file.
+    """
+    max_size = max_file_size(mime_type)
+    if size is not None and size > max_size:
+        logger.warning(
+            "File too large for export",
+            file_id=file_id,
+            size=size,
+            max_size=max_size,
+        )
+        return None, True
+
+    # Google Workspace files need export, regular files need download
+    if mime_type in EXPORT_MIME_TYPES:
+        request = service.files().export_media(
             fileId=file_id,
-            fields="id,name,mimeType,modifiedTime,md5Checksum,size,parents,owners,trashed",
-        ).execute()
+            mimeType=EXPORT_MIME_TYPES[mime_type],
+        )
+        done_event, failed_event = "Exported file", "Export failed"
+    else:
+        request = service.files().get_media(fileId=file_id)
+        done_event, failed_event = "Downloaded file", "Download failed"
+
+    fd, name = tempfile.mkstemp(prefix="uds-", dir=get_settings().download_dir)
+    path = Path(name)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            written = await asyncio.to_thread(_download_media, request, fh, max_size)
+    except Exception as e:
+        path.unlink(missing_ok=True)
+        logger.error(failed_event, file_id=file_id, error=str(e))
+        raise
+
+    if written is None:
+        path.unlink(missing_ok=True)
+        logger.warning("File too large for export", file_id=file_id, max_size=max_size)
+        return None, True
+
+    logger.debug(done_event, file_id=file_id, size=written)
+    return path, False
+
+
+async def get_file_metadata(service: Resource, file_id: str) -> dict[str, Any]:
+    """Get file metadata with an existing Drive service (no session needed)."""
+    request = service.files().get(
+        fileId=file_id,
+        fields="id,name,mimeType,modifiedTime,md5Checksum,size,parents,owners,trashed",
+    )
+    return await asyncio.to_thread(request.execute)
+
+
+def max_file_size(mime_type: str) -> int:
+    """Largest file (bytes) indexed for a MIME type."""
+    if mime_type == PDF_MIME_TYPE:
+        return get_settings().pdf_max_size_mb * 1024 * 1024
+    return MAX_EXPORT_SIZE
+
+
+def _download_media(request: Any, fh: BinaryIO, max_size: int) -> int | None:
+    """
+    Stream a media request into `fh` (blocking; call in a thread).
+
+    Returns:
+        Bytes written, or None once the content exceeds `max_size`
+    """
+    downloader = MediaIoBaseDownload(fh, request, chunksize=DOWNLOAD_CHUNK_SIZE)
+
+    done = False
+    while not done:
+        _, done = downloader.next_chunk()
+        if fh.tell() > max_size:
+            return None
+
+    return fh.tell()
@@ -0,0 +1,480 @@
+"""Drive folder tree cache for resolving file paths.
+
+DriveSyncService.get_file_path walked a file's parents with one files.get
+call per level, so a file six folders deep cost six sequential API round
+trips and every sibling re-resolved the same ancestors. FolderResolver
+keeps each folder's (name, parent) in three tiers:
+
+- an in-process LRU (TTLCache) shared by every resolver in the process,
+  plus a memo of finished folder paths;
+- the drive_folders table, shared across processes and runs, kept current
+  from changes.list folder events (DriveSyncService.sync_changes);
+- the Drive API, asked only for folders missing from both, one batch
+  request per tree level for all unknown folders at that level.
+
+prime() loads an account's whole tree with a few files.list pages, which
+bootstrap does before resolving every file. When a folder is renamed or
+moved, apply_changes() rewrites the stored paths of the files under it
+(Drive reports no change for the files themselves).
+"""
+
+import asyncio
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+from uuid import UUID
+
+from googleapiclient.discovery import Resource
+from googleapiclient.errors import HttpError
+from sqlalchemy import delete, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import get_settings
+from src.db import get_session
+from src.db.models import DriveFolder
+from src.utils.cache import TTLCache
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+# Drive accepts up to 100 calls in one batch request
+API_BATCH_SIZE = 100
+# Folders per files.list page in prime()
+LIST_PAGE_SIZE = 1000
+# Keep IN-lists and multi-row INSERTs well below asyncpg's parameter limit
+STORE_BATCH_SIZE = 500
+# Guard against parent cycles in inconsistent data
+MAX_DEPTH = 100
+
+_REPATH_SQL = """
+UPDATE files
+SET path = CAST(:new_prefix AS text) || substr(path, length(CAST(:old_prefix AS text)) + 1),
+    updated_at = NOW()
+WHERE account_id = :account_id
+  AND source_type = 'drive'
+  AND starts_with(path, CAST(:old_prefix AS text) || '/')
+"""
+
+_REPAIR_PATHS_SQL = """
+UPDATE files AS f
+SET path = v.path, updated_at = NOW()
+FROM unnest(CAST(:file_ids AS text[]), CAST(:paths AS text[])) AS v(file_id, path)
+WHERE f.account_id = :account_id
+  AND f.source_type = 'drive'
+  AND f.file_id = v.file_id
+  AND f.path IS DISTINCT FROM v.path
+"""
+
+# One cold-path load at a time: concurrent fetches of sibling files wait
+# for the first one's API calls instead of repeating them
+_load_lock = asyncio.Lock()
+
+
+@dataclass(frozen=True)
+class FolderNode:
+    """A folder's name and first parent."""
+
+    name: str | None  # None: not visible to the account, paths start below it
+    parent_id: str | None  # None at a root
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any]) -> "FolderNode":
+        """Build from a Drive files resource (fields id, name, parents)."""
+        parents = data.get("parents") or []
+        return cls(name=data.get("name", ""), parent_id=parents[0] if parents else None)
+
+
+class FolderCache:
+    """Process-wide folder nodes and resolved folder paths, keyed by (account, folder)."""
+
+    def __init__(self) -> None:
+        """Initialize the cache from settings."""
+        settings = get_settings()
+        self.nodes: TTLCache[FolderNode] = TTLCache(
+            max_entries=settings.folder_cache_max_entries,
+            ttl_seconds=settings.folder_cache_ttl_seconds,
+        )
+        self.paths: TTLCache[str] = TTLCache(
+            max_entries=settings.folder_cache_max_entries,
+            ttl_seconds=settings.folder_cache_ttl_seconds,
+        )
+        self.api_fetches = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return size and hit/miss counters."""
+        return {
+            "nodes": self.nodes.stats(),
+            "paths": self.paths.stats(),
+            "api_fetches": self.api_fetches,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_folder_cache() -> FolderCache:
+    """Get singleton folder cache."""
+    return FolderCache()
+
+
+def _join(folder_path: str, name: str) -> str:
+    """Append a name to a folder path ("" is the top)."""
+    return f"{folder_path}/{name}"
+
+
+def _batch_get(service: Resource, folder_ids: Sequence[str]) -> tuple[dict[str, dict], set[str]]:
+    """
+    Fetch folders in one batch request (blocking; call in a thread).
+
+    Returns:
+        (folders by id, ids the account cannot see). Ids with any other
+        error are in neither and are retried on a later lookup.
+    """
+    found: dict[str, dict] = {}
+    gone: set[str] = set()
+
+    def callback(request_id: str, response: dict, exception: Exception | None) -> None:
+        if exception is None:
+            found[request_id] = response
+        elif isinstance(exception, HttpError) and exception.resp.status == 404:
+            gone.add(request_id)
+        else:
+            logger.warning("Folder lookup failed", folder_id=request_id, error=str(exception))
+
+    batch = service.new_batch_http_request(callback=callback)
+    for folder_id in folder_ids:
+        batch.add(
+            service.files().get(fileId=folder_id, fields="id,name,parents"),
+            request_id=folder_id,
+        )
+    batch.execute()
+    return found, gone
+
+
+class FolderResolver:
+    """Resolve Drive file and folder paths for one account."""
+
+    def __init__(self, account_id: str | UUID) -> None:
+        """Initialize the resolver (cheap: the cache is process-wide)."""
+        self.account_id = UUID(str(account_id))
+        self.cache = get_folder_cache()
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+    async def file_path(self, service: Resource, name: str, parents: Sequence[str]) -> str:
+        """
+        Build the full path of a file from its metadata.
+
+        Args:
+            service: Drive client, used only for folders not cached or stored
+            name: File name
+            parents: The file's `parents` field
+
+        Returns:
+            Path such as "/My Drive/Reports/q3.pdf" ("/name" without parents)
+        """
+        return (await self.file_paths(service, [{"name": name, "parents": parents}]))[0]
+
+    async def file_paths(self, service: Resource, files: Sequence[dict[str, Any]]) -> list[str]:
+        """
+        Build full paths for many files, loading their unknown ancestors together.
+
+        Args:
+            service: Drive client
+            files: Drive file resources (fields name, parents)
+
+        Returns:
+            One path per file, in order
+        """
+        parent_ids = [file["parents"][0] for file in files if file.get("parents")]
+        await self._load(service, parent_ids)
+        return [
+            _join(
+                self._folder_path(file["parents"][0]) if file.get("parents") else "",
+                file.get("name", ""),
+            )
+            for file in files
+        ]
+
+    async def folder_path(self, service: Resource, folder_id: str) -> str:
+        """Build the full path of a folder ("" when it is not visible)."""
+        await self._load(service, [folder_id])
+        return self._folder_path(folder_id)
+
+    def _folder_path(self, folder_id: str) -> str:
+        """Build a folder path from cached nodes (memoized when complete)."""
+        key = (self.account_id, folder_id)
+        path = self.cache.paths.get(key)
+        if path is not None:
+            return path
+
+        names: list[str] = []
+        current_id: str | None = folder_id
+        complete = False
+        for _ in range(MAX_DEPTH):
+            node = self.cache.nodes.get((self.account_id, current_id))
+            if node is None:
+                break  # evicted, or its lookup failed: don't memoize
+            if node.name is None:
+                complete = True
+                break
+            names.append(node.name)
+            current_id = node.parent_id
+            if current_id is None:
+                complete = True
+                break
+
+        path = "".join(f"/{name}" for name in reversed(names))
+        if complete:
+            self.cache.paths.set(key, path)
+        return path
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def _cached(self, folder_id: str) -> bool:
+        """Whether a folder node is in memory."""
+        return self.cache.nodes.get((self.account_id, folder_id)) is not None
+
+    async def _load(self, service: Resource, folder_ids: Iterable[str]) -> None:
+        """Bring folders and all their ancestors into memory, one tree level per round."""
+        pending = {folder_id for folder_id in folder_ids if not self._cached(folder_id)}
+        if not pending:
+            return
+
+        async with _load_lock:
+            while pending:
+                # Another task may have loaded some while we waited
+                pending = {folder_id for folder_id in pending if not self._cached(folder_id)}
+                if not pending:
+                    break
+
+                nodes = await self._read(pending)
+                missing = pending - nodes.keys()
+                if missing:
+                    fetched = await self._fetch(service, missing)
+                    async with get_session() as session:
+                        await self._store(session, {
+                            folder_id: node
+                            for folder_id, node in fetched.items()
+                            if node.name is not None
+                        })
+                        await session.commit()
+                    nodes.update(fetched)
+
+                for folder_id, node in nodes.items():
+                    self.cache.nodes.set((self.account_id, folder_id), node)
+                pending = {
+                    node.parent_id
+                    for node in nodes.values()
+                    if node.parent_id and not self._cached(node.parent_id)
+                }
+
+    async def _read(self, folder_ids: set[str]) -> dict[str, FolderNode]:
+        """Read stored folders."""
+        ids = list(folder_ids)
+        nodes: dict[str, FolderNode] = {}
+        async with get_session() as session:
+            for i in range(0, len(ids), STORE_BATCH_SIZE):
+                result = await session.execute(
+                    select(DriveFolder.folder_id, DriveFolder.name, DriveFolder.parent_id).where(
+                        DriveFolder.account_id == self.account_id,
+                        DriveFolder.folder_id.in_(ids[i:i + STORE_BATCH_SIZE]),
+                    )
+                )
+                for folder_id, name, parent_id in result.all():
+                    nodes[folder_id] = FolderNode(name=name, parent_id=parent_id)
+        return nodes
+
+    async def _fetch(self, service: Resource, folder_ids: set[str]) -> dict[str, FolderNode]:
+        """Fetch folders from the Drive API, API_BATCH_SIZE per batch request."""
+        ids = list(folder_ids)
+        nodes: dict[str, FolderNode] = {}
+        for i in range(0, len(ids), API_BATCH_SIZE):
+            found, gone = await asyncio.to_thread(_batch_get, service, ids[i:i + API_BATCH_SIZE])
+            for folder_id, data in found.items():
+                nodes[folder_id] = FolderNode.from_api(data)
+            for folder_id in gone:
+                # Kept in memory only: sharing can change without a folder event
+                nodes[folder_id] = FolderNode(name=None, parent_id=None)
+            self.cache.api_fetches += 1
+
+        logger.debug("Fetched folders", requested=len(ids), found=len(nodes))
+        return nodes
+
+    async def _store(self, session: AsyncSession, nodes: dict[str, FolderNode]) -> None:
+        """Upsert folders in the caller's transaction."""
+        rows = [
+            {
+                "account_id": self.account_id,
+                "folder_id": folder_id,
+                "name": node.name,
+                "parent_id": node.parent_id,
+            }
+            for folder_id, node in nodes.items()
+        ]
+        for i in range(0, len(rows), STORE_BATCH_SIZE):
+            stmt = pg_insert(DriveFolder).values(rows[i:i + STORE_BATCH_SIZE])
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[DriveFolder.account_id, DriveFolder.folder_id],
+                    set_={
+                        "name": stmt.excluded.name,
+                        "parent_id": stmt.excluded.parent_id,
+                        "updated_at": text("NOW()"),
+                    },
+                )
+            )
+
+    async def prime(self, service: Resource) -> int:
+        """
+        Load every folder of the account with files.list (bootstrap).
+
+        Args:
+            service: Drive client
+
+        Returns:
+            Number of folders listed
+        """
+        nodes: dict[str, FolderNode] = {}
+        page_token = None
+        while True:
+            request = service.files().list(
+                q=f"mimeType='{FOLDER_MIME_TYPE}' and trashed=false",
+                pageSize=LIST_PAGE_SIZE,
+                pageToken=page_token,
+                fields="nextPageToken,files(id,name,parents)",
+                spaces="drive",
+            )
+            response = await asyncio.to_thread(request.execute)
+            for data in response.get("files", []):
+                nodes[data["id"]] = FolderNode.from_api(data)
+
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+
+        async with get_session() as session:
+            await self._store(session, nodes)
+            await session.commit()
+        for folder_id, node in nodes.items():
+            self.cache.nodes.set((self.account_id, folder_id), node)
+        self.cache.paths.clear()
+
+        logger.info("Primed folder tree", account_id=str(self.account_id), folders=len(nodes))
+        return len(nodes)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    async def apply_changes(
+        self, session: AsyncSession, service: Resource, changes: Sequence[dict[str, Any]]
+    ) -> int:
+        """
+        Apply the folder events of a changes.list page.
+
+        Folder upserts, deletions and path rewrites go into the caller's
+        transaction, so they commit together with the page token.
+
+        Args:
+            session: Database session (not committed)
+            service: Drive client
+            changes: `changes` of one changes.list response
+
+        Returns:
+            Number of file paths rewritten under renamed or moved folders
+        """
+        updated: dict[str, FolderNode] = {}
+        removed: set[str] = set()
+        for change in changes:
+            file_id = change.get("fileId")
+            data = change.get("file") or {}
+            if not file_id:
+                continue
+            if change.get("removed") or data.get("trashed"):
+                # No mimeType once removed; deleting a non-folder id is a no-op
+                removed.add(file_id)
+            elif data.get("mimeType") == FOLDER_MIME_TYPE:
+                updated[file_id] = FolderNode.from_api(data)
+
+        if not updated and not removed:
+            return 0
+
+        # Known folders whose name or parent changed: their files need new paths
+        previous = await self._read(set(updated))
+        moved = [
+            folder_id
+            for folder_id, node in updated.items()
+            if folder_id in previous and previous[folder_id] != node
+        ]
+        old_paths = {folder_id: await self.folder_path(service, folder_id) for folder_id in moved}
+
+        await self._store(session, updated)
+        removed_ids = list(removed)
+        for i in range(0, len(removed_ids), STORE_BATCH_SIZE):
+            await session.execute(
+                delete(DriveFolder).where(
+                    DriveFolder.account_id == self.account_id,
+                    DriveFolder.folder_id.in_(removed_ids[i:i + STORE_BATCH_SIZE]),
+                )
+            )
+
+        for folder_id, node in updated.items():
+            self.cache.nodes.set((self.account_id, folder_id), node)
+        for folder_id in removed:
+            if self._cached(folder_id):
+                self.cache.nodes.set((self.account_id, folder_id), FolderNode(None, None))
+        self.cache.paths.clear()
+
+        # Deepest first: a rewritten path already carries its ancestors' new names
+        repathed = 0
+        for folder_id in sorted(moved, key=lambda f: len(old_paths[f]), reverse=True):
+            old_path = old_paths[folder_id]
+            new_path = await self.folder_path(service, folder_id)
+            if not old_path or old_path == new_path:
+                continue
+            result = await session.execute(
+                text(_REPATH_SQL),
+                {"account_id": self.account_id, "old_prefix": old_path, "new_prefix": new_path},
+            )
+            repathed += result.rowcount
+            logger.info(
+                "Folder moved, paths rewritten",
+                folder_id=folder_id,
+                old_path=old_path,
+                new_path=new_path,
+                files=result.rowcount,
+            )
+
+        return repathed
+
+    async def repair_file_paths(self, session: AsyncSession, paths: dict[str, str]) -> int:
+        """
+        Overwrite stored file paths that differ from freshly resolved ones.
+
+        Fixes rows written by older bootstraps, which stored "/name" only.
+
+        Args:
+            session: Database session (not committed)
+            paths: Resolved path by Drive file ID
+
+        Returns:
+            Number of files updated
+        """
+        items = list(paths.items())
+        updated = 0
+        for i in range(0, len(items), STORE_BATCH_SIZE):
+            batch = items[i:i + STORE_BATCH_SIZE]
+            result = await session.execute(
+                text(_REPAIR_PATHS_SQL),
+                {
+                    "account_id": self.account_id,
+                    "file_ids": [file_id for file_id, _ in batch],
+                    "paths": [path for _, path in batch],
+                },
+            )
+            updated += result.rowcount
+        return updated
@@ -1,14 +1,16 @@
 """Google Drive sync service using changes.list API."""
 
+import asyncio
 from datetime import datetime, timezone
 from typing import Any
 
-from googleapiclient.discovery import Resource
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.models import DriveAccount, DriveState, File
 from src.services.drive.auth import DriveAuthService
+from src.services.drive.folders import FolderResolver
+from src.services.search_cache import bump_index_generation
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -58,21 +60,29 @@ class DriveSyncService:
 
         changes_processed = []
         page_token = state.last_page_token
+        folder_resolver = FolderResolver(account.id)
+        repathed = 0
 
         while True:
-            response = service.changes().list(
+            request = service.changes().list(
                 pageToken=page_token,
                 spaces="drive",
                 fields="nextPageToken,newStartPageToken,changes(fileId,removed,file(id,name,mimeType,modifiedTime,md5Checksum,size,trashed,parents,owners))",
                 includeItemsFromAllDrives=False,
                 supportsAllDrives=False,
-            ).execute()
+            )
+            response = await asyncio.to_thread(request.execute)
 
             for change in response.get("changes", []):
                 change_info = await self._process_change(account, change)
                 if change_info:
                     changes_processed.append(change_info)
 
+            # Folder renames/moves: committed with the page token below
+            repathed += await folder_resolver.apply_changes(
+                self.session, service, response.get("changes", [])
+            )
+
             # Check if there are more pages
             if "newStartPageToken" in response:
                 # All changes processed
@@ -88,10 +98,14 @@ class DriveSyncService:
             else:
                 break
 
+        if repathed:
+            await bump_index_generation()
+
         logger.info(
             "Sync completed",
             account_id=account_id,
             changes_count=len(changes_processed),
+            repathed_files=repathed,
         )
 
         return changes_processed
@@ -138,32 +152,19 @@ class DriveSyncService:
             "size": file_data.get("size"),
         }
 
-    async def get_file_path(self, service: Resource, file_id: str) -> str:
-        """Build the full path for a file by traversing parents."""
-        path_parts = []
-
-        current_id = file_id
-        while current_id:
-            try:
-                file = service.files().get(
-                    fileId=current_id,
-                    fields="name,parents",
-                ).execute()
-
-                path_parts.insert(0, file.get("name", ""))
-
-                parents = file.get("parents", [])
-                current_id = parents[0] if parents else None
-            except Exception:
-                break
-
-        return "/" + "/".join(path_parts) if path_parts else "/"
-
     async def list_all_files(
         self, account: DriveAccount, page_size: int = 100
     ) -> list[dict[str, Any]]:
-        """List all indexable files in Drive (for initial bootstrap)."""
+        """
+        List all indexable files in Drive (for initial bootstrap).
+
+        Loads the account's folder tree first, so full paths cost no
+        per-file API calls (and later reindexes of these files find every
+        folder cached).
+        """
         service = await self.auth_service.get_drive_service(account)
+        folder_resolver = FolderResolver(account.id)
+        await folder_resolver.prime(service)
 
         all_files = []
         page_token = None
@@ -173,22 +174,22 @@ class DriveSyncService:
         query = f"({' or '.join(mime_queries)}) and trashed=false"
 
         while True:
-            response = service.files().list(
+            request = service.files().list(
                 q=query,
                 pageSize=page_size,
                 pageToken=page_token,
                 fields="nextPageToken,files(id,name,mimeType,modifiedTime,md5Checksum,size,parents,owners)",
                 spaces="drive",
-            ).execute()
+            )
+            response = await asyncio.to_thread(request.execute)
 
-            for file_data in response.get("files", []):
-                # Use simple path (name only) for bootstrap speed
-                name = file_data.get("name", "")
-                path = "/" + name
+            page_files = response.get("files", [])
+            paths = await folder_resolver.file_paths(service, page_files)
 
+            for file_data, path in zip(page_files, paths):
                 all_files.append({
                     "file_id": file_data["id"],
-                    "name": name,
+                    "name": file_data.get("name", ""),
                     "path": path,
                     "mime_type": file_data.get("mimeType", ""),
                     "modified_time": file_data.get("modifiedTime"),
@@ -1,5 +1,6 @@
 """Google Drive changes.watch webhook management."""
 
+import asyncio
 import uuid
 from datetime import datetime, timedelta, timezone
 
@@ -64,10 +65,9 @@ class DriveWatchService:
             "expiration": str(expiration_ms),
         }
 
-        response = service.changes().watch(
-            pageToken=state.start_page_token,
-            body=body,
-        ).execute()
+        response = await asyncio.to_thread(
+            service.changes().watch(pageToken=state.start_page_token, body=body).execute
+        )
 
         # Store channel in database
         channel = DriveChannel(
@@ -103,12 +103,14 @@ class DriveWatchService:
         service = await self.auth_service.get_drive_service(account)
 
         try:
-            service.channels().stop(
-                body={
-                    "id": channel.channel_id,
-                    "resourceId": channel.resource_id,
-                }
-            ).execute()
+            await asyncio.to_thread(
+                service.channels().stop(
+                    body={
+                        "id": channel.channel_id,
+                        "resourceId": channel.resource_id,
+                    }
+                ).execute
+            )
             logger.info("Stopped Drive channel", channel_id=channel.channel_id)
         except Exception as e:
             # Channel may already be expired
@@ -167,7 +169,7 @@ class DriveWatchService:
             return state
 
         # Get initial page token from Google
-        response = service.changes().getStartPageToken().execute()
+        response = await asyncio.to_thread(service.changes().getStartPageToken().execute)
         start_token = response["startPageToken"]
 
         state = DriveState(
@@ -0,0 +1,324 @@
+"""Embedding caches: query embeddings (LRU + optional Redis) and document embeddings (Postgres).
+
+Agents repeat the same handful of queries all day, so the remote embedding
+round-trip for a query is cached keyed on the whitespace-trimmed text,
+task type, model and dimensionality.
+
+Document chunks are content-addressed: a chunk whose md5 content_hash was
+already embedded with the same model/dimensions reuses the stored vector,
+so reindexing an edited file only embeds the chunks that actually changed.
+"""
+
+import hashlib
+from array import array
+from collections.abc import Mapping, Sequence
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import get_settings
+from src.db import get_session
+from src.db.models import EmbeddingCacheEntry
+from src.utils.cache import TTLCache
+from src.utils.logging import get_logger
+from src.utils.redis import get_redis
+
+if TYPE_CHECKING:
+    from src.services.chunking import Chunk
+
+logger = get_logger(__name__)
+
+REDIS_KEY_PREFIX = "uds:qemb"
+
+# Keep IN-lists and multi-row INSERTs well below asyncpg's parameter limit
+STORE_BATCH_SIZE = 500
+
+def normalize_query(text: str) -> str:
+    """
+    Trim surrounding whitespace from a query.
+
+    The cached value is the embedding of exactly this text, so nothing that
+    could change the embedding (case, inner whitespace) is normalized.
+    """
+    return text.strip()
+
+
+class QueryEmbeddingCache:
+    """
+    Two-tier cache for query embeddings.
+
+    Tier 1 is a per-process LRU with TTL; tier 2 (optional) is Redis, shared
+    by every API process. Redis errors never fail a search — they are logged
+    and treated as misses.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache from settings."""
+        settings = get_settings()
+        self.enabled = settings.query_cache_enabled
+        self.ttl_seconds = settings.query_cache_ttl_seconds
+        self.use_redis = settings.query_cache_redis
+        self.memory: TTLCache[list[float]] = TTLCache(
+            max_entries=settings.query_cache_max_entries,
+            ttl_seconds=settings.query_cache_ttl_seconds,
+        )
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.redis_errors = 0
+
+    @staticmethod
+    def make_key(text: str, task_type: str, model: str, dimensions: int) -> str:
+        """Build the cache key for a query."""
+        digest = hashlib.sha256(normalize_query(text).encode("utf-8")).hexdigest()
+        return f"{model}:{task_type}:{dimensions}:{digest}"
+
+    async def get(self, key: str) -> list[float] | None:
+        """Look up an embedding in memory, then Redis."""
+        if not self.enabled:
+            return None
+
+        embedding = self.memory.get(key)
+        if embedding is not None:
+            return embedding
+
+        if not self.use_redis:
+            return None
+
+        try:
+            raw = await get_redis().get(f"{REDIS_KEY_PREFIX}:{key}")
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("Query cache Redis lookup failed", error=str(e))
+            return None
+
+        if raw is None:
+            self.redis_misses += 1
+            return None
+
+        self.redis_hits += 1
+        embedding = array("f", raw).tolist()
+        self.memory.set(key, embedding)
+        return embedding
+
+    async def set(self, key: str, embedding: list[float]) -> None:
+        """Store an embedding in both tiers."""
+        if not self.enabled:
+            return
+
+        self.memory.set(key, embedding)
+
+        if not self.use_redis:
+            return
+
+        try:
+            await get_redis().set(
+                f"{REDIS_KEY_PREFIX}:{key}",
+                array("f", embedding).tobytes(),  # float32, same precision as pgvector
+                ex=self.ttl_seconds,
+            )
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("Query cache Redis write failed", error=str(e))
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters for both tiers."""
+        memory = self.memory.stats()
+        return {
+            "enabled": self.enabled,
+            "memory": memory,
+            "redis": {
+                "enabled": self.use_redis,
+                "hits": self.redis_hits,
+                "misses": self.redis_misses,
+                "errors": self.redis_errors,
+            },
+            # Every hit in either tier is one embedding API call saved
+            "embedding_calls_saved": memory["hits"] + self.redis_hits,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Get singleton query embedding cache."""
+    return QueryEmbeddingCache()
+
+
+class DocumentEmbeddingStore:
+    """
+    Content-hash-keyed store of document embeddings (table embedding_cache).
+
+    The indexing paths call embed_chunks() instead of embedding every chunk:
+    known hashes are read back from Postgres and only unseen content is sent
+    to the embedding API.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the store for the configured embedding service."""
+        # Lazy import to avoid circular dependencies
+        from src.services.embeddings import get_embedding_service
+
+        self.embedding_service = get_embedding_service()
+        self.model = self.embedding_service.MODEL
+        self.dimensions = self.embedding_service.DIMENSIONS
+        self.hits = 0
+        self.misses = 0
+
+    async def embed_chunks(
+        self,
+        session: AsyncSession,
+        chunks: Sequence["Chunk"],
+        resolved: Mapping[str, list[float]] | None = None,
+    ) -> list[list[float]]:
+        """
+        Return one embedding per chunk, embedding only unseen content.
+
+        New embeddings are added to the store in the caller's transaction.
+        `resolved` holds vectors the caller already has by content hash (the
+        ingest pipeline embeds before persisting); those skip the lookup.
+        """
+        if not chunks:
+            return []
+
+        # Identical chunks within a file are embedded once
+        contents_by_hash: dict[str, str] = {}
+        for chunk in chunks:
+            contents_by_hash.setdefault(chunk.content_hash, chunk.content)
+
+        resolved = resolved or {}
+        found = {h: resolved[h] for h in contents_by_hash if h in resolved}
+        pending = [h for h in contents_by_hash if h not in found]
+        found.update(await self._lookup(session, pending))
+        missing = [h for h in pending if h not in found]
+
+        if missing:
+            embeddings = await self.embedding_service.embed_batch_async(
+                [contents_by_hash[h] for h in missing]
+            )
+            new_entries = dict(zip(missing, embeddings))
+            await self._store(session, new_entries)
+            found.update(new_entries)
+
+        hits = len(pending) - len(missing)
+        self.hits += hits
+        self.misses += len(missing)
+        logger.debug(
+            "Document embeddings resolved",
+            chunks=len(chunks),
+            cached=hits,
+            embedded=len(missing),
+        )
+
+        return [found[chunk.content_hash] for chunk in chunks]
+
+    async def resolve_chunks(self, chunks: Sequence["Chunk"]) -> dict[str, list[float]]:
+        """
+        Return embeddings by content hash without holding a connection across API calls.
+
+        Stored vectors are read in one short session. Unseen content is
+        embedded with no session open (scheduler retries can take a minute),
+        then stored in a second short session. The ingest pipeline passes
+        the result to embed_chunks() as `resolved`.
+        """
+        contents_by_hash: dict[str, str] = {}
+        for chunk in chunks:
+            contents_by_hash.setdefault(chunk.content_hash, chunk.content)
+        hashes = list(contents_by_hash)
+
+        async with get_session() as session:
+            found = await self._lookup(session, hashes)
+        missing = [h for h in hashes if h not in found]
+
+        if missing:
+            embeddings = await self.embedding_service.embed_batch_async(
+                [contents_by_hash[h] for h in missing]
+            )
+            new_entries = dict(zip(missing, embeddings))
+            async with get_session() as session:
+                await self._store(session, new_entries)
+            found.update(new_entries)
+
+        self.hits += len(hashes) - len(missing)
+        self.misses += len(missing)
+        logger.debug(
+            "Document embeddings resolved",
+            chunks=len(chunks),
+            cached=len(hashes) - len(missing),
+            embedded=len(missing),
+        )
+        return found
+
+    async def _lookup(
+        self, session: AsyncSession, hashes: list[str]
+    ) -> dict[str, list[float]]:
+        """Fetch stored embeddings for the given content hashes."""
+        found: dict[str, list[float]] = {}
+        for i in range(0, len(hashes), STORE_BATCH_SIZE):
+            result = await session.execute(
+                select(EmbeddingCacheEntry.content_hash, EmbeddingCacheEntry.embedding).where(
+                    EmbeddingCacheEntry.content_hash.in_(hashes[i:i + STORE_BATCH_SIZE]),
+                    EmbeddingCacheEntry.model == self.model,
+                    EmbeddingCacheEntry.dimensions == self.dimensions,
+                )
+            )
+            for content_hash, embedding in result.all():
+                found[content_hash] = embedding.tolist()  # pgvector returns numpy arrays
+        return found
+
+    async def _store(
+        self, session: AsyncSession, entries: dict[str, list[float]]
+    ) -> None:
+        """Insert new embeddings (concurrent workers may race; first writer wins)."""
+        rows = [
+            {
+                "content_hash": content_hash,
+                "model": self.model,
+                "dimensions": self.dimensions,
+                "embedding": embedding,
+            }
+            for content_hash, embedding in entries.items()
+        ]
+        for i in range(0, len(rows), STORE_BATCH_SIZE):
+            await session.execute(
+                pg_insert(EmbeddingCacheEntry)
+                .values(rows[i:i + STORE_BATCH_SIZE])
+                .on_conflict_do_nothing()
+            )
+
+    async def warm_from_chunks(self, session: AsyncSession) -> int:
+        """
+        Copy already-indexed chunk vectors into the store, labelled with this model.
+
+        Only correct when the existing chunks were embedded by the configured
+        backend; returns the number of entries added.
+        """
+        result = await session.execute(
+            text(
+                """
+                INSERT INTO embedding_cache (content_hash, model, dimensions, embedding)
+                SELECT DISTINCT ON (content_hash) content_hash, :model, :dimensions, embedding
+                FROM chunks
+                WHERE embedding IS NOT NULL
+                ON CONFLICT DO NOTHING
+                """
+            ),
+            {"model": self.model, "dimensions": self.dimensions},
+        )
+        return result.rowcount
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters since process start."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_document_embedding_store() -> DocumentEmbeddingStore:
+    """Get singleton document embedding store."""
+    return DocumentEmbeddingStore()
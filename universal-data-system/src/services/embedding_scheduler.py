@@ -0,0 +1,268 @@
+"""Rate-limited, coalescing scheduler for remote batch embedding calls.
+
+Every reindex job used to send its whole chunk list in a single
+embed_content call on the default executor — no size cap, no concurrency
+limit — so worker_concurrency=10 produced bursts of 429s. The scheduler:
+
+- coalesces requests arriving within a short window (e.g. from parallel
+  reindex_file jobs in the same worker) into shared batches,
+- splits work into API-sized batches,
+- runs batches concurrently under a semaphore and a token-bucket rate limit,
+- retries quota/transient errors with exponential backoff and jitter,
+- re-runs a shared batch per request after a non-retryable error, so one
+  caller's bad text fails only that caller.
+
+Limits are per process: each API/worker process gets its own bucket.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+EmbedFn = Callable[[list[str], bool], list[list[float]]]
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until `tokens` are available and take them."""
+        tokens = min(tokens, self.capacity)
+        async with self._lock:  # FIFO: waiters queue behind the lock
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+
+@dataclass
+class _PendingRequest:
+    """Texts waiting to be coalesced into a batch."""
+
+    texts: list[str]
+    future: asyncio.Future = field(repr=False)
+
+
+class EmbeddingScheduler:
+    """Coalesce, batch, rate-limit and retry calls to a blocking batch embed function."""
+
+    def __init__(
+        self,
+        embed_fn: EmbedFn,
+        is_retryable: Callable[[Exception], bool],
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+        rate_limit_per_minute: int = 0,
+        coalesce_ms: int = 25,
+        max_retries: int = 5,
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            embed_fn: Blocking function (texts, is_query) -> embeddings
+            is_retryable: Classifies exceptions that deserve a backoff + retry
+            batch_size: Max texts per API call
+            max_concurrency: Max API calls in flight
+            rate_limit_per_minute: Texts per minute (0 disables rate limiting)
+            coalesce_ms: How long small requests wait for company
+            max_retries: Retries per batch before the error is raised
+        """
+        self.embed_fn = embed_fn
+        self.is_retryable = is_retryable
+        self.batch_size = batch_size
+        self.coalesce_seconds = coalesce_ms / 1000
+        self.max_retries = max_retries
+        self.bucket = (
+            TokenBucket(rate=rate_limit_per_minute / 60, capacity=batch_size)
+            if rate_limit_per_minute > 0
+            else None
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="embed"
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Pending requests per task type (is_query) — batches never mix task types
+        self._pending: dict[bool, list[_PendingRequest]] = {False: [], True: []}
+        self._flush_handles: dict[bool, asyncio.TimerHandle | None] = {False: None, True: None}
+        # The loop only keeps weak references to tasks: hold dispatches until done
+        self._dispatches: set[asyncio.Task] = set()
+
+        self.api_calls = 0
+        self.retries = 0
+        self.coalesced_requests = 0
+
+    async def embed(self, texts: list[str], is_query: bool = False) -> list[list[float]]:
+        """Embed texts, sharing API batches with concurrent callers."""
+        if not texts:
+            return []
+
+        loop = asyncio.get_running_loop()
+        request = _PendingRequest(texts=list(texts), future=loop.create_future())
+        pending = self._pending[is_query]
+        pending.append(request)
+
+        if sum(len(r.texts) for r in pending) >= self.batch_size:
+            self._flush(is_query)
+        elif self._flush_handles[is_query] is None:
+            self._flush_handles[is_query] = loop.call_later(
+                self.coalesce_seconds, self._flush, is_query
+            )
+
+        return await request.future
+
+    def _flush(self, is_query: bool) -> None:
+        """Take every pending request of one task type and dispatch it."""
+        handle = self._flush_handles[is_query]
+        if handle is not None:
+            handle.cancel()
+            self._flush_handles[is_query] = None
+
+        requests = self._pending[is_query]
+        if not requests:
+            return
+        self._pending[is_query] = []
+        if len(requests) > 1:
+            self.coalesced_requests += len(requests)
+
+        task = asyncio.get_running_loop().create_task(self._dispatch(requests, is_query))
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, requests: list[_PendingRequest], is_query: bool) -> None:
+        """
+        Run the combined texts as API-sized batches and hand results back.
+
+        A failed batch fails only the requests with texts in it; requests
+        coalesced into other batches still get their embeddings. A batch
+        shared by several requests that fails with a non-retryable error
+        (typically one caller's bad text) is retried split by request, so
+        only the culprit request fails.
+        """
+        texts = [text for request in requests for text in request.texts]
+        bounds: list[tuple[int, int]] = []  # [start, end) of each request in texts
+        for request in requests:
+            start = bounds[-1][1] if bounds else 0
+            bounds.append((start, start + len(request.texts)))
+
+        vectors: list[list[float] | None] = [None] * len(texts)
+        errors: list[BaseException | None] = [None] * len(requests)
+
+        try:
+            batches = [
+                (i, min(i + self.batch_size, len(texts)))
+                for i in range(0, len(texts), self.batch_size)
+            ]
+            results = await asyncio.gather(
+                *(self._run_batch(texts[lo:hi], is_query) for lo, hi in batches),
+                return_exceptions=True,
+            )
+
+            retry: list[tuple[int, int, int]] = []  # (request index, start, end)
+            for (lo, hi), result in zip(batches, results):
+                if not isinstance(result, BaseException):
+                    vectors[lo:hi] = result
+                    continue
+                owners = [
+                    (i, max(start, lo), min(end, hi))
+                    for i, (start, end) in enumerate(bounds)
+                    if start < hi and end > lo and not requests[i].future.done()
+                ]
+                if (
+                    len(owners) > 1
+                    and isinstance(result, Exception)
+                    and not self.is_retryable(result)
+                ):
+                    retry.extend(owners)
+                    continue
+                for i, _, _ in owners:
+                    errors[i] = errors[i] or result
+
+            if retry:
+                logger.warning(
+                    "Shared embedding batch failed, retrying per request",
+                    requests=len(retry),
+                )
+                retried = await asyncio.gather(
+                    *(self._run_batch(texts[lo:hi], is_query) for _, lo, hi in retry),
+                    return_exceptions=True,
+                )
+                for (i, lo, hi), result in zip(retry, retried):
+                    if isinstance(result, BaseException):
+                        errors[i] = errors[i] or result
+                    else:
+                        vectors[lo:hi] = result
+        except asyncio.CancelledError:
+            for request in requests:
+                request.future.cancel()
+            raise
+
+        for request, (start, end), error in zip(requests, bounds, errors):
+            if request.future.done():  # caller cancelled
+                continue
+            if error is not None:
+                request.future.set_exception(error)
+            else:
+                request.future.set_result(vectors[start:end])
+
+    async def _run_batch(self, texts: list[str], is_query: bool) -> list[list[float]]:
+        """One API call under the concurrency limit, rate limit and retry policy."""
+        loop = asyncio.get_running_loop()
+        attempt = 0
+
+        while True:
+            async with self._semaphore:
+                if self.bucket is not None:
+                    await self.bucket.acquire(len(texts))
+                try:
+                    self.api_calls += 1
+                    return await loop.run_in_executor(
+                        self._executor, self.embed_fn, texts, is_query
+                    )
+                except Exception as e:
+                    if attempt >= self.max_retries or not self.is_retryable(e):
+                        raise
+                    error = e
+
+            # Back off outside the semaphore so other batches can proceed
+            attempt += 1
+            self.retries += 1
+            delay = min(60.0, 2 ** attempt) * random.uniform(0.5, 1.0)
+            logger.warning(
+                "Embedding batch throttled, retrying",
+                attempt=attempt,
+                delay=round(delay, 2),
+                batch=len(texts),
+                error=str(error),
+            )
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict[str, Any]:
+        """Return call/retry counters since process start."""
+        return {
+            "api_calls": self.api_calls,
+            "retries": self.retries,
+            "coalesced_requests": self.coalesced_requests,
+        }
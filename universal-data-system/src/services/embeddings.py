@@ -1,17 +1,165 @@
-"""Gemini embedding service using gemini-embedding-001 with MRL (768d)."""
+"""Embedding backends: Gemini gemini-embedding-001 (MRL, 768d) and local CPU models.
+
+The backend is selected with EMBEDDING_BACKEND:
+
+- gemini: remote Gemini API (default)
+- local: sentence-transformers model on CPU/GPU (`pip install -e ".[local]"`)
+- hashing: deterministic feature-hashing embedder, no model and no network;
+  meant for tests, offline load tests and benchmarks, not for relevance
+
+Every backend produces DIMENSIONS-dim vectors so they fit chunks.embedding.
+"""
 
 import asyncio
+import hashlib
+import math
+import re
+from abc import ABC, abstractmethod
 from functools import lru_cache
+from typing import Any
 
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 
 from src.config import get_settings
+from src.services.embedding_cache import get_query_embedding_cache, normalize_query
+from src.services.embedding_scheduler import EmbeddingScheduler
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Quota and transient server errors worth a backoff + retry
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether an embedding API error should be retried."""
+    return isinstance(error, RETRYABLE_ERRORS)
 
-class GeminiEmbeddingService:
+
+class EmbeddingService(ABC):
+    """
+    Base class for embedding backends.
+
+    Subclasses implement embed_batch(); single-text embedding, async
+    wrappers and the query embedding cache are shared.
+    """
+
+    MODEL: str = ""
+    DIMENSIONS = 768  # Must match chunks.embedding vector(768)
+    TASK_TYPE = "RETRIEVAL_DOCUMENT"  # For indexing
+    QUERY_TASK_TYPE = "RETRIEVAL_QUERY"  # For search queries
+
+    @abstractmethod
+    def embed_batch(
+        self,
+        texts: list[str],
+        is_query: bool = False,
+    ) -> list[list[float]]:
+        """
+        Generate embeddings for multiple texts.
+
+        Args:
+            texts: List of texts to embed
+            is_query: If True, embed as search queries
+
+        Returns:
+            List of DIMENSIONS-dimensional embedding vectors
+        """
+
+    def embed(self, text: str, is_query: bool = False) -> list[float]:
+        """
+        Generate embedding for a single text.
+
+        Args:
+            text: Text to embed
+            is_query: If True, embed as a search query
+
+        Returns:
+            DIMENSIONS-dimensional embedding vector
+        """
+        return self.embed_batch([text], is_query)[0]
+
+    async def embed_async(self, text: str, is_query: bool = False) -> list[float]:
+        """
+        Async wrapper for embed().
+
+        Query embeddings are served from the query embedding cache when possible.
+        """
+        if not is_query:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, self.embed, text, is_query)
+
+        text = normalize_query(text)
+        cache = get_query_embedding_cache()
+        key = cache.make_key(text, self.QUERY_TASK_TYPE, self.MODEL, self.DIMENSIONS)
+        embedding = await cache.get(key)
+        if embedding is not None:
+            return embedding
+
+        loop = asyncio.get_event_loop()
+        embedding = await loop.run_in_executor(None, self.embed, text, is_query)
+        await cache.set(key, embedding)
+        return embedding
+
+    async def embed_queries_async(self, queries: list[str]) -> list[list[float]]:
+        """
+        Embed several search queries with one batch call.
+
+        Cached queries are served from the query embedding cache; duplicates
+        (after trimming whitespace) are embedded once.
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            One embedding per query, in order
+        """
+        queries = [normalize_query(query) for query in queries]
+        cache = get_query_embedding_cache()
+        keys = [
+            cache.make_key(query, self.QUERY_TASK_TYPE, self.MODEL, self.DIMENSIONS)
+            for query in queries
+        ]
+
+        found: dict[str, list[float]] = {}
+        missing: dict[str, str] = {}
+        for key, query in zip(keys, queries):
+            if key in found or key in missing:
+                continue
+            embedding = await cache.get(key)
+            if embedding is not None:
+                found[key] = embedding
+            else:
+                missing[key] = query
+
+        if missing:
+            embeddings = await self.embed_batch_async(list(missing.values()), is_query=True)
+            for key, embedding in zip(missing, embeddings):
+                await cache.set(key, embedding)
+                found[key] = embedding
+
+        return [found[key] for key in keys]
+
+    async def embed_batch_async(
+        self,
+        texts: list[str],
+        is_query: bool = False,
+    ) -> list[list[float]]:
+        """Async wrapper for embed_batch()."""
+        if not texts:
+            return []
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.embed_batch, texts, is_query)
+
+
+class GeminiEmbeddingService(EmbeddingService):
     """
     Embedding service using Google Gemini gemini-embedding-001.
 
@@ -21,14 +169,21 @@ class GeminiEmbeddingService:
 
     MODEL = "models/gemini-embedding-001"
     DIMENSIONS = 768  # MRL optimized - 50% less storage than 1536
-    TASK_TYPE = "RETRIEVAL_DOCUMENT"  # For indexing
-    QUERY_TASK_TYPE = "RETRIEVAL_QUERY"  # For search queries
 
     def __init__(self) -> None:
         """Initialize the embedding service."""
         settings = get_settings()
         genai.configure(api_key=settings.gemini_api_key)
         self.settings = settings
+        self.scheduler = EmbeddingScheduler(
+            self.embed_batch,
+            is_retryable=_is_retryable,
+            batch_size=settings.embedding_batch_size,
+            max_concurrency=settings.embedding_max_concurrency,
+            rate_limit_per_minute=settings.embedding_rate_limit_per_minute,
+            coalesce_ms=settings.embedding_coalesce_ms,
+            max_retries=settings.embedding_max_retries,
+        )
 
     def embed(self, text: str, is_query: bool = False) -> list[float]:
         """
@@ -104,22 +259,183 @@ class GeminiEmbeddingService:
             logger.error("Batch embedding generation failed", error=str(e))
             raise
 
-    async def embed_async(self, text: str, is_query: bool = False) -> list[float]:
-        """Async wrapper for embed()."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.embed, text, is_query)
+    async def embed_batch_async(
+        self,
+        texts: list[str],
+        is_query: bool = False,
+    ) -> list[list[float]]:
+        """
+        Async batch embedding through the scheduler.
+
+        Splits into API-sized batches, shares batches with concurrent callers,
+        and applies the configured rate limit and retry policy.
+        """
+        return await self.scheduler.embed(texts, is_query)
+
+
+class SentenceTransformerEmbeddingService(EmbeddingService):
+    """
+    Local embedding backend using a sentence-transformers model.
+
+    The model must output DIMENSIONS-dim vectors (the default
+    all-mpnet-base-v2 does). Models that define "query"/"document" prompts
+    (e5, nomic, bge...) get them applied automatically.
+    """
+
+    def __init__(self) -> None:
+        """Load the configured model."""
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise RuntimeError(
+                "EMBEDDING_BACKEND=local requires sentence-transformers: "
+                'pip install -e ".[local]"'
+            ) from e
+
+        settings = get_settings()
+        self.MODEL = settings.local_embedding_model
+        self.batch_size = settings.embedding_batch_size
+        self.model = SentenceTransformer(
+            settings.local_embedding_model, device=settings.local_embedding_device
+        )
+
+        dimensions = self.model.get_sentence_embedding_dimension()
+        if dimensions != self.DIMENSIONS:
+            raise ValueError(
+                f"Local embedding model {self.MODEL} outputs {dimensions} dims, "
+                f"chunks.embedding expects {self.DIMENSIONS}"
+            )
+
+        prompts = getattr(self.model, "prompts", None) or {}
+        self.query_prompt = "query" if "query" in prompts else None
+        self.document_prompt = "document" if "document" in prompts else None
+
+        logger.info(
+            "Loaded local embedding model",
+            model=self.MODEL,
+            device=str(self.model.device),
+        )
+
+    def embed_batch(
+        self,
+        texts: list[str],
+        is_query: bool = False,
+    ) -> list[list[float]]:
+        """
+        Generate embeddings for multiple texts on the local device.
+
+        Args:
+            texts: List of texts to embed
+            is_query: If True, apply the model's query prompt (if any)
+
+        Returns:
+            List of 768-dimensional, L2-normalized embedding vectors
+        """
+        if not texts:
+            return []
+
+        embeddings = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            prompt_name=self.query_prompt if is_query else self.document_prompt,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        logger.debug("Generated local batch embeddings", count=len(texts), dims=self.DIMENSIONS)
+        return embeddings.tolist()
+
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+@lru_cache(maxsize=65536)
+def _feature_slot(feature: str, dimensions: int) -> tuple[int, float]:
+    """Stable (index, sign) for a feature — Python's hash() is salted per process."""
+    digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest())
+    return digest % dimensions, 1.0 if digest >> 63 else -1.0
+
+
+class HashingEmbeddingService(EmbeddingService):
+    """
+    Deterministic feature-hashing embedder (no model, no network).
+
+    Lowercased word unigrams and bigrams are hashed into DIMENSIONS buckets
+    with a random sign, log-scaled and L2-normalized. Texts sharing words get
+    a positive cosine similarity, so search results are meaningful enough for
+    load tests and recall checks, while the same text always yields the same
+    vector across processes.
+    """
+
+    MODEL = "hashing-v1"
+
+    def _embed_one(self, text: str) -> list[float]:
+        """Hash one text into a unit vector."""
+        tokens = [token.lower() for token in _TOKEN.findall(text)]
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+        counts: dict[int, float] = {}
+        for feature in features:
+            index, sign = _feature_slot(feature, self.DIMENSIONS)
+            counts[index] = counts.get(index, 0.0) + sign
+
+        vector = [0.0] * self.DIMENSIONS
+        for index, value in counts.items():
+            vector[index] = math.copysign(math.log1p(abs(value)), value)
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0.0:
+            # Empty/symbol-only text: any fixed unit vector (cosine needs norm > 0)
+            vector[0] = 1.0
+            return vector
+        return [v / norm for v in vector]
+
+    def embed_batch(
+        self,
+        texts: list[str],
+        is_query: bool = False,
+    ) -> list[list[float]]:
+        """
+        Generate embeddings for multiple texts.
+
+        Args:
+            texts: List of texts to embed
+            is_query: Ignored — queries and documents share one space
+
+        Returns:
+            List of 768-dimensional, L2-normalized embedding vectors
+        """
+        return [self._embed_one(text) for text in texts]
 
     async def embed_batch_async(
         self,
         texts: list[str],
         is_query: bool = False,
     ) -> list[list[float]]:
-        """Async wrapper for embed_batch()."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.embed_batch, texts, is_query)
+        """Embed inline; hashing is cheap enough not to need the executor."""
+        return self.embed_batch(texts, is_query)
+
+
+EMBEDDING_BACKENDS: dict[str, type[EmbeddingService]] = {
+    "gemini": GeminiEmbeddingService,
+    "local": SentenceTransformerEmbeddingService,
+    "hashing": HashingEmbeddingService,
+}
 
 
 @lru_cache(maxsize=1)
-def get_embedding_service() -> GeminiEmbeddingService:
-    """Get singleton embedding service instance."""
-    return GeminiEmbeddingService()
+def get_embedding_service() -> EmbeddingService:
+    """Get singleton embedding service for the configured backend."""
+    backend = get_settings().embedding_backend
+    logger.info("Using embedding backend", backend=backend)
+    return EMBEDDING_BACKENDS[backend]()
+
+
+def embedding_backend_info() -> dict[str, Any]:
+    """Describe the active embedding backend (for health/diagnostics)."""
+    service = get_embedding_service()
+    return {
+        "backend": get_settings().embedding_backend,
+        "model": service.MODEL,
+        "dimensions": service.DIMENSIONS,
+    }
@@ -1,5 +1,9 @@
 """Content extraction module."""
 
+from collections.abc import Callable
+from pathlib import Path
+
+from src.services.chunking import Chunk, ChunkingService
 from src.services.extraction.docx import DocxExtractor
 from src.services.extraction.google import (
     GoogleDocsExtractor,
@@ -35,16 +39,48 @@ def get_extractor(mime_type: str):
     return None
 
 
-def extract_content(content: bytes, mime_type: str) -> str:
+def extract_content(content: bytes | Path, mime_type: str) -> str:
     """
-    Extract text content from file bytes.
+    Extract text content from file bytes or a downloaded file.
+
+    Binary formats (PDF, DOCX, PPTX) open the path directly; text exports
+    are read into memory (they are capped at 10 MB).
 
     Returns Markdown-formatted text or empty string if unsupported.
     """
     extractor = get_extractor(mime_type)
-    if extractor:
-        return extractor.extract(content)
-    return ""
+    if not extractor:
+        return ""
+    if isinstance(content, Path) and not getattr(extractor, "accepts_path", False):
+        content = content.read_bytes()
+    return extractor.extract(content)
+
+
+def extract_pdf_chunks(
+    content: bytes | Path, on_page: Callable[[int], None] | None = None
+) -> list[Chunk]:
+    """
+    Extract and chunk a PDF page by page.
+
+    Pages stream from PDFExtractor.iter_pages into ChunkingService.chunk_pages,
+    so the document's full Markdown is never built; chunks carry page numbers.
+
+    Args:
+        content: PDF bytes or file path
+        on_page: Called with each page number once it is extracted, and with
+            0 once heading levels are computed (progress)
+
+    Returns:
+        Chunks in document order
+    """
+    def pages():
+        on_ready = (lambda: on_page(0)) if on_page is not None else None
+        for page_number, text in PDFExtractor().iter_pages(content, on_ready):
+            if on_page is not None:
+                on_page(page_number)
+            yield page_number, text
+
+    return list(ChunkingService().chunk_pages(pages()))
 
 
 __all__ = [
@@ -56,5 +92,6 @@ __all__ = [
     "PptxExtractor",
     "EXTRACTORS",
     "extract_content",
+    "extract_pdf_chunks",
     "get_extractor",
 ]
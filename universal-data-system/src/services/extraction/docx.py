@@ -1,6 +1,7 @@
 """Content extraction for DOCX files."""
 
 import io
+from pathlib import Path
 from docx import Document
 from docx.oxml.ns import qn
 
@@ -12,14 +13,16 @@ logger = get_logger(__name__)
 class DocxExtractor:
     """Extract text content from DOCX files."""
 
-    def extract(self, content: bytes) -> str:
+    accepts_path = True  # extract_content may hand over a file path
+
+    def extract(self, content: bytes | Path) -> str:
         """
-        Extract text from DOCX bytes.
+        Extract text from DOCX bytes or a file path.
 
         Returns Markdown-formatted text preserving headings.
         """
         try:
-            doc = Document(io.BytesIO(content))
+            doc = Document(io.BytesIO(content) if isinstance(content, bytes) else str(content))
 
             parts = []
             for para in doc.paragraphs:
@@ -1,5 +1,10 @@
 """Content extraction for PDF files using PyMuPDF4LLM."""
 
+import threading
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
 import pymupdf4llm
 import fitz  # PyMuPDF
 
@@ -7,26 +12,31 @@ from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# MuPDF is not thread-safe; extraction may run in several worker threads
+_MUPDF_LOCK = threading.Lock()
+
 
 class PDFExtractor:
     """Extract text content from PDF files as Markdown."""
 
-    def extract(self, content: bytes) -> str:
+    accepts_path = True  # extract_content may hand over a file path
+
+    def extract(self, content: bytes | Path) -> str:
         """
-        Extract text from PDF bytes.
+        Extract text from PDF bytes or a file path.
 
         Returns Markdown-formatted text preserving structure.
         """
         try:
-            # Open PDF from bytes
-            doc = fitz.open(stream=content, filetype="pdf")
+            with _MUPDF_LOCK:
+                doc = _open(content)
 
-            # Extract as Markdown using pymupdf4llm
-            md_text = pymupdf4llm.to_markdown(doc)
+                # Extract as Markdown using pymupdf4llm
+                md_text = pymupdf4llm.to_markdown(doc)
 
-            # Save page count before closing
-            page_count = len(doc)
-            doc.close()
+                # Save page count before closing
+                page_count = len(doc)
+                doc.close()
 
             logger.debug("Extracted PDF", pages=page_count, chars=len(md_text))
             return md_text
@@ -35,25 +45,89 @@ class PDFExtractor:
             logger.error("PDF extraction failed", error=str(e))
             raise
 
-    def extract_with_metadata(self, content: bytes) -> dict:
-        """Extract text with page metadata."""
-        doc = fitz.open(stream=content, filetype="pdf")
+    def iter_pages(
+        self, content: bytes | Path, on_ready: Callable[[], None] | None = None
+    ) -> Iterator[tuple[int, str]]:
+        """
+        Yield (page_number, markdown) one page at a time.
 
-        pages = []
-        for page_num, page in enumerate(doc):
-            text = page.get_text("text")
-            pages.append({
-                "page_number": page_num + 1,
-                "content": text.strip(),
-            })
+        Heading levels are computed once for the whole document, then each
+        page is converted on its own, so only one page of Markdown is held
+        in memory. Given a path, MuPDF reads the file on demand instead of
+        loading it. A page that fails to convert is logged and skipped.
 
-        # Also get full Markdown
-        md_text = pymupdf4llm.to_markdown(doc)
+        The MuPDF lock is taken per call, never across a yield, so a slow
+        consumer does not block other threads' extractions.
+
+        Args:
+            content: PDF bytes or file path
+            on_ready: Called once heading levels are computed, before the
+                first page (that scan reads the whole document)
+        """
+        with _MUPDF_LOCK:
+            doc = _open(content)
+        try:
+            with _MUPDF_LOCK:
+                options = _header_options(doc)
+                page_count = len(doc)
+            if on_ready is not None:
+                on_ready()
+
+            for page_index in range(page_count):
+                try:
+                    with _MUPDF_LOCK:
+                        md_text = pymupdf4llm.to_markdown(doc, pages=[page_index], **options)
+                except Exception as e:
+                    logger.warning(
+                        "PDF page extraction failed", page=page_index + 1, error=str(e)
+                    )
+                    continue
+                yield page_index + 1, md_text
+        finally:
+            with _MUPDF_LOCK:
+                doc.close()
+
+    def extract_with_metadata(self, content: bytes | Path) -> dict:
+        """Extract text with page metadata."""
+        with _MUPDF_LOCK:
+            doc = _open(content)
+
+            pages = []
+            for page_num, page in enumerate(doc):
+                text = page.get_text("text")
+                pages.append({
+                    "page_number": page_num + 1,
+                    "content": text.strip(),
+                })
+
+            # Also get full Markdown
+            md_text = pymupdf4llm.to_markdown(doc)
 
-        doc.close()
+            doc.close()
 
         return {
             "markdown": md_text,
             "pages": pages,
             "page_count": len(pages),
         }
+
+
+def _open(content: bytes | Path) -> Any:
+    """Open a PDF from bytes or from a file path."""
+    if isinstance(content, bytes):
+        return fitz.open(stream=content, filetype="pdf")
+    return fitz.open(content, filetype="pdf")
+
+
+def _header_options(doc: Any) -> dict[str, Any]:
+    """
+    to_markdown kwargs that reuse one font-size → heading map for every page.
+
+    Without it each single-page call re-scans the document for font sizes.
+    Empty when the installed pymupdf4llm does not expose IdentifyHeaders.
+    """
+    try:
+        from pymupdf4llm.helpers.pymupdf_rag import IdentifyHeaders
+    except ImportError:
+        return {}
+    return {"hdr_info": IdentifyHeaders(doc)}
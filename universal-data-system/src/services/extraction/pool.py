@@ -0,0 +1,313 @@
+"""Process-pool document extraction with per-document timeouts and memory caps.
+
+PDF, DOCX and PPTX parsing is CPU-bound (a 300-page PDF through
+pymupdf4llm takes tens of seconds) and holds the GIL, so running it in the
+worker process stalls every other job on the event loop. ExtractionPool
+sends those documents to dedicated worker processes instead:
+
+- up to EXTRACTION_WORKERS processes, each parsing one document at a time;
+- a document that makes no progress for EXTRACTION_TIMEOUT_SECONDS (the
+  whole document, or a single page of a PDF), or is still running after
+  EXTRACTION_DOCUMENT_TIMEOUT_SECONDS in total, gets its process killed
+  and replaced, without touching the other workers;
+- every process runs under an RLIMIT_AS cap (EXTRACTION_MEMORY_LIMIT_MB),
+  so a pathological file fails with MemoryError instead of taking the
+  host down;
+- processes are recycled after EXTRACTION_MAX_TASKS_PER_WORKER documents
+  to bound fragmentation/leaks in the native parsers.
+
+PDFs are extracted and chunked page by page inside the worker
+(extract_pdf_chunks), which reports progress after the heading scan and
+after every page. Plain text and Google exports are cheap and are extracted
+in a thread. Every failure surfaces as ExtractionError.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from functools import lru_cache
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any
+
+from src.config import get_settings
+from src.services.chunking import Chunk
+from src.services.extraction import extract_content, extract_pdf_chunks
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Formats parsed out of process; everything else is already text
+PROCESS_MIME_TYPES = {
+    "application/pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+}
+
+
+# A new process imports the parsers before taking work
+STARTUP_TIMEOUT_SECONDS = 60
+
+
+class ExtractionError(RuntimeError):
+    """A document could not be extracted (parse error, timeout, memory cap)."""
+
+
+def _limit_memory(limit_bytes: int) -> None:
+    """Cap this process's address space (no-op where RLIMIT_AS is unavailable)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit_bytes = min(limit_bytes, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, hard))
+
+
+def _run_task(task: str, content: bytes | Path, mime_type: str, on_page: Any = None) -> Any:
+    """Run an extraction task: "text" → str, "pdf_chunks" → list[Chunk]."""
+    if task == "pdf_chunks":
+        return extract_pdf_chunks(content, on_page=on_page)
+    return extract_content(content, mime_type)
+
+
+def _worker_main(conn: Connection, memory_limit_bytes: int) -> None:
+    """
+    Worker process loop.
+
+    Receives (task, content, mime_type), where content is bytes or a file
+    path (preferred: nothing large crosses the pipe), and replies with
+    ("progress",) after the PDF heading scan and each page, then
+    ("ok", result) or ("error", message, retire).
+    `retire` asks the parent to replace this process (after MemoryError the
+    interpreter state is not trusted).
+    """
+    if memory_limit_bytes:
+        _limit_memory(memory_limit_bytes)
+    conn.send(("ready",))  # parsers imported, start the clock now
+
+    def progress(page_number: int) -> None:
+        conn.send(("progress",))
+
+    while True:
+        try:
+            task, content, mime_type = conn.recv()
+        except EOFError:
+            return
+
+        try:
+            conn.send(("ok", _run_task(task, content, mime_type, on_page=progress)))
+        except MemoryError:
+            conn.send(("error", "Extraction exceeded the memory limit", True))
+            return
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}", False))
+
+
+class _Worker:
+    """One extraction process and the parent's end of its pipe."""
+
+    def __init__(self, context: Any, memory_limit_bytes: int) -> None:
+        """
+        Start the process and wait until it is ready (blocking; call in a thread).
+
+        Raises:
+            EOFError: The process exited during startup
+        """
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, memory_limit_bytes),
+            name="uds-extract",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        if not self.conn.poll(STARTUP_TIMEOUT_SECONDS):
+            self.kill()
+            raise EOFError("extraction worker did not start")
+        self.conn.recv()
+        self.tasks = 0
+
+    def call(
+        self,
+        task: str,
+        content: bytes | Path,
+        mime_type: str,
+        timeout: float,
+        document_timeout: float,
+    ) -> tuple:
+        """
+        Run one task (blocking; call in a thread).
+
+        Returns:
+            ("ok", result) or ("error", message, retire)
+
+        Raises:
+            TimeoutError: No reply or progress within `timeout` seconds, or
+                no reply within `document_timeout` seconds of sending the task
+            EOFError: The process died (e.g. killed by the OOM killer)
+        """
+        self.tasks += 1
+        deadline = time.monotonic() + document_timeout
+        self.conn.send((task, content, mime_type))
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Extraction took longer than {document_timeout:g}s")
+            if not self.conn.poll(min(timeout, remaining)):
+                if timeout < remaining:
+                    raise TimeoutError(f"Extraction made no progress for {timeout:g}s")
+                raise TimeoutError(f"Extraction took longer than {document_timeout:g}s")
+            reply = self.conn.recv()
+            if reply[0] != "progress":
+                return reply
+
+    def kill(self) -> None:
+        """Terminate the process immediately."""
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ExtractionPool:
+    """Bounded set of extraction processes, started on demand."""
+
+    def __init__(self) -> None:
+        """Initialize from settings; processes start on first use."""
+        settings = get_settings()
+        self.workers = settings.extraction_workers
+        self.timeout_seconds = settings.extraction_timeout_seconds
+        self.document_timeout_seconds = settings.extraction_document_timeout_seconds
+        self.memory_limit_bytes = settings.extraction_memory_limit_mb * 1024 * 1024
+        self.max_tasks_per_worker = settings.extraction_max_tasks_per_worker
+        # spawn: forking a process that runs an event loop and threads is unsafe
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: list[_Worker] = []
+        self._slots = asyncio.Semaphore(max(self.workers, 1))
+        self.extracted = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.crashed = 0
+
+    async def extract(self, content: bytes | Path, mime_type: str) -> str:
+        """
+        Extract Markdown text from a document.
+
+        Args:
+            content: Raw file bytes or a downloaded file
+            mime_type: Drive MIME type
+
+        Returns:
+            Extracted text ("" for unsupported types)
+
+        Raises:
+            ExtractionError: Parse error, timeout or memory cap exceeded
+        """
+        return await self._run("text", content, mime_type)
+
+    async def extract_pdf_chunks(self, content: bytes | Path) -> list[Chunk]:
+        """
+        Extract and chunk a PDF page by page (bounded memory, page numbers).
+
+        Args:
+            content: PDF bytes or file path
+
+        Returns:
+            Chunks in document order
+
+        Raises:
+            ExtractionError: Parse error, timeout or memory cap exceeded
+        """
+        return await self._run("pdf_chunks", content, "application/pdf")
+
+    async def _run(self, task: str, content: bytes | Path, mime_type: str) -> Any:
+        """Run a task in a worker process, or in a thread for cheap formats."""
+        if self.workers <= 0 or mime_type not in PROCESS_MIME_TYPES:
+            try:
+                result = await asyncio.to_thread(_run_task, task, content, mime_type)
+            except Exception as e:
+                self.failed += 1
+                raise ExtractionError(f"{type(e).__name__}: {e}") from e
+            self.extracted += 1
+            return result
+
+        async with self._slots:
+            worker = await self._checkout()
+            try:
+                reply = await asyncio.to_thread(
+                    worker.call,
+                    task,
+                    content,
+                    mime_type,
+                    self.timeout_seconds,
+                    self.document_timeout_seconds,
+                )
+            except TimeoutError as e:
+                self.timeouts += 1
+                worker.kill()
+                logger.warning(
+                    "Extraction timed out, worker killed", mime_type=mime_type, reason=str(e)
+                )
+                raise ExtractionError(str(e)) from None
+            except (EOFError, OSError) as e:
+                self.crashed += 1
+                worker.kill()
+                logger.warning("Extraction worker died", mime_type=mime_type)
+                raise ExtractionError("Extraction worker died (memory limit?)") from e
+            except BaseException:
+                # Cancelled mid-document: the process state is unknown
+                worker.kill()
+                raise
+
+            retire = reply[0] == "error" and reply[2]
+            if retire or worker.tasks >= self.max_tasks_per_worker:
+                worker.kill()
+            else:
+                self._idle.append(worker)
+
+        if reply[0] == "error":
+            self.failed += 1
+            raise ExtractionError(reply[1])
+        self.extracted += 1
+        return reply[1]
+
+    async def _checkout(self) -> _Worker:
+        """Reuse an idle process or start a new one."""
+        if self._idle:
+            return self._idle.pop()
+        try:
+            return await asyncio.to_thread(_Worker, self._context, self.memory_limit_bytes)
+        except (EOFError, OSError) as e:
+            self.crashed += 1
+            raise ExtractionError("Extraction worker failed to start") from e
+
+    def close(self) -> None:
+        """Stop idle worker processes."""
+        while self._idle:
+            self._idle.pop().kill()
+
+    def stats(self) -> dict[str, Any]:
+        """Return extraction counters since process start."""
+        return {
+            "workers": self.workers,
+            "idle": len(self._idle),
+            "extracted": self.extracted,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "crashed": self.crashed,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_extraction_pool() -> ExtractionPool:
+    """Get singleton extraction pool."""
+    return ExtractionPool()
+
+
+def close_extraction_pool() -> None:
+    """Stop the extraction processes, if the pool was created."""
+    if get_extraction_pool.cache_info().currsize:
+        get_extraction_pool().close()
@@ -1,6 +1,7 @@
 """Content extraction for PPTX files."""
 
 import io
+from pathlib import Path
 from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 
@@ -12,14 +13,16 @@ logger = get_logger(__name__)
 class PptxExtractor:
     """Extract text content from PPTX files."""
 
-    def extract(self, content: bytes) -> str:
+    accepts_path = True  # extract_content may hand over a file path
+
+    def extract(self, content: bytes | Path) -> str:
         """
-        Extract text from PPTX bytes.
+        Extract text from PPTX bytes or a file path.
 
         Returns Markdown-formatted text with slide structure.
         """
         try:
-            prs = Presentation(io.BytesIO(content))
+            prs = Presentation(io.BytesIO(content) if isinstance(content, bytes) else str(content))
 
             slides = []
             for slide_num, slide in enumerate(prs.slides, 1):
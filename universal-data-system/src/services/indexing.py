@@ -0,0 +1,275 @@
+"""Chunk persistence for the indexing pipeline.
+
+Reindexing a file used to delete every chunk row and insert them all again,
+churning the HNSW (idx_chunks_embedding) and BM25 (idx_chunks_bm25) indexes
+and leaving dead tuples behind on every small edit. apply_chunk_diff()
+compares the freshly chunked content with the stored rows by
+(chunk_index, content_hash) and only writes what changed.
+
+Rows are written with binary COPY into a temp staging table followed by a
+single INSERT ... ON CONFLICT merge, instead of one ORM INSERT per chunk.
+write_file_chunks() is the entry point shared by reindex_file and the
+Notion/Kiwify/Asaas sync services.
+"""
+
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+from typing import Any
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import get_settings
+from src.db.models import Chunk as ChunkRecord
+from src.services.chunking import Chunk
+from src.services.embedding_cache import DocumentEmbeddingStore
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+STAGE_TABLE = "_chunks_stage"
+
+STAGE_COLUMNS = [
+    "file_id",
+    "chunk_index",
+    "content",
+    "start_offset",
+    "end_offset",
+    "heading",
+    "content_hash",
+    "page_number",
+    "embedding",
+]
+
+# Session-local staging table; rows vanish at commit, the table is reused
+# by later transactions on the same pooled connection.
+# embedding is real[] so asyncpg can COPY it in binary without a pgvector codec.
+_CREATE_STAGE_SQL = f"""
+    CREATE TEMP TABLE IF NOT EXISTS {STAGE_TABLE} (
+        file_id UUID NOT NULL,
+        chunk_index INT NOT NULL,
+        content TEXT NOT NULL,
+        start_offset INT,
+        end_offset INT,
+        heading TEXT,
+        content_hash TEXT NOT NULL,
+        page_number INT,
+        embedding REAL[]
+    ) ON COMMIT DELETE ROWS
+"""
+
+# NULL embedding in the stage means "metadata-only update, keep the vector".
+# The file's filter attributes are copied onto every chunk row (migration 005).
+_MERGE_STAGE_SQL = f"""
+    INSERT INTO chunks (
+        file_id, chunk_index, content, start_offset, end_offset,
+        heading, content_hash, page_number, embedding,
+        drive_file_id, file_name, file_path, file_mime_type, file_trashed
+    )
+    SELECT
+        s.file_id, s.chunk_index, s.content, s.start_offset, s.end_offset,
+        s.heading, s.content_hash, s.page_number, s.embedding::vector,
+        f.file_id, f.name, f.path, f.mime_type, f.trashed
+    FROM {STAGE_TABLE} s
+    JOIN files f ON f.id = s.file_id
+    ON CONFLICT (file_id, chunk_index) DO UPDATE SET
+        content = EXCLUDED.content,
+        start_offset = EXCLUDED.start_offset,
+        end_offset = EXCLUDED.end_offset,
+        heading = EXCLUDED.heading,
+        content_hash = EXCLUDED.content_hash,
+        page_number = EXCLUDED.page_number,
+        embedding = COALESCE(EXCLUDED.embedding, chunks.embedding),
+        drive_file_id = EXCLUDED.drive_file_id,
+        file_name = EXCLUDED.file_name,
+        file_path = EXCLUDED.file_path,
+        file_mime_type = EXCLUDED.file_mime_type,
+        file_trashed = EXCLUDED.file_trashed
+"""
+
+
+@dataclass
+class ChunkWriteStats:
+    """Rows touched while persisting the chunks of one file."""
+
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    embedded: int = 0  # chunks whose embedding had to be resolved
+
+    @property
+    def touched(self) -> int:
+        """Rows written (inserted + updated + deleted)."""
+        return self.inserted + self.updated + self.deleted
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize for logs and job results."""
+        return {**asdict(self), "touched": self.touched}
+
+
+def _chunk_values(file_id: UUID, chunk: Chunk) -> dict[str, Any]:
+    """Column values for a chunk row (without embedding)."""
+    return {
+        "file_id": file_id,
+        "chunk_index": chunk.index,
+        "content": chunk.content,
+        "start_offset": chunk.start_offset,
+        "end_offset": chunk.end_offset,
+        "heading": chunk.heading,
+        "content_hash": chunk.content_hash,
+        "page_number": chunk.page_number,
+    }
+
+
+async def _driver_connection(session: AsyncSession) -> asyncpg.Connection:
+    """Return the asyncpg connection behind the session's current transaction."""
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    return raw.driver_connection
+
+
+async def bulk_upsert_chunks(session: AsyncSession, rows: list[dict[str, Any]]) -> int:
+    """
+    Upsert chunk rows via binary COPY into a staging table + one merge.
+
+    Each row carries the STAGE_COLUMNS keys; embedding may be None to keep
+    the stored vector. Runs inside the session's transaction.
+    """
+    if not rows:
+        return 0
+
+    # Issued through SQLAlchemy first so the transaction is already open
+    # when the raw COPY runs on the same connection
+    await session.execute(text(_CREATE_STAGE_SQL))
+    await session.execute(text(f"TRUNCATE {STAGE_TABLE}"))
+
+    driver = await _driver_connection(session)
+    await driver.copy_records_to_table(
+        STAGE_TABLE,
+        records=[tuple(row[column] for column in STAGE_COLUMNS) for row in rows],
+        columns=STAGE_COLUMNS,
+    )
+
+    await session.execute(text(_MERGE_STAGE_SQL))
+    return len(rows)
+
+
+async def replace_chunks(
+    session: AsyncSession,
+    file_id: UUID,
+    chunks: list[Chunk],
+    embedding_store: DocumentEmbeddingStore,
+    resolved: Mapping[str, list[float]] | None = None,
+) -> ChunkWriteStats:
+    """Delete all chunk rows of a file and insert the new ones."""
+    result = await session.execute(delete(ChunkRecord).where(ChunkRecord.file_id == file_id))
+    stats = ChunkWriteStats(deleted=result.rowcount or 0)
+
+    if chunks:
+        embeddings = await embedding_store.embed_chunks(session, chunks, resolved)
+        stats.inserted = await bulk_upsert_chunks(
+            session,
+            [
+                {**_chunk_values(file_id, chunk), "embedding": embedding}
+                for chunk, embedding in zip(chunks, embeddings)
+            ],
+        )
+        stats.embedded = len(chunks)
+
+    return stats
+
+
+async def apply_chunk_diff(
+    session: AsyncSession,
+    file_id: UUID,
+    chunks: list[Chunk],
+    embedding_store: DocumentEmbeddingStore,
+    resolved: Mapping[str, list[float]] | None = None,
+) -> ChunkWriteStats:
+    """
+    Bring a file's chunk rows in line with `chunks`, writing only differences.
+
+    Rows are matched by chunk_index:
+    - same content_hash → untouched (metadata-only update if heading/offsets/page moved)
+    - different content_hash → updated in place with the new content + embedding
+    - new index → inserted; index no longer produced → deleted
+    """
+    result = await session.execute(
+        select(
+            ChunkRecord.chunk_index,
+            ChunkRecord.content_hash,
+            ChunkRecord.heading,
+            ChunkRecord.start_offset,
+            ChunkRecord.end_offset,
+            ChunkRecord.page_number,
+            ChunkRecord.embedding.is_(None).label("missing_embedding"),
+        ).where(ChunkRecord.file_id == file_id)
+    )
+    existing = {row.chunk_index: row for row in result.all()}
+
+    stats = ChunkWriteStats()
+    to_insert: list[Chunk] = []
+    to_rewrite: list[Chunk] = []
+    metadata_only: list[Chunk] = []
+
+    for chunk in chunks:
+        row = existing.pop(chunk.index, None)
+        if row is None:
+            to_insert.append(chunk)
+        elif row.content_hash != chunk.content_hash or row.missing_embedding:
+            to_rewrite.append(chunk)
+        elif (row.heading, row.start_offset, row.end_offset, row.page_number) != (
+            chunk.heading,
+            chunk.start_offset,
+            chunk.end_offset,
+            chunk.page_number,
+        ):
+            metadata_only.append(chunk)
+        else:
+            stats.unchanged += 1
+
+    # Whatever is left in `existing` is past the end of the new chunk list
+    if existing:
+        await session.execute(
+            delete(ChunkRecord).where(
+                ChunkRecord.file_id == file_id,
+                ChunkRecord.chunk_index.in_(list(existing)),
+            )
+        )
+        stats.deleted = len(existing)
+
+    needs_embedding = to_insert + to_rewrite
+    embeddings = await embedding_store.embed_chunks(session, needs_embedding, resolved)
+    stats.embedded = len(needs_embedding)
+
+    rows = [
+        {**_chunk_values(file_id, chunk), "embedding": embedding}
+        for chunk, embedding in zip(needs_embedding, embeddings)
+    ] + [{**_chunk_values(file_id, chunk), "embedding": None} for chunk in metadata_only]
+
+    await bulk_upsert_chunks(session, rows)
+    stats.inserted = len(to_insert)
+    stats.updated = len(to_rewrite) + len(metadata_only)
+
+    return stats
+
+
+async def write_file_chunks(
+    session: AsyncSession,
+    file_id: UUID,
+    chunks: list[Chunk],
+    embedding_store: DocumentEmbeddingStore,
+    resolved: Mapping[str, list[float]] | None = None,
+) -> ChunkWriteStats:
+    """
+    Persist a file's chunks using the configured write mode (diff or replace).
+
+    `resolved` optionally maps content hashes to embeddings computed earlier
+    by the caller; see DocumentEmbeddingStore.embed_chunks.
+    """
+    if get_settings().incremental_reindex:
+        return await apply_chunk_diff(session, file_id, chunks, embedding_store, resolved)
+    return await replace_chunks(session, file_id, chunks, embedding_store, resolved)
@@ -11,13 +11,15 @@ from datetime import datetime, timezone
 from typing import Any
 
 import httpx
-from sqlalchemy import select, delete
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import get_settings
-from src.db.models import File, Chunk
+from src.db.models import File
 from src.services.chunking import ChunkingService
-from src.services.embeddings import get_embedding_service
+from src.services.embedding_cache import get_document_embedding_store
+from src.services.indexing import write_file_chunks
+from src.services.search_cache import bump_index_generation
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -39,7 +41,7 @@ class NotionSyncService:
             "Content-Type": "application/json",
         }
         self.chunking = ChunkingService()
-        self.embeddings = get_embedding_service()
+        self.embedding_store = get_document_embedding_store()
 
     # ------------------------------------------------------------------
     # Public API
@@ -162,33 +164,21 @@ class NotionSyncService:
         await self.session.commit()
         await self.session.refresh(file_record)
 
-        # Delete old chunks
-        await self.session.execute(
-            delete(Chunk).where(Chunk.file_id == file_record.id)
-        )
-
-        # Chunk + embed
+        # Chunk + embed + persist (only changed rows are written)
         chunks = self.chunking.chunk_text(full_content)
-        if chunks:
-            contents = [c.content for c in chunks]
-            embeddings = await self.embeddings.embed_batch_async(contents)
-
-            for chunk, embedding in zip(chunks, embeddings):
-                self.session.add(
-                    Chunk(
-                        file_id=file_record.id,
-                        chunk_index=chunk.index,
-                        content=chunk.content,
-                        start_offset=chunk.start_offset,
-                        end_offset=chunk.end_offset,
-                        heading=chunk.heading,
-                        content_hash=chunk.content_hash,
-                        embedding=embedding,
-                    )
-                )
+        stats = await write_file_chunks(
+            self.session, file_record.id, chunks, self.embedding_store
+        )
 
         await self.session.commit()
-        logger.info("Indexed Notion page", page_id=page_id, title=title, chunks=len(chunks))
+        await bump_index_generation()
+        logger.info(
+            "Indexed Notion page",
+            page_id=page_id,
+            title=title,
+            chunks=len(chunks),
+            **stats.as_dict(),
+        )
 
     # ------------------------------------------------------------------
     # Block extraction
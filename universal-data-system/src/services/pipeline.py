@@ -0,0 +1,447 @@
+"""Staged Drive ingest pipeline: fetch → extract → chunk → embed → persist.
+
+reindex_file used to run every step for a file back to back in one arq job,
+so one file's download, extraction, embedding call and database write never
+overlapped with another file's. IngestPipeline runs each stage as its own
+set of workers, connected by bounded queues:
+
+- fetch: metadata and content from the Drive API (blocking client,
+  threads), path from the folder tree cache; content is streamed to a
+  temp file that extract deletes
+- extract: bytes → Markdown text (extraction process pool); PDFs are
+  extracted and chunked page by page there, with page numbers
+- chunk: text → chunks
+- embed: resolve chunk embeddings through the document embedding store
+- persist: file record + chunk rows in one transaction
+
+Worker counts per stage come from the INGEST_* settings. The bounded queues
+give back-pressure: a fast stage can't pile up downloaded files in memory
+ahead of a slow one. During run() a failing file is logged and counted and
+the others continue; process() runs a single file through the same stages
+and raises (reindex_file relies on arq retries).
+"""
+
+import asyncio
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from googleapiclient.discovery import Resource
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import get_settings
+from src.db import get_session
+from src.db.models import DriveAccount, File
+from src.services.chunking import Chunk, ChunkingService
+from src.services.drive import DriveAuthService, FolderResolver
+from src.services.drive.export import download_to_file, get_file_metadata
+from src.services.drive.folders import get_folder_cache
+from src.services.embedding_cache import get_document_embedding_store
+from src.services.extraction.pool import ExtractionError, get_extraction_pool
+from src.services.indexing import write_file_chunks
+from src.services.search_cache import bump_index_generation
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+STAGES = ("fetch", "extract", "chunk", "embed", "persist")
+
+# Log throughput every N finished files during run()
+PROGRESS_EVERY = 100
+
+
+@dataclass
+class IngestItem:
+    """One Drive file moving through the pipeline."""
+
+    drive_file_id: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+    path: str = "/"
+    content_path: Path | None = None  # downloaded temp file, until extracted
+    is_oversized: bool = False
+    text: str = ""
+    chunks: list[Chunk] = field(default_factory=list)
+    embeddings: dict[str, list[float]] = field(default_factory=dict)
+    # Set when the remaining content stages don't apply: deleted | skipped | no_content
+    action: str | None = None
+    extraction_error: str | None = None
+    result: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def mime_type(self) -> str:
+        """Drive MIME type from the fetched metadata."""
+        return self.metadata.get("mimeType", "")
+
+    def discard_content(self) -> None:
+        """Delete the downloaded temp file, if any."""
+        if self.content_path is not None:
+            self.content_path.unlink(missing_ok=True)
+            self.content_path = None
+
+
+@dataclass
+class IngestStats:
+    """Counters for one pipeline run."""
+
+    started: float = field(default_factory=time.monotonic)
+    finished: Counter = field(default_factory=Counter)  # by result action
+    failed: Counter = field(default_factory=Counter)  # by stage
+    busy_seconds: Counter = field(default_factory=Counter)  # by stage, summed over workers
+
+    @property
+    def done(self) -> int:
+        """Files that left the pipeline, successfully or not."""
+        return sum(self.finished.values()) + sum(self.failed.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize for logs and the bootstrap summary."""
+        elapsed = time.monotonic() - self.started
+        return {
+            "done": self.done,
+            "finished": dict(self.finished),
+            "failed": dict(self.failed),
+            "elapsed_seconds": round(elapsed, 1),
+            "files_per_second": round(self.done / elapsed, 2) if elapsed else 0.0,
+            "busy_seconds": {stage: round(s, 1) for stage, s in self.busy_seconds.items()},
+        }
+
+
+def _parse_modified_time(metadata: dict[str, Any]) -> datetime:
+    """Parse Drive's RFC 3339 modifiedTime."""
+    return datetime.fromisoformat(metadata.get("modifiedTime", "").replace("Z", "+00:00"))
+
+
+async def upsert_file_record(
+    session: AsyncSession, account: DriveAccount, item: IngestItem
+) -> File:
+    """
+    Create or update the files row for a fetched Drive file.
+
+    Args:
+        session: Database session (flushed, not committed)
+        account: Drive account owning the file
+        item: Fetched pipeline item
+
+    Returns:
+        File record with its id assigned
+    """
+    metadata = item.metadata
+    result = await session.execute(
+        select(File).where(
+            File.account_id == account.id,
+            File.file_id == item.drive_file_id,
+        )
+    )
+    file_record = result.scalar_one_or_none()
+
+    if file_record:
+        file_record.name = metadata.get("name", "")
+        file_record.path = item.path
+        file_record.mime_type = item.mime_type
+        file_record.modified_time = _parse_modified_time(metadata)
+        file_record.content_hash = metadata.get("md5Checksum")
+        file_record.size_bytes = int(metadata.get("size", 0))
+        file_record.is_oversized = item.is_oversized
+        file_record.trashed = False
+        file_record.extraction_error = None
+    else:
+        file_record = File(
+            account_id=account.id,
+            file_id=item.drive_file_id,
+            name=metadata.get("name", ""),
+            path=item.path,
+            mime_type=item.mime_type,
+            modified_time=_parse_modified_time(metadata),
+            content_hash=metadata.get("md5Checksum"),
+            owners=[o.get("emailAddress", "") for o in metadata.get("owners", [])],
+            size_bytes=int(metadata.get("size", 0)),
+            is_oversized=item.is_oversized,
+        )
+        session.add(file_record)
+
+    await session.flush()
+    return file_record
+
+
+class IngestPipeline:
+    """Concurrent fetch → extract → chunk → embed → persist for one Drive account."""
+
+    def __init__(self, account_id: str) -> None:
+        """Initialize from settings; Drive services are built on first use."""
+        settings = get_settings()
+        self.account_id = account_id
+        self.concurrency = {
+            "fetch": settings.ingest_fetch_concurrency,
+            "extract": settings.ingest_extract_concurrency,
+            "chunk": settings.ingest_chunk_concurrency,
+            "embed": settings.ingest_embed_concurrency,
+            "persist": settings.ingest_persist_concurrency,
+        }
+        self.queue_size = settings.ingest_queue_size
+        self.chunking_service = ChunkingService()
+        self.embedding_store = get_document_embedding_store()
+        self.handlers: dict[str, Callable[[IngestItem], Awaitable[IngestItem]]] = {
+            "fetch": self.fetch,
+            "extract": self.extract,
+            "chunk": self.chunk,
+            "embed": self.embed,
+            "persist": self.persist,
+        }
+        self.stats = IngestStats()
+        self._account: DriveAccount | None = None
+        self.folder_resolver = FolderResolver(account_id)
+        # googleapiclient Resources are not thread-safe: one per concurrent fetch
+        self._services: asyncio.Queue[Resource] = asyncio.Queue()
+
+    async def _open(self, services: int) -> None:
+        """Load the account and build `services` Drive clients."""
+        if self._account is not None:
+            return
+
+        async with get_session() as session:
+            auth_service = DriveAuthService(session)
+            account = await auth_service.get_account(self.account_id)
+            if not account:
+                raise ValueError(f"Account not found: {self.account_id}")
+
+            for _ in range(services):
+                self._services.put_nowait(await auth_service.get_drive_service(account))
+            self._account = account
+
+    @asynccontextmanager
+    async def _drive_service(self) -> AsyncIterator[Resource]:
+        """Check a Drive client out of the pool for the duration of the block."""
+        service = await self._services.get()
+        try:
+            yield service
+        finally:
+            self._services.put_nowait(service)
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+    async def fetch(self, item: IngestItem) -> IngestItem:
+        """Fetch metadata, content and folder path from Drive."""
+        async with self._drive_service() as service:
+            item.metadata = await get_file_metadata(service, item.drive_file_id)
+            if item.metadata.get("trashed"):
+                item.action = "deleted"
+                return item
+
+            item.path = await self.folder_resolver.file_path(
+                service, item.metadata.get("name", ""), item.metadata.get("parents", [])
+            )
+            # Size comes from the metadata above (absent for Google Workspace files)
+            size = item.metadata.get("size")
+            item.content_path, item.is_oversized = await download_to_file(
+                service,
+                item.drive_file_id,
+                item.mime_type,
+                size=int(size) if size is not None else None,
+            )
+
+        if item.is_oversized:
+            item.action = "skipped"
+        return item
+
+    async def extract(self, item: IngestItem) -> IngestItem:
+        """Extract Markdown text from the downloaded file."""
+        if item.action is None:
+            pool = get_extraction_pool()
+            try:
+                if item.mime_type == "application/pdf":
+                    item.chunks = await pool.extract_pdf_chunks(item.content_path)
+                else:
+                    item.text = await pool.extract(item.content_path, item.mime_type)
+            except ExtractionError as e:
+                # Deterministic for a given file: record it rather than retry
+                item.extraction_error = str(e)
+                logger.warning("Extraction failed", file_id=item.drive_file_id, error=str(e))
+            finally:
+                item.discard_content()
+            if not item.text and not item.chunks:
+                item.action = "no_content"
+        return item
+
+    async def chunk(self, item: IngestItem) -> IngestItem:
+        """Split the extracted text into chunks."""
+        if item.action is None and item.text:  # PDFs arrive already chunked
+            item.chunks = await asyncio.to_thread(self.chunking_service.chunk_text, item.text)
+        item.text = ""
+        return item
+
+    async def embed(self, item: IngestItem) -> IngestItem:
+        """Resolve chunk embeddings (store hits first, then the embedding API)."""
+        if item.chunks:
+            # No connection is held while the embedding API is called
+            item.embeddings = await self.embedding_store.resolve_chunks(item.chunks)
+        return item
+
+    async def persist(self, item: IngestItem) -> IngestItem:
+        """Write the file record and its chunks in one transaction."""
+        file_id = item.drive_file_id
+
+        if item.action == "deleted":
+            # Lazy import to avoid circular dependencies
+            from src.workers.tasks import delete_file_internal
+
+            async with get_session() as session:
+                await delete_file_internal(session, file_id)
+            item.result = {"action": "deleted", "file_id": file_id}
+            return item
+
+        async with get_session() as session:
+            file_record = await upsert_file_record(session, self._account, item)
+            stats = None
+            if item.action == "no_content":
+                file_record.extraction_error = item.extraction_error or "No content extracted"
+            elif item.action is None:
+                # Incremental mode only writes rows that changed
+                stats = await write_file_chunks(
+                    session, file_record.id, item.chunks, self.embedding_store, item.embeddings
+                )
+            await session.commit()
+        await bump_index_generation()  # name/path changes show up in results
+
+        if item.action == "skipped":
+            logger.warning("File too large, skipping content", file_id=file_id)
+            item.result = {"action": "skipped", "file_id": file_id, "reason": "oversized"}
+        elif item.action == "no_content":
+            item.result = {"action": "no_content", "file_id": file_id}
+            if item.extraction_error:
+                item.result["error"] = item.extraction_error
+        else:
+            logger.info(
+                "Reindexed file",
+                file_id=file_id,
+                name=item.metadata.get("name"),
+                chunks=len(item.chunks),
+                **stats.as_dict(),
+            )
+            item.result = {
+                "action": "reindexed",
+                "file_id": file_id,
+                "chunks": len(item.chunks),
+                "rows": stats.as_dict(),
+            }
+        return item
+
+    # ------------------------------------------------------------------
+    # Drivers
+    # ------------------------------------------------------------------
+    async def process(self, drive_file_id: str) -> dict[str, Any]:
+        """
+        Run a single file through every stage in order.
+
+        Args:
+            drive_file_id: Drive file ID
+
+        Returns:
+            Job result dict (action, file_id, ...)
+        """
+        await self._open(services=1)
+        item = IngestItem(drive_file_id)
+        try:
+            for stage in STAGES:
+                item = await self.handlers[stage](item)
+        finally:
+            item.discard_content()
+        return item.result
+
+    async def run(self, drive_file_ids: Iterable[str]) -> dict[str, Any]:
+        """
+        Ingest many files with every stage running concurrently.
+
+        Args:
+            drive_file_ids: Drive file IDs to (re)index
+
+        Returns:
+            Run statistics (see IngestStats.as_dict)
+        """
+        await self._open(services=self.concurrency["fetch"])
+        self.stats = IngestStats()
+        queues: list[asyncio.Queue[IngestItem | None]] = [
+            asyncio.Queue(maxsize=self.queue_size) for _ in STAGES
+        ]
+
+        async def feed() -> None:
+            for drive_file_id in drive_file_ids:
+                await queues[0].put(IngestItem(drive_file_id))
+            for _ in range(self.concurrency[STAGES[0]]):
+                await queues[0].put(None)
+
+        stages = [
+            self._run_stage(
+                stage,
+                inbox=queues[i],
+                outbox=queues[i + 1] if i + 1 < len(STAGES) else None,
+                queues=queues,
+            )
+            for i, stage in enumerate(STAGES)
+        ]
+        await asyncio.gather(feed(), *stages)
+
+        logger.info(
+            "Ingest finished",
+            account_id=self.account_id,
+            extraction=get_extraction_pool().stats(),
+            folders=get_folder_cache().stats(),
+            **self.stats.as_dict(),
+        )
+        return self.stats.as_dict()
+
+    async def _run_stage(
+        self,
+        stage: str,
+        inbox: asyncio.Queue[IngestItem | None],
+        outbox: asyncio.Queue[IngestItem | None] | None,
+        queues: list[asyncio.Queue[IngestItem | None]],
+    ) -> None:
+        """Run a stage's workers until the upstream sentinels arrive, then pass them on."""
+        handler = self.handlers[stage]
+
+        async def worker() -> None:
+            while (item := await inbox.get()) is not None:
+                start = time.perf_counter()
+                try:
+                    item = await handler(item)
+                except Exception as e:
+                    item.discard_content()
+                    self.stats.failed[stage] += 1
+                    logger.error(
+                        "Ingest failed", stage=stage, file_id=item.drive_file_id, error=str(e)
+                    )
+                    self._report_progress(queues)
+                    continue
+                finally:
+                    self.stats.busy_seconds[stage] += time.perf_counter() - start
+
+                if outbox is not None:
+                    await outbox.put(item)
+                else:
+                    self.stats.finished[item.result.get("action", "unknown")] += 1
+                    self._report_progress(queues)
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency[stage])))
+
+        if outbox is not None:
+            downstream = STAGES[STAGES.index(stage) + 1]
+            for _ in range(self.concurrency[downstream]):
+                await outbox.put(None)
+
+    def _report_progress(self, queues: list[asyncio.Queue[IngestItem | None]]) -> None:
+        """Log throughput and queue depths every PROGRESS_EVERY files."""
+        if self.stats.done % PROGRESS_EVERY:
+            return
+        logger.info(
+            "Ingest progress",
+            account_id=self.account_id,
+            queued={stage: queue.qsize() for stage, queue in zip(STAGES, queues)},
+            **self.stats.as_dict(),
+        )
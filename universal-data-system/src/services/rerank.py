@@ -0,0 +1,190 @@
+"""Cross-encoder re-ranking of fused hybrid search results.
+
+RRF only looks at ranks, so a chunk that is mediocre in both legs can beat
+the one that actually answers the query. The reranker scores the top
+RERANK_TOP_N fused candidates jointly with the query using a local
+sentence-transformers CrossEncoder and reorders them.
+
+- Scores are cached per (query, chunk content hash): repeated and
+  overlapping queries only score chunks they have not seen.
+- Scoring runs on one dedicated worker thread, batched; under load requests
+  queue rather than oversubscribe the CPU.
+- Each call has a latency budget. Past it the RRF order is returned
+  unchanged, while the scoring finishes in the background and still fills
+  the cache for the next request.
+- At most RERANK_MAX_PENDING scoring jobs are queued or running. Beyond
+  that, requests keep RRF order without queuing more work, so sustained
+  overload cannot build a backlog of stale queries.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import lru_cache
+from typing import Any
+
+from src.config import get_settings
+from src.services.search import SearchResult
+from src.utils.cache import TTLCache
+from src.utils.hash import md5_hash
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class CrossEncoderReranker:
+    """Budgeted, cached cross-encoder re-ranking."""
+
+    def __init__(self) -> None:
+        """Initialize from settings; the model is loaded on first use."""
+        settings = get_settings()
+        self.model_name = settings.rerank_model
+        self.device = settings.rerank_device
+        self.top_n = settings.rerank_top_n
+        self.batch_size = settings.rerank_batch_size
+        self.budget_seconds = settings.rerank_budget_ms / 1000
+        self.max_pending = settings.rerank_max_pending
+        self.scores: TTLCache[float] = TTLCache(
+            max_entries=settings.rerank_cache_max_entries,
+            ttl_seconds=settings.rerank_cache_ttl_seconds,
+        )
+        self._model: Any = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rerank")
+        self._pending = 0
+        self.reranked = 0
+        self.over_budget = 0
+        self.shed = 0
+        self.failed = 0
+
+    def _load_model(self) -> Any:
+        """Load the CrossEncoder (worker thread only)."""
+        if self._model is None:
+            try:
+                from sentence_transformers import CrossEncoder
+            except ImportError as e:
+                raise RuntimeError(
+                    'Re-ranking requires sentence-transformers: pip install -e ".[local]"'
+                ) from e
+
+            self._model = CrossEncoder(self.model_name, device=self.device)
+            logger.info("Loaded cross-encoder", model=self.model_name, device=self.device)
+        return self._model
+
+    def score(self, query: str, contents: list[str]) -> list[float]:
+        """
+        Score (query, content) pairs synchronously.
+
+        Args:
+            query: Search query
+            contents: Chunk texts
+
+        Returns:
+            Relevance score per content (higher = more relevant)
+        """
+        scores = self._load_model().predict(
+            [(query, content) for content in contents],
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+        )
+        return [float(s) for s in scores]
+
+    async def rerank(
+        self, query: str, results: list[SearchResult], top_k: int
+    ) -> tuple[list[SearchResult], bool]:
+        """
+        Reorder the top candidates by cross-encoder score.
+
+        Returns copies with rerank_score set; the input SearchResults (which
+        may be shared through the search result cache) are not modified.
+
+        Args:
+            query: Search query
+            results: Fused results, best first
+            top_k: Number of results to return
+
+        Returns:
+            (results, reranked): re-ranked results, or results[:top_k]
+            unchanged and False if scoring was skipped (backlog full),
+            failed or exceeded the latency budget
+        """
+        candidates = results[: self.top_n]
+        if not candidates:
+            return results[:top_k], True
+
+        keys = [(query, md5_hash(r.content)) for r in candidates]
+        scores = [self.scores.get(key) for key in keys]
+        missing = [i for i, score in enumerate(scores) if score is None]
+
+        if missing:
+            if self._pending >= self.max_pending:
+                self.shed += 1
+                logger.info(
+                    "Re-rank backlog full, keeping RRF order",
+                    query=query[:50],
+                    pending=self._pending,
+                )
+                return results[:top_k], False
+
+            missing_keys = [keys[i] for i in missing]
+            self._pending += 1
+            future = asyncio.get_running_loop().run_in_executor(
+                self._executor, self.score, query, [candidates[i].content for i in missing]
+            )
+
+            def store(done: asyncio.Future) -> None:
+                # Also runs when the budget expired: the work still warms the cache
+                self._pending -= 1
+                if done.cancelled() or done.exception() is not None:
+                    return
+                for key, score in zip(missing_keys, done.result()):
+                    self.scores.set(key, score)
+
+            future.add_done_callback(store)
+            finished, _ = await asyncio.wait({future}, timeout=self.budget_seconds)
+            if not finished:
+                self.over_budget += 1
+                logger.info(
+                    "Re-rank over budget, keeping RRF order",
+                    query=query[:50],
+                    pairs=len(missing),
+                    budget_ms=int(self.budget_seconds * 1000),
+                )
+                return results[:top_k], False
+
+            try:
+                fresh = future.result()
+            except Exception as e:
+                self.failed += 1
+                logger.warning("Re-rank failed, keeping RRF order", error=str(e))
+                return results[:top_k], False
+
+            for i, score in zip(missing, fresh):
+                scores[i] = score
+
+        self.reranked += 1
+        reranked = sorted(
+            (replace(result, rerank_score=score) for result, score in zip(candidates, scores)),
+            key=lambda r: r.rerank_score,
+            reverse=True,
+        )
+        return (reranked + results[len(candidates):])[:top_k], True
+
+    def stats(self) -> dict[str, Any]:
+        """Return re-rank counters and score cache stats."""
+        return {
+            "model": self.model_name,
+            "loaded": self._model is not None,
+            "reranked": self.reranked,
+            "over_budget": self.over_budget,
+            "shed": self.shed,
+            "pending": self._pending,
+            "failed": self.failed,
+            "scores": self.scores.stats(),
+        }
+
+
+@lru_cache(maxsize=1)
+def get_reranker() -> CrossEncoderReranker:
+    """Get singleton cross-encoder reranker."""
+    return CrossEncoderReranker()
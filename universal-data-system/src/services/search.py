@@ -1,24 +1,43 @@
 """Hybrid search service combining BM25 and vector search with RRF fusion."""
 
+import asyncio
+import json
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache, partial
 from typing import Any
 
 import asyncpg
+from pgvector.asyncpg import register_vector
 
 from src.config import get_settings
+from src.utils.cache import TTLCache
 from src.utils.logging import get_logger
+from src.utils.metrics import stage
 
 logger = get_logger(__name__)
 
+# Planner row estimates per filter combination (auto filter strategy)
+_filter_estimates: TTLCache[int] = TTLCache(max_entries=512, ttl_seconds=300)
+
 # ---------------------------------------------------------------------------
 # Dedicated asyncpg pool (bypasses SQLAlchemy prepared-statement cache)
 # Best practice for pgvector + asyncpg on PostgreSQL ≥ 17:
 #   • statement_cache_size=0  – prevents ResourceOwnerEnlarge errors
 #   • jit=off                 – avoids JIT-related crashes with HNSW/BM25
+#   • pgvector binary codec   – query embeddings are bound as $n parameters
 # Reference: https://github.com/pgvector/pgvector#asyncpg
 # ---------------------------------------------------------------------------
 _asyncpg_pool: asyncpg.Pool | None = None
+_pool_lock = asyncio.Lock()
+_acquire_waiting = 0  # callers currently queued for a connection
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Register the pgvector codecs so vectors travel in binary format."""
+    await register_vector(conn)
 
 
 async def _get_asyncpg_pool() -> asyncpg.Pool:
@@ -27,23 +46,83 @@ async def _get_asyncpg_pool() -> asyncpg.Pool:
     Using a separate pool (not SQLAlchemy) guarantees:
     - No prepared-statement caching (avoids ResourceOwnerEnlarge on PG17+pgvector)
     - JIT disabled server-side (prevents crashes during HNSW/BM25 index scans)
+    - pgvector binary codec on every connection (embeddings bound as parameters)
     - Direct asyncpg Record access for maximum performance
     """
     global _asyncpg_pool
     if _asyncpg_pool is None:
-        settings = get_settings()
-        # Convert SQLAlchemy DSN format to plain asyncpg DSN
-        dsn = settings.database_url.replace("+asyncpg", "")
-        _asyncpg_pool = await asyncpg.create_pool(
-            dsn,
-            min_size=2,
-            max_size=5,
-            statement_cache_size=0,
-            server_settings={"jit": "off"},
-        )
+        async with _pool_lock:
+            if _asyncpg_pool is None:
+                settings = get_settings()
+                # Convert SQLAlchemy DSN format to plain asyncpg DSN
+                dsn = settings.database_url.replace("+asyncpg", "")
+                _asyncpg_pool = await asyncpg.create_pool(
+                    dsn,
+                    min_size=settings.search_pool_min_size,
+                    max_size=settings.search_pool_max_size,
+                    statement_cache_size=0,
+                    server_settings={"jit": "off"},
+                    init=_init_connection,
+                )
     return _asyncpg_pool
 
 
+async def warmup_asyncpg_pool() -> None:
+    """
+    Create the search pool and round-trip every min_size connection.
+
+    Called from the API lifespan so the first searches after a deploy don't
+    pay for connection setup and codec registration.
+    """
+    pool = await _get_asyncpg_pool()
+    settings = get_settings()
+
+    async def ping() -> None:
+        async with pool.acquire() as conn:
+            await conn.fetchval("SELECT 1")
+
+    # Hold min_size connections at once so each one is exercised
+    await asyncio.gather(*(ping() for _ in range(settings.search_pool_min_size)))
+    logger.info(
+        "Search pool warmed up",
+        size=pool.get_size(),
+        min_size=settings.search_pool_min_size,
+        max_size=settings.search_pool_max_size,
+    )
+
+
+@asynccontextmanager
+async def _acquire() -> AsyncIterator[asyncpg.Connection]:
+    """Borrow a search pool connection, timing the wait as the "acquire" stage."""
+    global _acquire_waiting
+    pool = await _get_asyncpg_pool()
+    _acquire_waiting += 1
+    try:
+        with stage("acquire"):
+            conn = await pool.acquire()
+    finally:
+        _acquire_waiting -= 1
+    try:
+        yield conn
+    finally:
+        await pool.release(conn)
+
+
+def search_pool_stats() -> dict[str, int] | None:
+    """Search pool occupancy (None until the pool exists)."""
+    if _asyncpg_pool is None:
+        return None
+    size = _asyncpg_pool.get_size()
+    idle = _asyncpg_pool.get_idle_size()
+    return {
+        "size": size,
+        "max_size": _asyncpg_pool.get_max_size(),
+        "in_use": size - idle,
+        "idle": idle,
+        "waiting": _acquire_waiting,
+    }
+
+
 async def close_asyncpg_pool() -> None:
     """Gracefully close the asyncpg pool on app shutdown."""
     global _asyncpg_pool
@@ -52,6 +131,188 @@ async def close_asyncpg_pool() -> None:
         _asyncpg_pool = None
 
 
+# ---------------------------------------------------------------------------
+# Search legs (vector_search, bm25_search and hybrid_engine="parallel")
+# Chunk rows carry their file's path, MIME type and trashed flag (migration
+# 005), so path/MIME filters read chunks alone. Date filters semi-join files:
+# modified_time changes on every edit, so it is not copied onto chunks.
+# Each leg takes $1 = query text/embedding, $2 = candidate depth and
+# $3..$6 = file filters, in one of two shapes:
+#   • post-filter: rank chunks (ORDER BY <index operator> LIMIT n, so the
+#     BM25/HNSW index scans are usable), then filter that candidate list —
+#     fast, but selective filters can under-return
+#   • pre-filter: materialize the chunks passing the filters, then rank them
+#     exactly — no ranking index scan, cheap when the filters are selective
+# ---------------------------------------------------------------------------
+def _file_filter_sql(first: int, alias: str = "c") -> str:
+    """File filter predicate on `alias` with its four parameters numbered from `first`."""
+    path, mimes, after, before = (f"${first + i}" for i in range(4))
+    return f"""
+        {alias}.file_trashed = FALSE
+        AND ({path}::text IS NULL OR {alias}.file_path LIKE {path} || '%')
+        AND ({mimes}::text[] IS NULL OR {alias}.file_mime_type = ANY({mimes}))
+        AND (({after}::timestamptz IS NULL AND {before}::timestamptz IS NULL) OR EXISTS (
+            SELECT 1 FROM files f
+            WHERE f.id = {alias}.file_id
+                AND ({after}::timestamptz IS NULL OR f.modified_time >= {after})
+                AND ({before}::timestamptz IS NULL OR f.modified_time <= {before})
+        ))
+    """
+
+
+_BM25_DISTANCE = "c.content <@> to_bm25query($1, 'idx_chunks_bm25')"
+_VECTOR_DISTANCE = "c.embedding <=> $1::vector(768)"
+
+# (distance expression, row predicate, score from distance)
+_LEGS = {
+    "bm25": (_BM25_DISTANCE, f"{_BM25_DISTANCE} < 0", "-t.distance"),
+    "vector": (_VECTOR_DISTANCE, "c.embedding IS NOT NULL", "1 - t.distance"),
+}
+
+_RESULT_COLUMNS = "c.id, c.file_id, c.drive_file_id, c.file_name, c.file_path, c.content, c.heading"
+
+# Compact HNSW expression indexes (migrations/optional/): the vector leg
+# takes $7 candidates in index order, then keeps the $2 nearest by exact
+# float distance. Expressions must match the index definitions verbatim.
+MATRYOSHKA_DIMENSIONS = (128, 256)
+
+_CANDIDATE_DISTANCE = {
+    "halfvec": "c.embedding::halfvec(768) <=> $1::vector(768)::halfvec(768)",
+    "binary": "binary_quantize(c.embedding)::bit(768) <~> binary_quantize($1::vector(768))",
+    # MRL prefix: the first n dims of a Gemini embedding are an n-d embedding
+    **{
+        f"matryoshka{n}": (
+            f"subvector(c.embedding, 1, {n})::vector({n}) "
+            f"<=> subvector($1::vector(768), 1, {n})::vector({n})"
+        )
+        for n in MATRYOSHKA_DIMENSIONS
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def _leg_sql(leg: str, strategy: str, storage: str = "float") -> str:
+    """SQL for one ranking leg with the given filter strategy and vector index."""
+    distance, predicate, score = _LEGS[leg]
+
+    if strategy == "pre":
+        # Only (id, distance) is materialized; result columns are read for
+        # the top rows alone through the primary key
+        return f"""
+            WITH candidates AS MATERIALIZED (
+                SELECT c.id, {distance} AS distance
+                FROM chunks c
+                WHERE {predicate} AND {_file_filter_sql(3)}
+            ),
+            top AS (
+                SELECT id, distance FROM candidates ORDER BY distance LIMIT $2
+            )
+            SELECT
+                c.id        AS chunk_id,
+                c.file_id,
+                c.drive_file_id,
+                c.file_name,
+                c.file_path,
+                c.content,
+                c.heading,
+                {score}     AS score
+            FROM top t
+            JOIN chunks c ON c.id = t.id
+            ORDER BY t.distance
+        """
+
+    if leg == "vector" and storage in _CANDIDATE_DISTANCE:
+        top = f"""
+            candidates AS (
+                SELECT
+                    {_RESULT_COLUMNS},
+                    c.file_trashed, c.file_mime_type,
+                    {distance} AS distance
+                FROM chunks c
+                WHERE {predicate}
+                ORDER BY {_CANDIDATE_DISTANCE[storage]}
+                LIMIT $7
+            ),
+            top AS (
+                SELECT * FROM candidates ORDER BY distance LIMIT $2
+            )"""
+    else:
+        top = f"""
+            top AS (
+                SELECT
+                    {_RESULT_COLUMNS},
+                    c.file_trashed, c.file_mime_type,
+                    {distance} AS distance
+                FROM chunks c
+                WHERE {predicate}
+                ORDER BY {distance}
+                LIMIT $2
+            )"""
+
+    return f"""
+        WITH {top}
+        SELECT
+            t.id        AS chunk_id,
+            t.file_id,
+            t.drive_file_id,
+            t.file_name,
+            t.file_path,
+            t.content,
+            t.heading,
+            {score}     AS score
+        FROM top t
+        WHERE {_file_filter_sql(3, alias="t")}
+        ORDER BY t.distance
+    """
+
+
+_FILTER_ESTIMATE_SQL = f"""
+    EXPLAIN (FORMAT JSON)
+    SELECT 1 FROM chunks c
+    WHERE {_file_filter_sql(1)}
+"""
+
+_HYBRID_SQL = """
+    SELECT * FROM hybrid_search(
+        $1, $2::vector(768), $3, $4, $5, $6, $7, $8
+    )
+"""
+
+# pgvector's defaults / limits
+HNSW_DEFAULT_EF_SEARCH = 40
+HNSW_MAX_EF_SEARCH = 1000
+
+
+@dataclass
+class SearchFilters:
+    """File filters shared by every search leg."""
+
+    path_prefix: str | None = None
+    mime_types: list[str] | None = None
+    modified_after: datetime | None = None
+    modified_before: datetime | None = None
+
+    def __bool__(self) -> bool:
+        return any(
+            (self.path_prefix, self.mime_types, self.modified_after, self.modified_before)
+        )
+
+    def args(self) -> tuple[Any, ...]:
+        """Positional SQL arguments, in _file_filter_sql() order."""
+        return (self.path_prefix, self.mime_types, self.modified_after, self.modified_before)
+
+
+@dataclass
+class SearchTuning:
+    """Per-request HNSW and filtering knobs (None = server default from settings)."""
+
+    ef_search: int | None = None
+    iterative_scan: str | None = None  # off | strict_order | relaxed_order
+    overfetch: int | None = None  # candidate multiplier for post-filtered legs
+    filter_strategy: str = "auto"  # auto | pre | post
+    embedding_storage: str | None = None  # float | halfvec | binary | matryoshka[128|256]
+
+
 @dataclass
 class SearchResult:
     """Search result with scores and metadata."""
@@ -66,6 +327,20 @@ class SearchResult:
     bm25_score: float
     vector_score: float
     rrf_score: float
+    rerank_score: float | None = None  # cross-encoder score, when re-ranked
+
+
+class SearchResults(list[SearchResult]):
+    """
+    Hybrid search results plus how they were ordered.
+
+    ranking is "rrf", "rerank", "web" (Tavily fallback) or "rrf_fallback"
+    (re-rank requested but skipped: over budget, backlog full or failed).
+    """
+
+    def __init__(self, results: Iterable[SearchResult] = (), ranking: str = "rrf") -> None:
+        super().__init__(results)
+        self.ranking = ranking
 
 
 class SearchService:
@@ -81,6 +356,132 @@ class SearchService:
         from src.services.embeddings import get_embedding_service
 
         self.embedding_service = get_embedding_service()
+        self.settings = get_settings()
+
+    async def _embed_query(self, query: str) -> list[float]:
+        """Embed the query text (cache-aware), timed as the "embed" stage."""
+        with stage("embed"):
+            return await self.embedding_service.embed_async(query, is_query=True)
+
+    # ------------------------------------------------------------------
+    # Query tuning
+    # ------------------------------------------------------------------
+    async def _apply_hnsw_settings(
+        self, conn: asyncpg.Connection, tuning: SearchTuning, depth: int = 0
+    ) -> None:
+        """
+        SET LOCAL the HNSW knobs for the current transaction.
+
+        Without iterative scans an HNSW scan returns at most ef_search rows,
+        so ef_search is raised to cover `depth` candidates when needed.
+        """
+        ef_search = tuning.ef_search or self.settings.hnsw_ef_search
+        iterative_scan = tuning.iterative_scan or self.settings.hnsw_iterative_scan
+
+        if iterative_scan == "off" and depth > (ef_search or HNSW_DEFAULT_EF_SEARCH):
+            ef_search = min(depth, HNSW_MAX_EF_SEARCH)
+
+        if ef_search:
+            await conn.execute(
+                "SELECT set_config('hnsw.ef_search', $1, true)", str(ef_search)
+            )
+        if iterative_scan != "off":
+            # Requires pgvector >= 0.8
+            await conn.execute(
+                "SELECT set_config('hnsw.iterative_scan', $1, true)", iterative_scan
+            )
+
+    async def _resolve_filter_strategy(
+        self, filters: SearchFilters, tuning: SearchTuning
+    ) -> str:
+        """Pick pre- or post-filtering; auto compares the planner's row estimate to a threshold."""
+        if not filters:
+            return "post"
+        if tuning.filter_strategy in ("pre", "post"):
+            return tuning.filter_strategy
+
+        key = filters.args()
+        key = (key[0], tuple(key[1] or ()), key[2], key[3])
+        estimate = _filter_estimates.get(key)
+        if estimate is None:
+            async with _acquire() as conn:
+                plan = await conn.fetchval(_FILTER_ESTIMATE_SQL, *filters.args())
+            estimate = int(json.loads(plan)[0]["Plan"]["Plan Rows"])
+            _filter_estimates.set(key, estimate)
+
+        strategy = "pre" if estimate <= self.settings.search_prefilter_max_rows else "post"
+        logger.debug("Filter strategy chosen", estimate=estimate, strategy=strategy)
+        return strategy
+
+    def _leg_query(
+        self,
+        leg: str,
+        needle: Any,
+        depth: int,
+        filters: SearchFilters,
+        strategy: str,
+        tuning: SearchTuning,
+    ) -> tuple[str, list[Any], int]:
+        """SQL, arguments and HNSW scan depth (0 = no HNSW scan) for one ranking leg."""
+        if strategy == "post" and filters:
+            depth *= tuning.overfetch or self.settings.search_overfetch
+
+        args = [needle, depth, *filters.args()]
+        scan_depth = 0
+        storage = "float"
+        if leg == "vector" and strategy == "post":
+            scan_depth = depth
+            storage = tuning.embedding_storage or self.settings.embedding_storage
+            if storage == "matryoshka":
+                storage = f"matryoshka{self.settings.matryoshka_dimensions}"
+            if storage != "float":
+                scan_depth = depth * self.settings.quantized_rerank_factor
+                args.append(scan_depth)
+
+        return _leg_sql(leg, strategy, storage), args, scan_depth
+
+    async def _fetch_leg(
+        self,
+        leg: str,
+        needle: Any,
+        depth: int,
+        filters: SearchFilters,
+        strategy: str,
+        tuning: SearchTuning,
+    ) -> list[asyncpg.Record]:
+        """Run one ranking leg on its own pool connection."""
+        sql, args, scan_depth = self._leg_query(leg, needle, depth, filters, strategy, tuning)
+
+        async with _acquire() as conn:
+            async with conn.transaction():
+                if scan_depth:
+                    await self._apply_hnsw_settings(conn, tuning, scan_depth)
+                with stage("execute"):
+                    return await conn.fetch(sql, *args)
+
+    async def _stream_rows(
+        self, sql: str, args: list[Any], tuning: SearchTuning, scan_depth: int | None
+    ) -> AsyncIterator[asyncpg.Record]:
+        """
+        Yield rows through a server-side cursor, search_stream_prefetch at a time.
+
+        The pool connection is held until the iterator is exhausted or closed.
+
+        Args:
+            sql: Ranking query
+            args: Query arguments
+            tuning: HNSW knobs
+            scan_depth: Candidates the HNSW scan must cover (None = not an HNSW query)
+        """
+        async with _acquire() as conn:
+            # Cursors only live inside a transaction
+            async with conn.transaction():
+                if scan_depth is not None:
+                    await self._apply_hnsw_settings(conn, tuning, scan_depth)
+                async for row in conn.cursor(
+                    sql, *args, prefetch=self.settings.search_stream_prefetch
+                ):
+                    yield row
 
     # ------------------------------------------------------------------
     # Hybrid search (BM25 + Vector + RRF fusion)
@@ -95,7 +496,11 @@ class SearchService:
         modified_before: datetime | None = None,
         auto_fallback: bool = False,
         fallback_threshold: float = 0.01,
-    ) -> list[SearchResult]:
+        query_embedding: list[float] | None = None,
+        engine: str | None = None,
+        tuning: SearchTuning | None = None,
+        rerank: bool | None = None,
+    ) -> SearchResults:
         """
         Execute hybrid BM25 + vector search with RRF fusion.
 
@@ -106,54 +511,55 @@ class SearchService:
             mime_types: Filter by MIME types
             modified_after: Filter by modification date (after)
             modified_before: Filter by modification date (before)
+            query_embedding: Precomputed query embedding (e.g. from a batch call)
+            engine: "sql" (hybrid_search() function) or "parallel"
+                (concurrent legs + Python RRF); defaults to settings.hybrid_engine.
+                Quantized/matryoshka embedding storage always uses the parallel engine.
+            tuning: HNSW/filter knobs. hybrid_search() pre-filters filtered calls,
+                so requests that resolve to post-filtering run on the parallel engine
+            rerank: Re-rank the top rerank_top_n fused results with the
+                cross-encoder; defaults to settings.rerank_enabled
 
         Returns:
-            List of SearchResult ordered by RRF score
+            SearchResults ordered by RRF score (or cross-encoder score when
+            re-ranked); `ranking` tells which
         """
-        query_embedding = await self.embedding_service.embed_async(query, is_query=True)
-        embedding_literal = _to_vector_literal(query_embedding)
-
-        # Inline vector literal is mandatory — pgvector cannot bind vector params
-        raw_sql = f"""
-            SELECT * FROM hybrid_search(
-                $1,
-                '{embedding_literal}'::vector(768),
-                $2, 60, $3, $4, $5, $6
-            )
-        """
-
-        pool = await _get_asyncpg_pool()
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                raw_sql,
-                query, top_k, path_prefix, mime_types,
-                modified_after, modified_before,
-            )
-
-        results = [
-            SearchResult(
-                chunk_id=str(row["chunk_id"]),
-                file_id=str(row["file_id"]),
-                drive_file_id=row["drive_file_id"],
-                file_name=row["file_name"],
-                file_path=row["file_path"],
-                content=row["content"],
-                heading=row["heading"],
-                bm25_score=float(row["bm25_score"] or 0),
-                vector_score=float(row["vector_score"] or 0),
-                rrf_score=float(row["rrf_score"] or 0),
-            )
-            for row in rows
-        ]
+        if query_embedding is None:
+            query_embedding = await self._embed_query(query)
+
+        tuning = tuning or SearchTuning()
+        engine = engine or self.settings.hybrid_engine
+        if (tuning.embedding_storage or self.settings.embedding_storage) != "float":
+            # hybrid_search() ranks by the float index; only the legs know the compact ones
+            engine = "parallel"
+        filters = SearchFilters(path_prefix, mime_types, modified_after, modified_before)
+        if (
+            engine != "parallel"
+            and filters
+            and await self._resolve_filter_strategy(filters, tuning) == "post"
+        ):
+            # Only the legs post-filter (with overfetch); hybrid_search() pre-filters
+            engine = "parallel"
+        run = self._hybrid_parallel if engine == "parallel" else self._hybrid_sql
+        rerank = self.settings.rerank_enabled if rerank is None else rerank
+        results = await run(
+            query,
+            query_embedding,
+            max(top_k, self.settings.rerank_top_n) if rerank else top_k,
+            filters,
+            tuning,
+        )
 
         top_score = results[0].rrf_score if results else 0
+        ranking = "rrf"
 
         # Fallback to Tavily if enabled and top score is below threshold
         if auto_fallback and top_score < fallback_threshold:
             logger.info("Local search confidence low. Triggering Tavily fallback.", rrf_score=top_score)
             from src.services.tavily import TavilyService
             tavily = TavilyService()
-            web_response = await tavily.search(query, max_results=top_k)
+            with stage("fallback"):
+                web_response = await tavily.search(query, max_results=top_k)
             web_results = web_response.get("results", [])
             
             if web_results:
@@ -172,14 +578,69 @@ class SearchService:
                     )
                     for r in web_results
                 ]
+                ranking = "web"
+                rerank = False
+
+        if rerank:
+            from src.services.rerank import get_reranker
+            with stage("rerank"):
+                results, reranked = await get_reranker().rerank(query, results, top_k)
+            ranking = "rerank" if reranked else "rrf_fallback"
 
         logger.info(
             "Hybrid search completed",
             query=query[:50],
             results=len(results),
             top_score=results[0].rrf_score if results else 0,
+            engine=engine,
+            ranking=ranking,
         )
-        return results
+        return SearchResults(results, ranking)
+
+    async def _hybrid_sql(
+        self,
+        query: str,
+        query_embedding: list[float],
+        top_k: int,
+        filters: SearchFilters,
+        tuning: SearchTuning,
+    ) -> list[SearchResult]:
+        """
+        Hybrid search via the hybrid_search() SQL function (single statement).
+
+        Filtered calls rank an exact pre-filtered set; unfiltered calls scan
+        HNSW for top_k * 2 candidates, so ef_search is raised to cover them.
+        """
+        async with _acquire() as conn:
+            async with conn.transaction():
+                await self._apply_hnsw_settings(conn, tuning, 0 if filters else top_k * 2)
+                with stage("execute"):
+                    rows = await conn.fetch(
+                        _HYBRID_SQL,
+                        query, query_embedding, top_k, self.settings.rrf_k, *filters.args(),
+                    )
+
+        with stage("hydrate"):
+            return [_hybrid_result(row) for row in rows]
+
+    async def _hybrid_parallel(
+        self,
+        query: str,
+        query_embedding: list[float],
+        top_k: int,
+        filters: SearchFilters,
+        tuning: SearchTuning,
+    ) -> list[SearchResult]:
+        """Hybrid search with both legs in flight at once and RRF fused in Python."""
+        depth = top_k * 2  # same per-leg depth as hybrid_search()
+        strategy = await self._resolve_filter_strategy(filters, tuning)
+
+        bm25_rows, vector_rows = await asyncio.gather(
+            self._fetch_leg("bm25", query, depth, filters, strategy, tuning),
+            self._fetch_leg("vector", query_embedding, depth, filters, strategy, tuning),
+        )
+        with stage("hydrate"):
+            return _rrf_fuse(bm25_rows[:depth], vector_rows[:depth], self.settings.rrf_k, top_k)
 
     # ------------------------------------------------------------------
     # BM25-only keyword search
@@ -189,47 +650,20 @@ class SearchService:
         query: str,
         top_k: int = 20,
         path_prefix: str | None = None,
+        tuning: SearchTuning | None = None,
     ) -> list[SearchResult]:
         """Execute BM25-only keyword search.
 
-        Note: bm25_search() SQL function returns only
-        (chunk_id, file_id, content, score). We join with files
-        to get full metadata for a consistent SearchResult.
+        Same single-table leg as the parallel hybrid engine; a path filter
+        is pre- or post-applied per tuning.filter_strategy.
         """
-        raw_sql = """
-            SELECT
-                b.chunk_id,
-                b.file_id,
-                f.file_id   AS drive_file_id,
-                f.name      AS file_name,
-                f.path      AS file_path,
-                b.content,
-                c.heading,
-                b.score     AS bm25_score
-            FROM bm25_search($1, $2, $3) b
-            JOIN files   f ON f.id = b.file_id
-            JOIN chunks  c ON c.id = b.chunk_id
-        """
-
-        pool = await _get_asyncpg_pool()
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(raw_sql, query, top_k, path_prefix)
+        tuning = tuning or SearchTuning()
+        filters = SearchFilters(path_prefix)
+        strategy = await self._resolve_filter_strategy(filters, tuning)
+        rows = await self._fetch_leg("bm25", query, top_k, filters, strategy, tuning)
 
-        return [
-            SearchResult(
-                chunk_id=str(row["chunk_id"]),
-                file_id=str(row["file_id"]),
-                drive_file_id=row["drive_file_id"],
-                file_name=row["file_name"],
-                file_path=row["file_path"],
-                content=row["content"],
-                heading=row["heading"],
-                bm25_score=float(row["bm25_score"] or 0),
-                vector_score=0.0,
-                rrf_score=0.0,
-            )
-            for row in rows
-        ]
+        with stage("hydrate"):
+            return [_leg_result("bm25", row) for row in rows[:top_k]]
 
     # ------------------------------------------------------------------
     # Vector-only semantic search
@@ -239,42 +673,172 @@ class SearchService:
         query: str,
         top_k: int = 20,
         path_prefix: str | None = None,
+        query_embedding: list[float] | None = None,
+        mime_types: list[str] | None = None,
+        modified_after: datetime | None = None,
+        modified_before: datetime | None = None,
+        tuning: SearchTuning | None = None,
     ) -> list[SearchResult]:
         """Execute vector-only semantic search.
 
-        Note: vector_search() SQL function returns only
-        (chunk_id, file_id, content, similarity). We join with files
-        to get full metadata for a consistent SearchResult.
+        Filtered requests are pre- or post-filtered per tuning.filter_strategy
+        (auto picks by the planner's estimate of matching chunks). Index scans
+        go through the embedding_storage index; candidates from quantized or
+        matryoshka-prefix indexes are re-ranked with the full 768-d distance.
         """
-        query_embedding = await self.embedding_service.embed_async(query, is_query=True)
-        embedding_literal = _to_vector_literal(query_embedding)
+        if query_embedding is None:
+            query_embedding = await self._embed_query(query)
 
-        # Inline vector literal — pgvector cannot use bind params for vector type
-        raw_sql = f"""
-            SELECT
-                v.chunk_id,
-                v.file_id,
-                f.file_id    AS drive_file_id,
-                f.name       AS file_name,
-                f.path       AS file_path,
-                v.content,
-                c.heading,
-                v.similarity AS vector_score
-            FROM vector_search(
-                '{embedding_literal}'::vector(768),
-                $1, $2
-            ) v
-            JOIN files   f ON f.id = v.file_id
-            JOIN chunks  c ON c.id = v.chunk_id
+        tuning = tuning or SearchTuning()
+        filters = SearchFilters(path_prefix, mime_types, modified_after, modified_before)
+        strategy = await self._resolve_filter_strategy(filters, tuning)
+        rows = await self._fetch_leg("vector", query_embedding, top_k, filters, strategy, tuning)
+
+        with stage("hydrate"):
+            return [_leg_result("vector", row) for row in rows[:top_k]]
+
+    # ------------------------------------------------------------------
+    # Streaming search (rows yielded as they arrive from the cursor)
+    # ------------------------------------------------------------------
+    async def stream_search(
+        self,
+        query: str,
+        search_type: str = "hybrid",
+        top_k: int = 20,
+        path_prefix: str | None = None,
+        mime_types: list[str] | None = None,
+        modified_after: datetime | None = None,
+        modified_before: datetime | None = None,
+        query_embedding: list[float] | None = None,
+        engine: str | None = None,
+        tuning: SearchTuning | None = None,
+    ) -> AsyncIterator[SearchResult]:
         """
+        Yield search results in rank order without materializing the result list.
 
-        pool = await _get_asyncpg_pool()
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(raw_sql, top_k, path_prefix)
+        bm25, vector and the SQL hybrid engine read through a server-side
+        cursor. The parallel hybrid engine needs both legs complete before
+        fusing, so it yields from the fused list.
+
+        Args:
+            query: Search query text
+            search_type: hybrid, bm25 or vector
+            top_k: Number of results to yield
+            path_prefix: Filter by file path prefix (the only filter bm25 applies)
+            mime_types: Filter by MIME types
+            modified_after: Filter by modification date (after)
+            modified_before: Filter by modification date (before)
+            query_embedding: Precomputed query embedding
+            engine: Hybrid engine override (see hybrid_search)
+            tuning: HNSW/filter knobs
+
+        Yields:
+            SearchResult, best first
+        """
+        tuning = tuning or SearchTuning()
+        if search_type == "bm25":
+            filters = SearchFilters(path_prefix)
+        else:
+            filters = SearchFilters(path_prefix, mime_types, modified_after, modified_before)
+            if query_embedding is None:
+                query_embedding = await self._embed_query(query)
+
+        if search_type in ("bm25", "vector"):
+            leg = search_type
+            needle = query if leg == "bm25" else query_embedding
+            strategy = await self._resolve_filter_strategy(filters, tuning)
+            sql, args, scan_depth = self._leg_query(leg, needle, top_k, filters, strategy, tuning)
+            rows = self._stream_rows(sql, args, tuning, scan_depth if scan_depth else None)
+            to_result = partial(_leg_result, leg)
+        else:
+            engine = engine or self.settings.hybrid_engine
+            if engine == "parallel" or (
+                tuning.embedding_storage or self.settings.embedding_storage
+            ) != "float":
+                for result in await self._hybrid_parallel(
+                    query, query_embedding, top_k, filters, tuning
+                ):
+                    yield result
+                return
+            args = [query, query_embedding, top_k, self.settings.rrf_k, *filters.args()]
+            rows = self._stream_rows(_HYBRID_SQL, args, tuning, 0)
+            to_result = _hybrid_result
+
+        # Post-filtered legs over-fetch; stop at top_k and release the cursor
+        yielded = 0
+        try:
+            async for row in rows:
+                yield to_result(row)
+                yielded += 1
+                if yielded >= top_k:
+                    break
+        finally:
+            await rows.aclose()
+
+
+def _leg_result(leg: str, row: asyncpg.Record) -> SearchResult:
+    """SearchResult from a bm25 or vector leg row."""
+    score = float(row["score"] or 0)
+    return SearchResult(
+        chunk_id=str(row["chunk_id"]),
+        file_id=str(row["file_id"]),
+        drive_file_id=row["drive_file_id"],
+        file_name=row["file_name"],
+        file_path=row["file_path"],
+        content=row["content"],
+        heading=row["heading"],
+        bm25_score=score if leg == "bm25" else 0.0,
+        vector_score=score if leg == "vector" else 0.0,
+        rrf_score=0.0,
+    )
+
+
+def _hybrid_result(row: asyncpg.Record) -> SearchResult:
+    """SearchResult from a hybrid_search() row."""
+    return SearchResult(
+        chunk_id=str(row["chunk_id"]),
+        file_id=str(row["file_id"]),
+        drive_file_id=row["drive_file_id"],
+        file_name=row["file_name"],
+        file_path=row["file_path"],
+        content=row["content"],
+        heading=row["heading"],
+        bm25_score=float(row["bm25_score"] or 0),
+        vector_score=float(row["vector_score"] or 0),
+        rrf_score=float(row["rrf_score"] or 0),
+    )
+
+
+def _rrf_fuse(
+    bm25_rows: list[asyncpg.Record],
+    vector_rows: list[asyncpg.Record],
+    rrf_k: int,
+    top_k: int,
+) -> list[SearchResult]:
+    """Reciprocal Rank Fusion of two ranked lists: score = Σ 1 / (k + rank)."""
+    fused: dict[str, SearchResult] = {}
+
+    for rank, row in enumerate(bm25_rows, start=1):
+        chunk_id = str(row["chunk_id"])
+        fused[chunk_id] = SearchResult(
+            chunk_id=chunk_id,
+            file_id=str(row["file_id"]),
+            drive_file_id=row["drive_file_id"],
+            file_name=row["file_name"],
+            file_path=row["file_path"],
+            content=row["content"],
+            heading=row["heading"],
+            bm25_score=float(row["score"] or 0),
+            vector_score=0.0,
+            rrf_score=1.0 / (rrf_k + rank),
+        )
 
-        return [
-            SearchResult(
-                chunk_id=str(row["chunk_id"]),
+    for rank, row in enumerate(vector_rows, start=1):
+        chunk_id = str(row["chunk_id"])
+        result = fused.get(chunk_id)
+        if result is None:
+            result = fused[chunk_id] = SearchResult(
+                chunk_id=chunk_id,
                 file_id=str(row["file_id"]),
                 drive_file_id=row["drive_file_id"],
                 file_name=row["file_name"],
@@ -282,16 +846,42 @@ class SearchService:
                 content=row["content"],
                 heading=row["heading"],
                 bm25_score=0.0,
-                vector_score=float(row["vector_score"] or 0),
+                vector_score=0.0,
                 rrf_score=0.0,
             )
-            for row in rows
-        ]
+        result.vector_score = float(row["score"] or 0)
+        result.rrf_score += 1.0 / (rrf_k + rank)
+
+    return sorted(fused.values(), key=lambda r: r.rrf_score, reverse=True)[:top_k]
 
 
 # ======================================================================
 # Context retrieval (does NOT use pgvector → safe with SQLAlchemy)
 # ======================================================================
+# Explicit columns: the embedding is not needed and would be decoded for nothing
+_CHUNK_CONTEXT_SQL = """
+    WITH target_chunks AS (
+        SELECT
+            c.id, c.file_id, c.chunk_index, c.content, c.heading,
+            c.start_offset, c.end_offset,
+            c.file_name, c.file_path, c.file_mime_type AS mime_type
+        FROM chunks c
+        WHERE c.id = ANY($1::uuid[])
+    ),
+    neighbors AS (
+        SELECT
+            c.id, c.file_id, c.chunk_index, c.content, c.heading,
+            c.start_offset, c.end_offset,
+            tc.file_name, tc.file_path, tc.mime_type
+        FROM chunks c
+        JOIN target_chunks tc ON c.file_id = tc.file_id
+        WHERE c.chunk_index BETWEEN tc.chunk_index - 1 AND tc.chunk_index + 1
+    )
+    SELECT DISTINCT * FROM neighbors
+    ORDER BY file_id, chunk_index
+"""
+
+
 async def get_chunk_context(
     chunk_ids: list[str],
 ) -> list[dict[str, Any]]:
@@ -303,33 +893,22 @@ async def get_chunk_context(
     if not chunk_ids:
         return []
 
-    raw_sql = """
-        WITH target_chunks AS (
-            SELECT c.*, f.name AS file_name, f.path AS file_path, f.mime_type
-            FROM chunks c
-            JOIN files f ON c.file_id = f.id
-            WHERE c.id = ANY($1::uuid[])
-        ),
-        neighbors AS (
-            SELECT c.*, tc.file_name, tc.file_path, tc.mime_type
-            FROM chunks c
-            JOIN target_chunks tc ON c.file_id = tc.file_id
-            WHERE c.chunk_index BETWEEN tc.chunk_index - 1 AND tc.chunk_index + 1
-        )
-        SELECT DISTINCT * FROM neighbors
-        ORDER BY file_id, chunk_index
-    """
-
-    pool = await _get_asyncpg_pool()
-    async with pool.acquire() as conn:
-        rows = await conn.fetch(raw_sql, chunk_ids)
+    async with _acquire() as conn:
+        rows = await conn.fetch(_CHUNK_CONTEXT_SQL, chunk_ids)
 
     return [dict(row) for row in rows]
 
 
-# ======================================================================
-# Helpers
-# ======================================================================
-def _to_vector_literal(embedding: list[float]) -> str:
-    """Convert a Python float list to a pgvector literal string."""
-    return "[" + ",".join(str(x) for x in embedding) + "]"
+async def stream_chunk_context(
+    chunk_ids: list[str],
+) -> AsyncIterator[dict[str, Any]]:
+    """Like get_chunk_context(), yielding rows from a server-side cursor."""
+    if not chunk_ids:
+        return
+
+    async with _acquire() as conn:
+        async with conn.transaction():
+            async for row in conn.cursor(
+                _CHUNK_CONTEXT_SQL, chunk_ids, prefetch=get_settings().search_stream_prefetch
+            ):
+                yield dict(row)
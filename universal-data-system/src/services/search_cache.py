@@ -0,0 +1,111 @@
+"""Search result cache with generation-based invalidation.
+
+Agents repeat identical /search requests; each one re-runs the hybrid SQL.
+Results are cached per process keyed on (index generation, full request).
+
+The index generation is a Redis counter that every writer bumps *after*
+committing a change to files/chunks (reindex_file, delete_file, the
+Notion/Kiwify/Asaas sync services). A search that started before a commit
+is stored under the old generation and is never served once the counter
+moves, so a cache hit can never be older than the last committed index
+update. If Redis is unreachable the generation is unknown and the cache is
+bypassed rather than risk serving stale results.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+from src.config import get_settings
+from src.services.search import SearchResult
+from src.utils.cache import TTLCache
+from src.utils.logging import get_logger
+from src.utils.redis import get_redis
+
+logger = get_logger(__name__)
+
+GENERATION_KEY = "uds:search:generation"
+
+
+async def bump_index_generation() -> None:
+    """Invalidate cached search results everywhere. Call after committing index changes."""
+    try:
+        await get_redis().incr(GENERATION_KEY)
+    except Exception as e:
+        # Cached entries still expire after search_cache_ttl_seconds
+        logger.warning("Search cache invalidation failed", error=str(e))
+
+
+class SearchResultCache:
+    """Per-process LRU of search results, invalidated by the index generation."""
+
+    def __init__(self) -> None:
+        """Initialize the cache from settings."""
+        settings = get_settings()
+        self.enabled = settings.search_cache_enabled
+        self.memory: TTLCache[list[SearchResult]] = TTLCache(
+            max_entries=settings.search_cache_max_entries,
+            ttl_seconds=settings.search_cache_ttl_seconds,
+        )
+        self.bypassed = 0
+
+    async def current_generation(self) -> int | None:
+        """Read the index generation; None if it cannot be determined."""
+        try:
+            raw = await get_redis().get(GENERATION_KEY)
+        except Exception as e:
+            self.bypassed += 1
+            logger.warning("Search cache generation lookup failed", error=str(e))
+            return None
+        return int(raw or 0)
+
+    async def get(self, request_key: str) -> tuple[int | None, list[SearchResult] | None]:
+        """
+        Look up cached results for a request.
+
+        Args:
+            request_key: Canonical serialization of the search request
+
+        Returns:
+            (generation, results); pass the generation back to set() on a miss
+        """
+        if not self.enabled:
+            return None, None
+
+        generation = await self.current_generation()
+        if generation is None:
+            return None, None
+
+        return generation, self.memory.get((generation, request_key))
+
+    async def get_many(
+        self, request_keys: list[str]
+    ) -> tuple[int | None, list[list[SearchResult] | None]]:
+        """Like get() for several requests, reading the generation once."""
+        if not self.enabled:
+            return None, [None] * len(request_keys)
+
+        generation = await self.current_generation()
+        if generation is None:
+            return None, [None] * len(request_keys)
+
+        return generation, [self.memory.get((generation, key)) for key in request_keys]
+
+    def set(self, generation: int | None, request_key: str, results: list[SearchResult]) -> None:
+        """Store results computed while `generation` was current."""
+        if not self.enabled or generation is None:
+            return
+        self.memory.set((generation, request_key), results)
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters."""
+        return {
+            "enabled": self.enabled,
+            "memory": self.memory.stats(),
+            "bypassed": self.bypassed,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_search_result_cache() -> SearchResultCache:
+    """Get singleton search result cache."""
+    return SearchResultCache()
@@ -0,0 +1,84 @@
+"""Query-focused snippets with highlighted terms for search results."""
+
+import re
+from bisect import bisect_left
+from functools import lru_cache
+
+HIGHLIGHT_PRE = "**"
+HIGHLIGHT_POST = "**"
+ELLIPSIS = "…"
+
+_WORD_RE = re.compile(r"\w+")
+_MIN_TERM_CHARS = 3  # skip "de", "da", "a", ... unless the query has nothing longer
+
+
+@lru_cache(maxsize=1024)
+def _term_pattern(query: str) -> re.Pattern[str] | None:
+    """
+    Case-insensitive pattern matching query terms at word starts.
+
+    Terms also match as prefixes ("matrícula" hits "matrículas").
+    """
+    words = {w.casefold() for w in _WORD_RE.findall(query)}
+    terms = {w for w in words if len(w) >= _MIN_TERM_CHARS} or words
+    if not terms:
+        return None
+    # Longest first so the alternation prefers the most specific term
+    alternation = "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{alternation})\w*", re.IGNORECASE)
+
+
+def _best_window(matches: list[re.Match[str]], length: int, max_chars: int) -> int:
+    """Start offset of the max_chars window covering the most distinct terms (then hits)."""
+    if not matches:
+        return 0
+
+    starts = [m.start() for m in matches]
+    lead = max_chars // 5  # context before the first hit in the window
+    best_start, best_score = 0, (-1, -1)
+    for i, match in enumerate(matches):
+        start = min(max(0, match.start() - lead), max(0, length - max_chars))
+        first = bisect_left(starts, start)
+        last = bisect_left(starts, start + max_chars)
+        inside = [m for m in matches[first:last] if m.end() <= start + max_chars]
+        score = (len({m.group().casefold() for m in inside}), len(inside))
+        if score > best_score:
+            best_start, best_score = start, score
+    return best_start
+
+
+def make_snippet(content: str, query: str, max_chars: int = 240, highlight: bool = True) -> str:
+    """
+    Best-matching window of `content` for `query`.
+
+    Args:
+        content: Full chunk text
+        query: Search query whose terms are located and highlighted
+        max_chars: Window length before ellipses/highlight markers
+        highlight: Wrap query terms in HIGHLIGHT_PRE/HIGHLIGHT_POST
+
+    Returns:
+        Whitespace-collapsed snippet, with ELLIPSIS where content was cut
+    """
+    pattern = _term_pattern(query)
+    start, end = 0, len(content)
+
+    if len(content) > max_chars:
+        matches = list(pattern.finditer(content)) if pattern else []
+        start = _best_window(matches, len(content), max_chars)
+        end = start + max_chars
+        # Don't cut words in half
+        if start > 0:
+            space = content.find(" ", start, start + 20)
+            start = space + 1 if space != -1 else start
+        if end < len(content):
+            space = content.rfind(" ", end - 20, end)
+            end = space if space > start else end
+
+    snippet = " ".join(content[start:end].split())
+    if highlight and pattern:
+        snippet = pattern.sub(lambda m: f"{HIGHLIGHT_PRE}{m.group()}{HIGHLIGHT_POST}", snippet)
+
+    prefix = ELLIPSIS if start > 0 else ""
+    suffix = ELLIPSIS if end < len(content) else ""
+    return f"{prefix}{snippet}{suffix}"
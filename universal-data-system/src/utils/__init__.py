@@ -1,9 +1,11 @@
 """Utilities module."""
 
+from src.utils.cache import TTLCache
 from src.utils.hash import md5_hash, stable_chunk_id
 from src.utils.logging import get_logger, setup_logging
 
 __all__ = [
+    "TTLCache",
     "get_logger",
     "md5_hash",
     "setup_logging",
@@ -0,0 +1,127 @@
+"""In-process Prometheus-style metrics (text exposition format, no client library).
+
+Histograms are aggregated per process and rendered by GET /metrics. Timing
+spans are plain context managers, usable from sync and async code:
+
+    with stage("execute"):
+        rows = await conn.fetch(...)
+
+Not thread-safe: meant for the single asyncio event loop of an API worker.
+"""
+
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager
+
+# Seconds; dense below 100 ms where most search stages land
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1,
+    0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0,
+)
+
+LabelValues = tuple[str, ...]
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    """Render {name="value",...}; `extra` is an already formatted pair (le="...")."""
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a fixed label set."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        """Initialize an empty histogram."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # labels -> (per-bucket counts incl. +Inf, sum)
+        self._series: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """Record one observation."""
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = series
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> list[str]:
+        """Exposition lines for this histogram."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for labelvalues, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(self.labelnames, labelvalues, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {total[0]}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def render_gauge(
+    name: str, documentation: str, samples: dict[LabelValues, float], labelnames: tuple[str, ...]
+) -> list[str]:
+    """Exposition lines for a gauge whose values are read at scrape time."""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} gauge"]
+    for labelvalues, value in sorted(samples.items()):
+        lines.append(f"{name}{_format_labels(labelnames, labelvalues)} {value}")
+    return lines
+
+
+# ----------------------------------------------------------------------
+# Search metrics
+# ----------------------------------------------------------------------
+SEARCH_STAGE_SECONDS = Histogram(
+    "uds_search_stage_seconds",
+    "Time spent per search stage (embed, acquire, execute, hydrate, fallback, rerank, serialize)",
+    ("stage",),
+)
+SEARCH_SECONDS = Histogram(
+    "uds_search_seconds",
+    "End-to-end search handler latency by endpoint and search type",
+    ("endpoint", "search_type"),
+)
+
+HISTOGRAMS = [SEARCH_STAGE_SECONDS, SEARCH_SECONDS]
+
+
+@contextmanager
+def timed(histogram: Histogram, *labelvalues: str) -> Iterator[None]:
+    """Observe the wall time of the block into `histogram`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start, *labelvalues)
+
+
+def stage(name: str) -> AbstractContextManager[None]:
+    """Timing span for one search stage."""
+    return timed(SEARCH_STAGE_SECONDS, name)
+
+
+def render_histograms() -> list[str]:
+    """Exposition lines for every registered histogram."""
+    lines: list[str] = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return lines
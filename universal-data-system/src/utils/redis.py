@@ -0,0 +1,29 @@
+"""Shared async Redis client (caches, counters — the arq queue has its own pool)."""
+
+import redis.asyncio as redis
+
+from src.config import get_settings
+
+# Global client reference
+_redis: redis.Redis | None = None
+
+
+def get_redis() -> redis.Redis:
+    """Get or create the shared async Redis client."""
+    global _redis
+    if _redis is None:
+        settings = get_settings()
+        _redis = redis.from_url(
+            settings.redis_url,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+    return _redis
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client on shutdown."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -4,6 +4,7 @@ from arq import cron
 from arq.connections import RedisSettings
 
 from src.config import get_settings
+from src.services.extraction.pool import close_extraction_pool
 from src.workers.tasks import (
     sync_changes,
     reindex_file,
@@ -15,6 +16,11 @@ from src.workers.tasks import (
 )
 
 
+async def shutdown(ctx: dict) -> None:
+    """Stop extraction worker processes."""
+    close_extraction_pool()
+
+
 def get_redis_settings() -> RedisSettings:
     """Get Redis settings for arq."""
     settings = get_settings()
@@ -51,6 +57,7 @@ class WorkerSettings:
     ]
 
     redis_settings = get_redis_settings()
+    on_shutdown = shutdown
 
     # Cron jobs
     cron_jobs = [
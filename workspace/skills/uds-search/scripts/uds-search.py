@@ -4,6 +4,7 @@
 Usage:
   python3 uds-search.py "termo de busca"
   python3 uds-search.py "termo" --type bm25 --top 5
+  python3 uds-search.py "termo 1" "termo 2" "termo 3"   # one batched request
   python3 uds-search.py --status
   python3 uds-search.py --sync notion
 """
@@ -17,21 +18,48 @@ import urllib.error
 UDS_BASE = "http://localhost:8000"
 
 
-def search(query: str, search_type: str = "hybrid", top_k: int = 10) -> None:
-    data = json.dumps({"query": query, "top_k": top_k, "search_type": search_type}).encode()
+def post(path: str, payload: dict) -> dict:
     req = urllib.request.Request(
-        f"{UDS_BASE}/search",
-        data=data,
+        f"{UDS_BASE}{path}",
+        data=json.dumps(payload).encode(),
         headers={"Content-Type": "application/json"},
         method="POST",
     )
     try:
         with urllib.request.urlopen(req, timeout=30) as resp:
-            result = json.loads(resp.read())
+            return json.loads(resp.read())
     except urllib.error.URLError as e:
         print(f"❌ UDS API error: {e}", file=sys.stderr)
         sys.exit(1)
 
+
+# Only what print_results shows; content comes back as a highlighted snippet
+FIELDS = ["file_name", "file_path", "heading", "content", "rrf_score"]
+
+
+def search(queries: list[str], search_type: str = "hybrid", top_k: int = 10) -> None:
+    searches = [
+        {
+            "query": q,
+            "top_k": top_k,
+            "search_type": search_type,
+            "snippet": True,
+            "snippet_chars": 200,
+            "fields": FIELDS,
+        }
+        for q in queries
+    ]
+    if len(searches) == 1:
+        responses = [post("/search", searches[0])]
+    else:
+        # One round trip and one embedding call for all queries
+        responses = post("/search/batch", {"searches": searches}).get("results", [])
+
+    for query, result in zip(queries, responses):
+        print_results(query, search_type, result)
+
+
+def print_results(query: str, search_type: str, result: dict) -> None:
     results = result.get("results", [])
     print(f"\n🔍 {len(results)} results for '{query}' ({search_type})\n")
 
@@ -43,10 +71,9 @@ def search(query: str, search_type: str = "hybrid", top_k: int = 10) -> None:
         elif path.startswith("/kiwify"):
             source = "🛒 Kiwify"
 
-        content = r.get("content", "")[:200].replace("\n", " ")
         print(f"  {i}. {source} {r.get('file_name', '?')}")
         print(f"     Score: {r.get('rrf_score', 0):.4f} | {r.get('heading', '-')}")
-        print(f"     {content}...")
+        print(f"     {r.get('content', '')}")
         print()
 
 
@@ -78,7 +105,7 @@ def sync(source: str) -> None:
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="UDS Search CLI")
-    parser.add_argument("query", nargs="?", help="Search query")
+    parser.add_argument("query", nargs="*", help="Search query (several = batched search)")
     parser.add_argument("--type", default="hybrid", choices=["hybrid", "bm25", "vector"])
     parser.add_argument("--top", type=int, default=10, help="Number of results")
     parser.add_argument("--status", action="store_true", help="Show index status")